@@ -10,11 +10,15 @@ module.exports = {
         "sse",
         "--host",
         "127.0.0.1",
-        "--port",
-        "8787",
       ],
       interpreter: "none",
       exec_mode: "fork",
+      // One SSE process per port (8787, 8788, ...): raise `instances` and put
+      // a sticky (ip_hash) proxy in front; see README "Run with several workers".
+      // For streamable HTTP use `http --workers N` in a single instance instead.
+      instances: 1,
+      increment_var: "PORT",
+      env: { PORT: 8787 },
 
       out_file: "/var/log/integritas-mcp/out.log",
       error_file: "/var/log/integritas-mcp/err.log",
@@ -0,0 +1,59 @@
+# scripts/bench_startup.py
+#
+# Cold-start benchmark for the stdio server: time to import stdio_app (tools
+# registered) in fresh interpreters, with and without the MCP SDK itself,
+# then the server lifespan (entered before `initialize` is answered) and the
+# first `health` call. Modules that must stay unloaded until that first call
+# are reported if the lifespan pulls them in.
+#
+#   python scripts/bench_startup.py [runs]
+
+from __future__ import annotations
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = r"""
+import time
+t0 = time.perf_counter()
+import mcp.server.fastmcp, structlog
+t1 = time.perf_counter()
+import integritas_mcp_server.stdio_app
+t2 = time.perf_counter()
+import asyncio, sys
+mcp = integritas_mcp_server.stdio_app.mcp
+LAZY = ("keyring", "tenacity", "integritas_mcp_server.http_client", "integritas_mcp_server.services.stamp_jobs")
+
+async def main():
+    async with mcp.settings.lifespan(mcp):
+        t3 = time.perf_counter()
+        early = [m for m in LAZY if m in sys.modules]
+        await mcp.call_tool("health", {})
+        t4 = time.perf_counter()
+    if early:
+        print("loaded before initialize:", *early, file=sys.stderr)
+    return t3, t4
+
+t3, t4 = asyncio.run(main())
+print(t1 - t0, t2 - t1, t3 - t2, t4 - t3)
+"""
+
+
+def main(runs: int) -> None:
+    env = {"MCP_ACCESS_TOKEN": "bench", "MINIMA_API_BASE": "https://upstream.invalid", "LOG_LEVEL": "WARNING"}
+    env = {**env, **os.environ}
+    rows = []
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True)
+        if proc.stderr.strip():
+            print(proc.stderr.strip().splitlines()[-1])
+        rows.append([float(x) * 1000 for x in proc.stdout.split()])
+    labels = ("mcp sdk + structlog", "integritas stdio_app", "lifespan (pre-init)", "first health call")
+    for i, label in enumerate(labels):
+        col = [r[i] for r in rows]
+        print(f"{label:22s} median {statistics.median(col):8.1f} ms   min {min(col):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,105 @@
+# src/integritas_mcp_server/circuit.py
+from __future__ import annotations
+import time
+import structlog
+from typing import Any, Dict, Literal, Optional
+
+from .config import get_settings
+from .errors import CircuitOpenError
+from . import metrics
+
+log = structlog.get_logger()
+
+# Circuit breaker around the upstream, shared by every call in the process.
+#
+# closed    -> calls go through; CIRCUIT_FAILURE_THRESHOLD consecutive transport
+#              failures (the errors http_client maps to TransientError) open it.
+# open      -> calls fail fast with CircuitOpenError for CIRCUIT_RESET_SECONDS.
+# half_open -> one probe call is let through; success closes the circuit,
+#              failure opens it again for another reset period.
+# CIRCUIT_FAILURE_THRESHOLD=0 disables the breaker.
+
+State = Literal["closed", "open", "half_open"]
+
+CIRCUIT_TRANSITIONS = metrics.counter(
+    "integritas_upstream_circuit_transitions_total", "Upstream circuit breaker state changes."
+)
+CIRCUIT_REJECTED = metrics.counter(
+    "integritas_upstream_circuit_rejected_total", "Upstream calls failed fast by the open circuit."
+)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state: State = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+    def _to(self, state: State) -> None:
+        if state != self.state:
+            log.warning("upstream_circuit", state=state, previous=self.state, failures=self.failures)
+            CIRCUIT_TRANSITIONS.inc(state=state)
+            self.state = state
+
+    def retry_in(self) -> float:
+        if self.state != "open":
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_seconds - time.monotonic())
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go out now."""
+        if self.state == "open" and self.retry_in() <= 0:
+            self._to("half_open")
+            self.probing = False
+        if self.state == "closed":
+            return
+        if self.state == "half_open" and not self.probing:
+            self.probing = True
+            return
+        CIRCUIT_REJECTED.inc()
+        wait = self.retry_in()
+        raise CircuitOpenError(
+            "Upstream unavailable (circuit open)"
+            + (f"; retrying in {wait:.0f}s" if wait else "; probe in progress")
+        )
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.probing = False
+        self._to("closed")
+
+    def release(self) -> None:
+        """The call ended without telling us anything about the upstream."""
+        self.probing = False
+
+    def record_failure(self) -> None:
+        if self.failure_threshold <= 0:
+            return
+        self.failures += 1
+        self.probing = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._to("open")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"state": self.state, "failures": self.failures, "retry_in_seconds": round(self.retry_in(), 1)}
+
+
+_breaker: Optional[CircuitBreaker] = None
+
+
+def breaker() -> CircuitBreaker:
+    global _breaker
+    if _breaker is None:
+        s = get_settings()
+        _breaker = CircuitBreaker(s.circuit_failure_threshold, s.circuit_reset_seconds)
+    return _breaker
+
+
+def reset() -> None:
+    """Forget breaker state (tests, settings changes)."""
+    global _breaker
+    _breaker = None
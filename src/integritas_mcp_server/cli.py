@@ -1,7 +1,7 @@
 # src/integritas_mcp_server/cli.py
 from __future__ import annotations
 import os, sys, typer, uvicorn
-from .logging_setup import setup_logging
+from .logging_setup import get_logger, setup_logging
 
 cli = typer.Typer(no_args_is_help=True, add_completion=False)
 
@@ -30,41 +30,75 @@ def cmd_stdio():
     # Fallback if API changed
     raise RuntimeError("FastMCP instance has neither run_stdio() nor run().")
 
-@cli.command("sse")
-def cmd_sse(
-    host: str = typer.Option("127.0.0.1", "--host"),
-    port: int = typer.Option(8787, "--port"),
-    reload: bool = typer.Option(False, "--reload"),
-):
-    setup_logging()
+def _uvicorn(target: str, host: str, port: int, reload: bool, workers: int) -> None:
+    # Import strings (not app objects) so uvicorn can spawn workers / reload;
+    # every worker imports the module and builds its own `mcp` instance.
     from .config import get_settings
-    s = get_settings()
-    from .sse_app import app as sse_asgi_app
+    s = get_settings()  # fail fast on missing env before spawning workers
     uvicorn.run(
-        sse_asgi_app,
+        target,
         host=host,
         port=port,
         reload=reload,
+        workers=None if reload else workers,
         log_level=s.log_level.lower(),
     )
 
+@cli.command("sse")
+def cmd_sse(
+    host: str = typer.Option("127.0.0.1", "--host"),
+    port: int = typer.Option(8787, "--port", envvar="PORT"),
+    reload: bool = typer.Option(False, "--reload"),
+    workers: int = typer.Option(1, "--workers", envvar="INTEGRITAS_WORKERS", min=1),
+):
+    """
+    SSE keeps each session's stream in the process that opened it, and
+    uvicorn workers share one port with no affinity, so SSE scales by
+    instances: one process per port behind a sticky proxy (see README).
+    """
+    setup_logging()
+    if workers > 1:
+        raise typer.BadParameter(
+            "SSE sessions are bound to one process. Run one instance per port "
+            "(pm2 `instances` + `increment_var: \"PORT\"`) behind a sticky proxy, "
+            "or use `integritas-mcp http --workers N`.",
+            param_hint="--workers",
+        )
+    _uvicorn("integritas_mcp_server.sse_app:app", host, port, reload, 1)
+
 @cli.command("http")
 def cmd_http(
     host: str = typer.Option("127.0.0.1", "--host"),
-    port: int = typer.Option(8787, "--port"),
+    port: int = typer.Option(8787, "--port", envvar="PORT"),
     reload: bool = typer.Option(False, "--reload"),
+    workers: int = typer.Option(1, "--workers", envvar="INTEGRITAS_WORKERS", min=1),
 ):
+    """
+    Streamable HTTP. With --workers > 1 the server runs stateless (no MCP
+    session kept between requests), so any worker can answer any request;
+    shared state lives in STATE_DIR (SQLite) and the keyring. Resource
+    subscriptions need a session and are off in that mode, and a key set
+    with auth_set_api_key only reaches other workers through the keyring,
+    so it must have a real backend unless the key comes from the env.
+    """
     setup_logging()
-    from .config import get_settings
-    s = get_settings()
-    from .http_app import app as http_asgi_app
-    uvicorn.run(
-        http_asgi_app,
-        host=host,
-        port=port,
-        reload=reload,
-        log_level=s.log_level.lower(),
-    )
+    if workers > 1:
+        from .config import get_settings
+        from .secrets import keyring_available
+        if not get_settings().minima_api_key and not keyring_available():
+            raise typer.BadParameter(
+                "Workers only share an API key through the keyring, and no keyring "
+                "backend is available. Set MINIMA_API_KEY, configure a keyring "
+                "backend, or run one worker.",
+                param_hint="--workers",
+            )
+        get_logger().warning(
+            "stateless_http_workers", workers=workers,
+            note="resource subscriptions are disabled; use stamp_status or async_job",
+        )
+        # Settings.stateless_http, read by http_app in every worker process
+        os.environ["STATELESS_HTTP"] = "true"
+    _uvicorn("integritas_mcp_server.http_app:app", host, port, reload, workers)
 
 def run():
     cli()
@@ -20,6 +20,7 @@
 
 # src/integritas_mcp_server/config.py
 from functools import lru_cache
+from typing import Any, Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, AliasChoices  # <-- add AliasChoices
 
@@ -37,8 +38,91 @@ class Settings(BaseSettings):
 
     minima_api_health: str | None = Field(None, alias="MINIMA_API_HEALTH")
     request_timeout_seconds: float = 15.0
-    max_retries: int = 3
+    max_retries: int = 3                        # attempts per upstream call (retry.py)
     log_level: str = "INFO"
+    tool_log_sample_rate: float = 1.0           # share of tool calls logged with kwargs/result
+    tool_log_max_chars: int = 2000              # per payload; serialization stops there
+
+    # retry layer (retry.py): per-endpoint overrides keyed by path prefix, e.g.
+    # RETRY_POLICIES='{"/v1/timestamp/status": {"attempts": 5, "cap": 5}}'
+    retry_policies: dict[str, dict[str, Any]] = {}
+    retry_budget_ratio: float = 0.2             # retries earned per request
+    retry_budget_min_per_second: float = 1.0    # retries always allowed
+
+    # hedged requests for idempotent calls: verify, status, health (hedging.py)
+    hedge_enabled: bool = False
+    hedge_percentile: float = 95.0              # hedge after this recent latency percentile
+    hedge_min_delay_seconds: float = 0.05
+    hedge_max_delay_seconds: float = 5.0
+
+    # GET /metrics (Prometheus); set to require `Authorization: Bearer <token>`
+    metrics_token: str | None = None
+
+    # tracing spans (tracing.py): share of tool calls traced, and where to
+    trace_sample_rate: float = 0.0              # 0 = off, 1 = every call
+    trace_exporter: Literal["file", "otlp", "none"] = "file"
+    trace_file: str | None = None               # default STATE_DIR/traces.jsonl
+    trace_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+
+    # Shared upstream connection pool (one per process, see lifecycle.py)
+    upstream_pool_limit: int = 100              # total open connections
+    upstream_pool_keepalive: int = 20           # idle connections kept warm
+    upstream_keepalive_seconds: float = 30.0    # idle keep-alive before close
+    upstream_http2: bool = True                 # negotiate HTTP/2 via ALPN
+
+    # client-side rate limit toward the upstream, per API key (ratelimit.py)
+    upstream_rate_per_second: float = 20.0      # 0 disables
+    upstream_rate_burst: int = 40
+    upstream_retry_after_max_seconds: float = 60.0  # longer Retry-After: return the 429
+
+    # circuit breaker over upstream transport failures (circuit.py)
+    circuit_failure_threshold: int = 5          # consecutive failures to open; 0 disables
+    circuit_reset_seconds: float = 30.0         # open -> half-open probe after this
+
+    # file_path stamps: hash locally (and send only the hash) above this size
+    local_hash_threshold_bytes: int = 64 * 1024 * 1024
+    hash_chunk_bytes: int = 1024 * 1024
+
+    # file_url streaming: chunk size is the per-request buffer ceiling
+    stream_chunk_bytes: int = 256 * 1024
+    max_download_bytes: int = 4 * 1024 * 1024 * 1024
+
+    # stamp_data_batch
+    stamp_batch_concurrency: int = 8
+    stamp_batch_max_items: int = 10_000
+
+    # verify_data_batch
+    verify_batch_concurrency: int = 8
+    verify_batch_max_files: int = 10_000
+
+    # local state (SQLite caches/queues), shared by all workers on a host
+    state_dir: str = "~/.integritas-mcp"
+
+    # streamable HTTP without MCP sessions, so any worker can answer any
+    # request (forced on by `integritas-mcp http --workers N`, N > 1)
+    stateless_http: bool = False
+
+    # structuredContent shape: full | compact | ids-only (models.ResponseProfile);
+    # payloads left out are kept this long at integritas://raw/{rawId}
+    response_profile: Literal["full", "compact", "ids-only"] = "full"
+    raw_payload_retention_seconds: float = 24 * 3600
+
+    # repeat stamps of the same hash (per API key) replay the first result
+    stamp_idempotency_window_seconds: float = 24 * 3600   # 0 disables
+
+    # async stamp jobs (durable queue in STATE_DIR, drained by a worker pool)
+    stamp_job_workers: int = 4                  # per process; 0 = enqueue only
+    stamp_job_rate_per_second: float = 10.0     # job starts per process
+    stamp_job_max_attempts: int = 5
+    stamp_job_retention_seconds: float = 7 * 24 * 3600
+
+    # resources/subscribe on integritas://stamp/{uid}: polls before giving up
+    stamp_subscription_max_polls: int = 720
+
+    # offline proof verification (services/root_cache.py)
+    offline_verify: bool = True                 # answer locally when (root, hash) is known
+    known_roots_max: int = 10_000               # confirmed (root, hash) rows kept
+    known_roots_ttl_seconds: float = 30 * 24 * 3600
 
 @lru_cache
 def get_settings() -> Settings:
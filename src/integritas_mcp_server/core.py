@@ -1,5 +1,6 @@
 # src/integritas_mcp_server/core.py
 from mcp.server.fastmcp import FastMCP
+from .lifecycle import server_lifespan
 
 # Keep this module tiny to avoid import side effects
-mcp = FastMCP("Integritas MCP Server")
+mcp = FastMCP("Integritas MCP Server", lifespan=server_lifespan)
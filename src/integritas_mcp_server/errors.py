@@ -16,6 +16,7 @@ class InvalidInputError(MCPServerError): ...
 class AuthError(MCPServerError): ...
 class RateLimitError(MCPServerError): ...
 class TransientError(MCPServerError): ...
+class CircuitOpenError(TransientError): ...
 class PermanentError(MCPServerError): ...
 
 def _friendly_message(detail: str | None, status: int | None = None) -> str:
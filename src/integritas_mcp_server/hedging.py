@@ -0,0 +1,107 @@
+# src/integritas_mcp_server/hedging.py
+from __future__ import annotations
+import asyncio
+import math
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from .config import get_settings
+from . import metrics
+
+# Hedged requests for idempotent upstream calls (HEDGE_ENABLED).
+#
+# If an attempt has not answered after the endpoint's recent
+# HEDGE_PERCENTILE latency, a second identical request is sent and the first
+# to return wins; the other is cancelled. Delays come from a sliding window of
+# observed latencies per endpoint, clamped to [HEDGE_MIN_DELAY_SECONDS,
+# HEDGE_MAX_DELAY_SECONDS]; until HEDGE_MIN_SAMPLES are seen nothing is hedged.
+# At the 95th percentile roughly 5% of calls send one extra request.
+
+T = TypeVar("T")
+
+HEDGE_WINDOW = 500
+HEDGE_MIN_SAMPLES = 20
+
+HEDGES_FIRED = metrics.counter(
+    "integritas_upstream_hedges_total", "Hedged (second) upstream requests sent, by endpoint."
+)
+HEDGES_WON = metrics.counter(
+    "integritas_upstream_hedges_won_total", "Hedged requests that answered before the original."
+)
+
+
+class LatencyWindow:
+    def __init__(self, size: int = HEDGE_WINDOW):
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if len(self.samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        idx = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+        return ordered[idx]
+
+
+_windows: Dict[str, LatencyWindow] = {}
+
+
+def observe(endpoint: str, seconds: float) -> None:
+    w = _windows.get(endpoint)
+    if w is None:
+        w = _windows[endpoint] = LatencyWindow()
+    w.add(seconds)
+
+
+def hedge_delay(endpoint: str) -> Optional[float]:
+    """Seconds to wait before hedging a call to `endpoint`; None = don't hedge."""
+    s = get_settings()
+    if not s.hedge_enabled:
+        return None
+    w = _windows.get(endpoint)
+    p = w.percentile(s.hedge_percentile) if w is not None else None
+    if p is None:
+        return None
+    return min(max(p, s.hedge_min_delay_seconds), s.hedge_max_delay_seconds)
+
+
+def reset() -> None:
+    """Forget observed latencies (tests)."""
+    _windows.clear()
+
+
+async def hedged(call: Callable[[], Awaitable[T]], delay: float, endpoint: str) -> T:
+    """
+    Run `call`; if it is still pending after `delay`, run it again and return
+    whichever succeeds first. Raises the last error only if both fail.
+    """
+    tasks = [asyncio.ensure_future(call())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return tasks[0].result()
+
+        HEDGES_FIRED.inc(endpoint=endpoint)
+        tasks.append(asyncio.ensure_future(call()))
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                if t.cancelled():
+                    continue
+                if t.exception() is None:
+                    if t is tasks[1]:
+                        HEDGES_WON.inc(endpoint=endpoint)
+                    return t.result()
+                error = t.exception()
+        raise error or asyncio.CancelledError()
+    finally:
+        # the loser (or both, if we were cancelled) must not outlive the call
+        losers = [t for t in tasks if not t.done()]
+        for t in losers:
+            t.cancel()
+        if losers:
+            await asyncio.gather(*losers, return_exceptions=True)
@@ -10,8 +10,35 @@
 
 # src/integritas_mcp_server/http_app.py
 from __future__ import annotations
+from contextlib import asynccontextmanager
 from .stdio_app import mcp
+from .config import get_settings
+from .lifecycle import app_lifespan
+from .prometheus import metrics_route
 
-# Use the MCP streamable HTTP app directly (top-level),
-# it exposes its own /mcp endpoint.
-app = mcp.streamable_http_app()
+
+def create_app():
+    # FastMCP passes its own stateless_http default explicitly, so its
+    # FASTMCP_* env var is ignored; set it before the session manager exists.
+    mcp.settings.stateless_http = get_settings().stateless_http
+
+    # Use the MCP streamable HTTP app directly (top-level),
+    # it exposes its own /mcp endpoint.
+    app = mcp.streamable_http_app()
+    app.router.routes.insert(0, metrics_route)  # GET /metrics, see prometheus.py
+
+    # Wrap its lifespan (session manager) so the shared upstream pool is opened
+    # at startup and closed at shutdown, not per MCP session.
+    session_manager_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def _lifespan(a):
+        async with app_lifespan(a):
+            async with session_manager_lifespan(a):
+                yield
+
+    app.router.lifespan_context = _lifespan
+    return app
+
+
+app = create_app()
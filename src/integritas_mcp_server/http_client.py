@@ -1,23 +1,64 @@
 # src/integritas_mcp_server/http_client.py
 from __future__ import annotations
 import asyncio
+import time
 import httpx
 import uuid
 import structlog
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+from urllib.parse import urlsplit
 from .config import get_settings
-from .errors import TransientError
+from .errors import MCPServerError, TransientError
+from . import metrics
+from .ratelimit import bucket_for, parse_retry_after, throttle
+from .circuit import breaker
+from .retry import UPSTREAM_RETRIES, policy_for, retrying
+from .hedging import hedge_delay, hedged, observe
+from .tracing import current_request_id, span, traceparent
 
 log = structlog.get_logger()
 
-DEFAULT_TIMEOUT = 5.0        # seconds
-RETRIES = 2                  # total attempts = RETRIES + 1
-BACKOFF = 0.2                # seconds, simple linear backoff
+# Single upstream HTTP stack for the whole process: one pooled AsyncClient
+# (HTTP/2 when the server supports it), one retry layer (retry.py), one set
+# of metrics.
+
+THROTTLE_DEFAULT_PAUSE = 2.0   # seconds, for a 429 without a usable Retry-After
 
 class NetworkError(Exception): ...
 
 SENSITIVE_KEYS = {"authorization", "x-api-key", "api_key", "token", "secret"}
 
+UPSTREAM_REQUESTS = metrics.counter(
+    "integritas_upstream_requests_total", "Upstream HTTP requests by endpoint and status."
+)
+UPSTREAM_THROTTLED = metrics.counter(
+    "integritas_upstream_throttled_total", "Upstream 429 responses by endpoint."
+)
+UPSTREAM_LATENCY = metrics.histogram(
+    "integritas_upstream_request_seconds", "Upstream request latency by endpoint and status."
+)
+UPSTREAM_INFLIGHT = metrics.gauge(
+    "integritas_upstream_requests_in_flight", "Upstream requests awaiting a response."
+)
+
+def _pool_samples() -> dict:
+    """Connection pool utilisation of the shared client (httpcore internals, best effort)."""
+    pool = getattr(getattr(_client, "_transport", None), "_pool", None)
+    if pool is None:
+        return {}
+    conns = list(getattr(pool, "connections", []))
+    idle = sum(1 for c in conns if c.is_idle())
+    return {
+        metrics.labels(state="active"): float(len(conns) - idle),
+        metrics.labels(state="idle"): float(idle),
+        metrics.labels(state="max"): float(get_settings().upstream_pool_limit),
+    }
+
+UPSTREAM_POOL = metrics.gauge(
+    "integritas_upstream_pool_connections", "Upstream pool connections by state (active/idle/max).", _pool_samples
+)
+
 def _redact(obj: Any):
     if isinstance(obj, dict):
         return {k: ("***" if k.lower() in SENSITIVE_KEYS else _redact(v)) for k, v in obj.items()}
@@ -37,79 +78,308 @@ def _body_preview(resp: httpx.Response, limit: int = 2000) -> Any:
     txt = resp.text
     return txt if len(txt) <= limit else (txt[:limit] + f"... (+{len(txt)-limit} bytes)")
 
+# ---- shared client ------------------------------------------------------------
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _new_client() -> httpx.AsyncClient:
+    s = get_settings()
+    return httpx.AsyncClient(
+        http2=s.upstream_http2,
+        timeout=httpx.Timeout(s.request_timeout_seconds),
+        limits=httpx.Limits(
+            max_connections=s.upstream_pool_limit,
+            max_keepalive_connections=s.upstream_pool_keepalive,
+            keepalive_expiry=s.upstream_keepalive_seconds,
+        ),
+    )
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide client, (re)creating it if it is missing, closed,
+    or bound to a different event loop than the running one.
+    Opened/closed by lifecycle.server_lifespan; created lazily otherwise.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = _new_client()
+        _client_loop = loop
+    return _client
+
+async def open_client() -> httpx.AsyncClient:
+    return get_client()
+
+async def close_client() -> None:
+    global _client, _client_loop
+    client, _client, _client_loop = _client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+def upstream_url(path: str) -> str:
+    """Absolute URLs pass through; paths are joined onto MINIMA_API_BASE."""
+    if path.startswith(("http://", "https://")):
+        return path
+    base = get_settings().minima_api_base.rstrip("/")
+    return f"{base}/{path.lstrip('/')}"
+
+def _is_upstream(url: str) -> bool:
+    """Whether `url` is under MINIMA_API_BASE (third-party file_url downloads are not)."""
+    base = get_settings().minima_api_base.rstrip("/")
+    return url == base or url.startswith(base + "/")
+
+def _header(headers: dict[str, str] | None, name: str) -> Optional[str]:
+    for k, v in (headers or {}).items():
+        if k.lower() == name:
+            return v
+    return None
+
+def _api_key(headers: dict[str, str] | None) -> Optional[str]:
+    return _header(headers, "x-api-key")
+
+def _with_request_id(headers: dict[str, str] | None) -> dict[str, str] | None:
+    """Propagate the current tool call's MCP request id as x-request-id."""
+    rid = current_request_id()
+    if rid is None or _header(headers, "x-request-id") is not None:
+        return headers
+    return {**(headers or {}), "x-request-id": rid}
+
+def _with_traceparent(headers: dict[str, str] | None) -> dict[str, str] | None:
+    tp = traceparent()
+    return {**(headers or {}), "traceparent": tp} if tp else headers
+
+def _throttled(resp: httpx.Response, api_key: Optional[str], label: str) -> Optional[float]:
+    """On 429, pause the key's bucket for Retry-After; returns the pause (None if not 429)."""
+    if resp.status_code != 429:
+        return None
+    UPSTREAM_THROTTLED.inc(endpoint=label)
+    pause = parse_retry_after(resp.headers.get("retry-after"))
+    if pause is None:
+        pause = THROTTLE_DEFAULT_PAUSE
+    bucket_for(api_key).pause(pause)
+    log.warning("upstream_throttled", endpoint=label, retry_after=pause)
+    return pause
+
+def _replayable(files: Any, content: Any) -> bool:
+    """Whether the body can be sent again (retries, hedges): no streams or open files."""
+    if content is not None:
+        return isinstance(content, (bytes, bytearray, str))
+    if files is None:
+        return True
+    values = files.values() if isinstance(files, dict) else [v for _, v in files]
+    for v in values:
+        body = v[1] if isinstance(v, tuple) else v
+        if not isinstance(body, (bytes, bytearray, str)):
+            return False
+    return True
+
+def _transient(e: httpx.TransportError) -> TransientError:
+    # Map common timeout types to friendly messages
+    if isinstance(e, httpx.ConnectTimeout):
+        return TransientError("Upstream API unreachable (connect timeout)")
+    if isinstance(e, httpx.ReadTimeout):
+        return TransientError("Upstream request timed out")
+    return TransientError(f"Upstream transport error: {e!r}")
+
+# ---- core request -------------------------------------------------------------
+
+async def request(
+    method: str,
+    path: str,
+    *,
+    headers: dict[str, str] | None = None,
+    json: Any = None,
+    files: Any = None,
+    content: Any = None,
+    timeout: float | None = None,
+    retry: bool = True,
+    retry_throttled: bool = True,
+    idempotency_key: str | None = None,
+    endpoint: str | None = None,
+) -> httpx.Response:
+    """
+    Send one upstream request through the shared pool.
+
+    Requests are queued per API key by the client-side rate limiter and
+    fail fast with CircuitOpenError while the upstream circuit is open.
+    Retries follow the endpoint's policy in retry.py: idempotent endpoints
+    retry transport errors and 502/503/504 with jittered backoff; others
+    only when `idempotency_key` is given (sent as Idempotency-Key). A 429 is
+    retried after its Retry-After when `retry_throttled` is set. `retry=False`
+    disables all but 429 retries; non-replayable bodies (streams, open files)
+    are never retried. Idempotent endpoints whose policy allows it are hedged
+    when HEDGE_ENABLED (see hedging.py). Transport errors that survive retries are raised as
+    TransientError; HTTP error statuses are returned, not raised.
+    `endpoint` overrides the metrics label (defaults to the URL path).
+    """
+    url = upstream_url(path)
+    label = endpoint or urlsplit(url).path or "/"
+    client = get_client()
+    api_key = _api_key(headers)
+    headers = _with_request_id(headers)
+    if idempotency_key:
+        headers = {**(headers or {}), "Idempotency-Key": idempotency_key}
+    cb = breaker()
+    replayable = _replayable(files, content)
+    policy = policy_for(label, method)
+    can_hedge = policy.hedge and policy.idempotent and replayable
+
+    async def attempt() -> httpx.Response:
+        with span(f"upstream {method} {label}", method=method, endpoint=label) as sp:
+            resp = await send_once(_with_traceparent(headers))
+            sp.set(status=resp.status_code)
+            return resp
+
+    async def send_once(headers: dict[str, str] | None) -> httpx.Response:
+        await throttle(api_key, label)
+        cb.before_call()
+        start = time.perf_counter()
+        UPSTREAM_INFLIGHT.inc()
+        try:
+            log.info("upstream_request", method=method, url=url)
+            resp = await client.request(
+                method,
+                url,
+                headers=headers,
+                json=json,
+                files=files,
+                content=content,
+                timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout,
+            )
+        except httpx.TransportError as e:
+            UPSTREAM_LATENCY.observe(time.perf_counter() - start, method=method, endpoint=label, status="error")
+            UPSTREAM_REQUESTS.inc(method=method, endpoint=label, status="error")
+            cb.record_failure()
+            # Make the error text useful
+            log.warning("upstream_transport_error", error=repr(e), url=url)
+            raise
+        except MCPServerError:
+            # raised by our own streamed bodies (e.g. size guards): keep as-is
+            cb.release()
+            raise
+        except BaseException as e:
+            cb.release()
+            if not isinstance(e, Exception):  # cancellation
+                raise
+            log.exception("upstream_unexpected_error")
+            # Ensure this is never blank
+            raise NetworkError(repr(e)) from e
+        finally:
+            UPSTREAM_INFLIGHT.dec()
+
+        cb.record_success()
+        elapsed = time.perf_counter() - start
+        UPSTREAM_LATENCY.observe(elapsed, method=method, endpoint=label, status=resp.status_code)
+        UPSTREAM_REQUESTS.inc(method=method, endpoint=label, status=resp.status_code)
+        log.info("upstream_response", status=resp.status_code, url=url)
+        if can_hedge:
+            observe(label, elapsed)
+        _throttled(resp, api_key, label)  # pauses the key; the bucket holds any retry
+        return resp
+
+    async def send() -> httpx.Response:
+        delay = hedge_delay(label) if can_hedge else None
+        return await (attempt() if delay is None else hedged(attempt, delay, label))
+
+    retryer = retrying(
+        method=method,
+        endpoint=label,
+        replayable=replayable,
+        idempotency_key=idempotency_key,
+        retry=retry,
+        retry_throttled=retry_throttled,
+        policy=policy,
+    )
+    try:
+        return await retryer(send)
+    except httpx.TransportError as e:
+        raise _transient(e) from e
+
+@asynccontextmanager
+async def stream(
+    method: str,
+    path: str,
+    *,
+    headers: dict[str, str] | None = None,
+    timeout: float | None = None,
+    endpoint: str | None = None,
+) -> AsyncIterator[httpx.Response]:
+    """
+    Open a streamed response on the shared pool (body not read). Upstream
+    URLs are rate limited and circuit-broken like `request`, but never
+    retried (a 429 only pauses the key). Other hosts (user file_url
+    downloads) bypass the limiter and breaker and get no x-request-id or
+    traceparent. Transport errors, including mid-body, surface as
+    TransientError. Latency is measured to response headers.
+    """
+    url = upstream_url(path)
+    label = endpoint or urlsplit(url).path or "/"
+    client = get_client()
+    guarded = _is_upstream(url)
+    api_key = _api_key(headers)
+    if guarded:
+        headers = _with_traceparent(_with_request_id(headers))
+    with span(f"upstream {method} {label}", method=method, endpoint=label, streamed=True) as sp:
+        async with _stream(client, method, url, label, headers, api_key, timeout, guarded) as resp:
+            sp.set(status=resp.status_code)
+            yield resp
+
+@asynccontextmanager
+async def _stream(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    label: str,
+    headers: dict[str, str] | None,
+    api_key: Optional[str],
+    timeout: float | None,
+    guarded: bool = True,
+) -> AsyncIterator[httpx.Response]:
+    cb = breaker() if guarded else None
+    if cb is not None:
+        await throttle(api_key, label)
+        cb.before_call()
+    start = time.perf_counter()
+    log.info("upstream_request", method=method, url=url, streamed=True)
+    try:
+        async with client.stream(
+            method,
+            url,
+            headers=headers,
+            timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout,
+        ) as resp:
+            if cb is not None:
+                cb.record_success()
+            UPSTREAM_LATENCY.observe(time.perf_counter() - start, method=method, endpoint=label, status=resp.status_code)
+            UPSTREAM_REQUESTS.inc(method=method, endpoint=label, status=resp.status_code)
+            log.info("upstream_response", status=resp.status_code, url=url, streamed=True)
+            if cb is not None:
+                _throttled(resp, api_key, label)
+            yield resp
+    except httpx.TransportError as e:
+        UPSTREAM_REQUESTS.inc(method=method, endpoint=label, status="error")
+        if cb is not None:
+            cb.record_failure()
+        log.warning("upstream_transport_error", error=repr(e), url=url)
+        raise _transient(e) from e
+    finally:
+        if cb is not None:
+            cb.release()  # no-op unless this was a half-open probe that never got headers
+
+# ---- convenience wrappers -----------------------------------------------------
+
 async def get_json(path: str, *, x_request_id: str | None = None, headers: dict[str, str] | None = None):
     s = get_settings()
-    base = s.minima_api_base.rstrip("/")
-    url = f"{base}/{path.lstrip('/')}"
     hdrs: dict[str, str] = {}
     if headers:
         hdrs.update(headers)
     if s.minima_api_key:
         hdrs.setdefault("x-api-key", s.minima_api_key)
     hdrs.setdefault("x-request-id", x_request_id or f"integritas-http-{uuid.uuid4().hex[:8]}")
-
-    last_exc: Exception | None = None
-    async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-        for attempt in range(RETRIES + 1):
-            try:
-                resp = await client.get(url, headers=hdrs)
-                return resp
-            except (httpx.ConnectError, httpx.ReadTimeout) as e:
-                last_exc = e
-                if attempt == RETRIES:
-                    raise
-                await asyncio.sleep(BACKOFF * (attempt + 1))
-    # Shouldn't get here; keep mypy happy
-    raise last_exc or RuntimeError("get_json fell through")
+    return await request("GET", path, headers=hdrs)
 
 async def post_json(path: str, json: dict, headers: dict[str, str]) -> httpx.Response:
-    s = get_settings()  # read at call time (honors env overrides in tests)
-    base = s.minima_api_base.rstrip("/")
-    url_path = path if path.startswith("/") else f"/{path}"
-    full_url = f"{base}{url_path}"
-
-    attempt = 0
-    delay = 0.2
-    while True:
-        attempt += 1
-        try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(s.request_timeout_seconds)) as client:
-                log.info("upstream_request", method="POST", url=full_url)
-                resp = await client.post(full_url, json=json, headers=headers)
-                log.info("upstream_response", status=resp.status_code, url=full_url)
-                # Log body only at DEBUG, or always for errors
-                if resp.status_code >= 400:
-                    log.info("upstream_response_body", body=_body_preview(resp))
-                else:
-                    log.info("upstream_response_body", body=_body_preview(resp))
-                return resp
-        # except (httpx.TransportError, httpx.ReadTimeout) as e:
-        #     if attempt >= s.max_retries:
-        #         log.warning("upstream_transport_error", error=str(e), url=full_url, attempt=attempt)
-        #         raise
-        #     log.warning("upstream_retrying", error=str(e), url=full_url, attempt=attempt, delay=delay)
-        #     await asyncio.sleep(delay)
-        #     delay = min(delay * 2, 2.0)
-        # except Exception as e:
-        #     log.exception("upstream_unexpected_error")
-        #     raise NetworkError(str(e)) from e
-        except (httpx.TransportError, httpx.ReadTimeout) as e:
-            # Make the error text useful
-            err_repr = repr(e)
-            if attempt >= s.max_retries:
-                log.warning("upstream_transport_error", error=err_repr, url=full_url, attempt=attempt)
-                # Map common timeout types to friendly messages
-                if isinstance(e, httpx.ConnectTimeout):
-                    raise TransientError("Upstream API unreachable (connect timeout)") from e
-                if isinstance(e, httpx.ReadTimeout):
-                    raise TransientError("Upstream request timed out") from e
-                raise TransientError(f"Upstream transport error: {err_repr}") from e
-
-            log.warning("upstream_retrying", error=err_repr, url=full_url, attempt=attempt, delay=delay)
-            await asyncio.sleep(delay)
-            delay = min(delay * 2, 2.0)
-
-        except Exception as e:
-            log.exception("upstream_unexpected_error")
-            # Ensure this is never blank
-            raise NetworkError(repr(e)) from e
\ No newline at end of file
+    resp = await request("POST", path, json=json, headers=headers)
+    log.info("upstream_response_body", body=_body_preview(resp))
+    return resp
@@ -0,0 +1,53 @@
+# src/integritas_mcp_server/instrumentation.py
+from __future__ import annotations
+import time
+from typing import Any, Optional
+
+from integritas_mcp_server.core import mcp
+from . import metrics
+from .lifecycle import ensure_started
+from .tracing import request_id_var, span
+
+# Per-tool-call instrumentation, applied where FastMCP dispatches tools
+# (ToolManager.call_tool) so no tool can be missed:
+# - latency histogram and in-flight gauge (served at /metrics)
+# - the MCP request id, bound for the call (upstream x-request-id, logs)
+# - the root tracing span of the call (tracing.py)
+# - deferred startup of shared resources on the first call (lifecycle.py)
+
+TOOL_LATENCY = metrics.histogram(
+    "integritas_tool_call_seconds", "MCP tool call latency by tool and outcome."
+)
+TOOL_INFLIGHT = metrics.gauge(
+    "integritas_tool_calls_in_flight", "MCP tool calls currently running, by tool."
+)
+
+_tool_manager = mcp._tool_manager
+_call_tool = _tool_manager.call_tool
+
+
+def _request_id(context: Any) -> Optional[str]:
+    try:
+        rid = getattr(context, "request_id", None)  # raises outside a request
+    except Exception:
+        return None
+    return str(rid) if rid is not None else None
+
+
+async def _instrumented_call_tool(name: str, arguments: dict[str, Any], *args: Any, **kwargs: Any) -> Any:
+    await ensure_started()
+    token = request_id_var.set(_request_id(kwargs.get("context")) or request_id_var.get())
+    start = time.perf_counter()
+    outcome = "error"
+    TOOL_INFLIGHT.inc(tool=name)
+    try:
+        with span(f"tool {name}", tool=name):
+            res = await _call_tool(name, arguments, *args, **kwargs)
+        outcome = "ok"
+        return res
+    finally:
+        TOOL_INFLIGHT.dec(tool=name)
+        TOOL_LATENCY.observe(time.perf_counter() - start, tool=name, outcome=outcome)
+        request_id_var.reset(token)
+
+_tool_manager.call_tool = _instrumented_call_tool  # type: ignore[method-assign]
@@ -0,0 +1,81 @@
+# src/integritas_mcp_server/lifecycle.py
+from __future__ import annotations
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+from .logging_setup import get_logger
+
+log = get_logger()
+
+# The same lifespan is entered by the ASGI app (once per process) and by
+# FastMCP (once per client session over SSE/HTTP, once in total over stdio).
+# Reference-count it so shared resources live as long as the outermost user.
+#
+# FastMCP enters it before answering `initialize`, so entering it only marks
+# the server live: the upstream pool and the stamp job workers (and the
+# http_client / tenacity / stamp_jobs imports behind them) start on the first
+# tool call (instrumentation.py). The ASGI apps, whose lifespan is not on any
+# client's handshake path, start them eagerly through app_lifespan.
+_users = 0
+_started = False
+_start_lock: Optional[asyncio.Lock] = None
+
+
+async def _startup() -> None:
+    # Lazy imports: keep `core` import-light and settings read at call time.
+    from .http_client import open_client
+    from .services.stamp_jobs import start_workers
+    await open_client()
+    await start_workers()
+    log.info("lifecycle_startup")
+
+
+async def _shutdown() -> None:
+    from .http_client import close_client
+    from .services.stamp_jobs import stop_workers
+    from .services.stamp_status import stop_poller
+    from .state import close_stores
+    from .tracing import close_exporter
+    await stop_workers()
+    await stop_poller()
+    await close_client()
+    await close_exporter()
+    close_stores()
+    log.info("lifecycle_shutdown")
+
+
+async def ensure_started() -> None:
+    """Start process-wide resources once, inside a live lifespan (no-op outside one)."""
+    global _started, _start_lock
+    if _started or _users == 0:
+        return
+    if _start_lock is None:
+        _start_lock = asyncio.Lock()
+    async with _start_lock:
+        if not _started and _users > 0:
+            await _startup()
+            _started = True
+
+
+@asynccontextmanager
+async def server_lifespan(_app: Any = None) -> AsyncIterator[dict[str, Any]]:
+    """Mark the server live on first entry, close what was started on last exit."""
+    global _users, _started, _start_lock
+    _users += 1
+    try:
+        yield {}
+    finally:
+        _users -= 1
+        if _users == 0:
+            started, _started, _start_lock = _started, False, None
+            if started:
+                await _shutdown()
+
+
+@asynccontextmanager
+async def app_lifespan(app: Any = None) -> AsyncIterator[dict[str, Any]]:
+    """server_lifespan for ASGI apps: resources start with the process."""
+    async with server_lifespan(app) as state:
+        await ensure_started()
+        yield state
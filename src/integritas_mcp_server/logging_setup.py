@@ -28,9 +28,19 @@ def _force_utf8_stdio():
             except Exception:
                 pass
 
+def _level() -> int:
+    try:
+        from .config import get_settings  # lazy, like the rest of startup
+        name = get_settings().log_level
+    except Exception:  # incomplete settings are reported by whoever needs them
+        name = "INFO"
+    level = logging.getLevelName(str(name).upper())
+    return level if isinstance(level, int) else logging.INFO
+
 def setup_logging():
     _force_utf8_stdio()
-    logging.basicConfig(level=logging.INFO, stream=sys.stderr, format="%(message)s")
+    level = _level()
+    logging.basicConfig(level=level, stream=sys.stderr, format="%(message)s")
     structlog.configure(
         processors=[
             structlog.processors.TimeStamper(fmt="iso"),
@@ -38,6 +48,8 @@ def setup_logging():
             redact_processor,
             structlog.processors.JSONRenderer(ensure_ascii=True),  # JSON to STDERR
         ],
+        # below LOG_LEVEL nothing is rendered (lazy payloads are never serialized)
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         logger_factory=structlog.PrintLoggerFactory(file=sys.stderr),
         cache_logger_on_first_use=True,
     )
@@ -1,46 +1,144 @@
 # src/integritas_mcp_server/logging_utils.py
 from __future__ import annotations
-from typing import Any, Callable, Optional
-import functools, json
-from .logging_setup import get_logger
+from enum import Enum
+from typing import Any, Callable, List
+import functools, json, random, time
+from pydantic import BaseModel
+from .config import get_settings
+from .logging_setup import SENSITIVE, get_logger
+from .tracing import current_request_id
+from . import metrics
 
 log = get_logger()
 
-def _safe_json(v: Any, limit: int = 2000) -> Any:
+# tool_start / tool_success / tool_error for every tool call. Payload bodies
+# (kwargs, result) are only attached for TOOL_LOG_SAMPLE_RATE of the calls,
+# and only serialized if the line is actually rendered (lazy, see _Payload).
+# Serialization walks at most TOOL_LOG_MAX_CHARS worth of the payload, so a
+# large upstream `raw` block costs no more than a small one.
+
+TOOL_LOG_SECONDS = metrics.histogram(
+    "integritas_tool_log_seconds",
+    "Time spent logging tool calls (payload serialization included), by tool.",
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05),
+)
+
+_ELLIPSIS = "..."
+
+
+class _Budget:
+    def __init__(self, chars: int):
+        self.left = chars
+
+    def take(self, s: str) -> str:
+        if len(s) <= self.left:
+            self.left -= len(s)
+            return s
+        cut, self.left = s[: max(self.left, 0)], 0
+        return cut + _ELLIPSIS
+
+
+def _items(v: Any):
+    if isinstance(v, BaseModel):
+        return ((k, getattr(v, k, None)) for k in type(v).model_fields)
+    return v.items()
+
+
+def _bounded(v: Any, budget: _Budget) -> Any:
+    """A JSON-able copy of `v` that stops once the budget is spent."""
+    if budget.left <= 0:
+        return _ELLIPSIS
+    if v is None or isinstance(v, (bool, int, float)):
+        budget.take(str(v))
+        return v
+    if isinstance(v, Enum):
+        return _bounded(v.value, budget)
+    if isinstance(v, str):
+        return budget.take(v)
+    if isinstance(v, (bytes, bytearray)):
+        return budget.take(f"<{len(v)} bytes>")
+    if isinstance(v, (dict, BaseModel)):
+        out: dict = {}
+        for k, item in _items(v):
+            if budget.left <= 0:
+                out[_ELLIPSIS] = _ELLIPSIS
+                break
+            key = budget.take(str(k))
+            out[key] = "[REDACTED]" if str(k).lower() in SENSITIVE else _bounded(item, budget)
+        return out
+    if isinstance(v, (list, tuple, set, frozenset)):
+        seq: List[Any] = []
+        for item in v:
+            if budget.left <= 0:
+                seq.append(_ELLIPSIS)
+                break
+            seq.append(_bounded(item, budget))
+        return seq
+    return budget.take(str(v))
+
+
+def _safe_json(v: Any, limit: int = 2000) -> str:
     try:
-        s = json.dumps(v, default=str)  # ensure_ascii defaults to True
-        return (s[:limit] + "...") if len(s) > limit else s
+        s = json.dumps(_bounded(v, _Budget(limit)), default=str)  # ensure_ascii defaults to True
     except Exception:
-        return (str(v)[:limit] + "...")
+        s = str(v)[:limit]
+    # keys, quotes and separators are not budgeted; keep the hard cap
+    return (s[:limit] + _ELLIPSIS) if len(s) > limit else s
+
+
+class _Payload:
+    """Serialized by structlog's JSON renderer only when the line is emitted."""
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: int):
+        self.value = value
+        self.limit = limit
+
+    def __structlog__(self) -> str:
+        return _safe_json(self.value, self.limit)
+
+    __repr__ = __structlog__
+
 
 def tool_logger(fn: Callable):
-    """Decorator to log tool start/success/error with req_id correlation."""
+    """
+    Decorator to log tool start/success/error with req_id correlation.
+    Must sit under @mcp.tool() so the registered function is the wrapper.
+    """
     @functools.wraps(fn)
     async def wrapper(*args, **kwargs):
         # ctx is either kwarg or second positional (mcp.fastmcp style)
         ctx = kwargs.get("ctx") or (args[1] if len(args) > 1 else None)
-        req_id = getattr(ctx, "request_id", None) if ctx else None
+        req_id = (getattr(ctx, "request_id", None) if ctx else None) or current_request_id()
+        s = get_settings()
+        sampled = s.tool_log_sample_rate > 0 and random.random() < s.tool_log_sample_rate
+        limit = s.tool_log_max_chars
 
-        # Log inputs (truncate)
-        log.info(
-            "tool_start",
-            tool=fn.__name__,
-            req_id=req_id,
-            kwargs=_safe_json({k: v for k, v in kwargs.items() if k != "ctx"})
-        )
+        t0 = time.perf_counter()
+        extra = {"kwargs": _Payload({k: v for k, v in kwargs.items() if k != "ctx"}, limit)} if sampled else {}
+        log.info("tool_start", tool=fn.__name__, req_id=req_id, **extra)
+        overhead = time.perf_counter() - t0
+
+        start = time.perf_counter()
         try:
             res = await fn(*args, **kwargs)
-            # avoid dumping huge models
-            out = getattr(res, "model_dump", None)
-            payload = out() if callable(out) else res
-            log.info(
-                "tool_success",
-                tool=fn.__name__,
-                req_id=req_id,
-                result=_safe_json(payload)
-            )
-            return res
         except Exception as e:
             log.exception("tool_error", tool=fn.__name__, req_id=req_id, err=str(e))
             raise
+        duration = time.perf_counter() - start
+
+        t0 = time.perf_counter()
+        # the result model is walked, not model_dump()ed; bounded by `limit`
+        extra = {"result": _Payload(res, limit)} if sampled else {}
+        log.info(
+            "tool_success",
+            tool=fn.__name__,
+            req_id=req_id,
+            duration_ms=round(duration * 1000, 2),
+            log_overhead_ms=round(overhead * 1000, 3),
+            **extra,
+        )
+        TOOL_LOG_SECONDS.observe(overhead + time.perf_counter() - t0, tool=fn.__name__)
+        return res
     return wrapper
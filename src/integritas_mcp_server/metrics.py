@@ -0,0 +1,144 @@
+# src/integritas_mcp_server/metrics.py
+from __future__ import annotations
+import threading
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+
+# Minimal in-process metrics: labelled counters, gauges and histograms.
+# Kept dependency-free; exposition formats live with their transports.
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+def _key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        k = _key(labels)
+        with self._lock:
+            self._values[k] = self._values.get(k, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        return self._values.get(_key(labels), 0.0)
+
+    def samples(self) -> Dict[LabelKey, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Optional[Sequence[float]] = None):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets or DEFAULT_BUCKETS))
+        # label key -> [per-bucket counts..., count, sum]
+        self._values: Dict[LabelKey, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: object) -> None:
+        k = _key(labels)
+        with self._lock:
+            row = self._values.get(k)
+            if row is None:
+                row = self._values[k] = [0.0] * (len(self.buckets) + 2)
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    row[i] += 1
+            row[-2] += 1
+            row[-1] += value
+
+    def count(self, **labels: object) -> int:
+        row = self._values.get(_key(labels))
+        return int(row[-2]) if row else 0
+
+    def samples(self) -> Dict[LabelKey, list[float]]:
+        with self._lock:
+            return {k: list(v) for k, v in self._values.items()}
+
+
+class Gauge:
+    """A settable value; with `fn`, read on demand (returns label key -> value)."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Optional[Callable[[], Dict[LabelKey, float]]] = None):
+        self.name = name
+        self.help = help
+        self.fn = fn
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        k = _key(labels)
+        with self._lock:
+            self._values[k] = self._values.get(k, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: object) -> None:
+        with self._lock:
+            self._values[_key(labels)] = value
+
+    def value(self, **labels: object) -> float:
+        return self.samples().get(_key(labels), 0.0)
+
+    def samples(self) -> Dict[LabelKey, float]:
+        if self.fn is not None:
+            try:
+                return dict(self.fn())
+            except Exception:
+                return {}
+        with self._lock:
+            return dict(self._values)
+
+
+Metric = Union[Counter, Histogram, Gauge]
+
+_REGISTRY: Dict[str, Metric] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+def counter(name: str, help: str) -> Counter:
+    with _REGISTRY_LOCK:
+        m = _REGISTRY.get(name)
+        if m is None:
+            m = _REGISTRY[name] = Counter(name, help)
+        assert isinstance(m, Counter)
+        return m
+
+def histogram(name: str, help: str, buckets: Optional[Sequence[float]] = None) -> Histogram:
+    with _REGISTRY_LOCK:
+        m = _REGISTRY.get(name)
+        if m is None:
+            m = _REGISTRY[name] = Histogram(name, help, buckets)
+        assert isinstance(m, Histogram)
+        return m
+
+def gauge(name: str, help: str, fn: Optional[Callable[[], Dict[LabelKey, float]]] = None) -> Gauge:
+    with _REGISTRY_LOCK:
+        m = _REGISTRY.get(name)
+        if m is None:
+            m = _REGISTRY[name] = Gauge(name, help, fn)
+        assert isinstance(m, Gauge)
+        return m
+
+def labels(**kv: object) -> LabelKey:
+    """Label key for callback gauges."""
+    return _key(kv)
+
+def registry() -> Dict[str, Metric]:
+    with _REGISTRY_LOCK:
+        return dict(_REGISTRY)
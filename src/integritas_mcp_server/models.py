@@ -12,7 +12,7 @@ Design goals:
 - No business logic in models (validators are only for "one-of" input sanity)
 """
 
-from typing import Optional, Dict, Any, List, Literal
+from typing import Optional, Dict, Any, List, Literal, Union
 from datetime import datetime, timezone
 
 from pydantic import BaseModel, Field, AnyUrl, ConfigDict, model_validator
@@ -21,8 +21,17 @@ from pydantic import BaseModel, Field, AnyUrl, ConfigDict, model_validator
 
 STAMP_RESULT_KIND = "integritas/stamp_result@v1"
 VERIFY_RESULT_KIND = "integritas/verify_result@v1"
+STAMP_BATCH_RESULT_KIND = "integritas/stamp_batch_result@v1"
+VERIFY_BATCH_RESULT_KIND = "integritas/verify_batch_result@v1"
+STAMP_JOB_RESULT_KIND = "integritas/stamp_job@v1"
 SCHEMA_URI = "https://integritas.dev/schemas/tool-result-v1.json"
 
+# What structuredContent carries (RESPONSE_PROFILE / per-request response_profile):
+#   full     -> everything, including the upstream payload as data.raw
+#   compact  -> data.raw dropped; a "raw" link points to integritas://raw/{rawId}
+#   ids-only -> kind, status, ids, links and error only
+ResponseProfile = Literal["full", "compact", "ids-only"]
+
 # ---------- Common UI primitives ----------
 
 class ToolLink(BaseModel):
@@ -65,6 +74,9 @@ class ToolResponse(BaseModel):
 # Keep specific class names for clarity/imports, but they’re identical.
 class StampDataResponse(ToolResponse): ...
 class VerifyDataResponse(ToolResponse): ...
+class StampDataBatchResponse(ToolResponse): ...
+class VerifyDataBatchResponse(ToolResponse): ...
+class StampJobStatusResponse(ToolResponse): ...
 
 
 # ---------- Requests ----------
@@ -76,10 +88,22 @@ class StampDataRequest(BaseModel):
       - file_hash  (preferred if you already computed it)
       - file_url   (server downloads and stamps)
       - file_path  (server reads local path and stamps)
+
+    hash_locally (file_path / file_url): compute SHA3-256 on the server and
+    stamp the hash instead of uploading the file. None = automatic, on for
+    files known to be above LOCAL_HASH_THRESHOLD_BYTES.
+
+    async_job: enqueue the stamp in the durable job queue and return a job
+    id at once; poll it with stamp_job_status.
+
+    response_profile: full | compact | ids-only (default RESPONSE_PROFILE).
     """
     file_hash: Optional[str] = None
     file_url: Optional[AnyUrl] = None
     file_path: Optional[str] = None
+    hash_locally: Optional[bool] = None
+    async_job: bool = False
+    response_profile: Optional[ResponseProfile] = None
     api_key: Optional[str] = None  # forwarded to upstream if set
 
     @model_validator(mode="after")
@@ -89,15 +113,30 @@ class StampDataRequest(BaseModel):
         return self
 
 
+class StampDataBatchRequest(BaseModel):
+    """
+    Stamp many items in one call. Each item is a StampDataRequest and goes
+    through the same single-item logic; at most `concurrency` run at once
+    (default STAMP_BATCH_CONCURRENCY). A batch-level api_key and
+    response_profile apply to items that do not carry their own.
+    """
+    items: List[StampDataRequest] = Field(..., min_length=1)
+    concurrency: Optional[int] = Field(default=None, ge=1)
+    response_profile: Optional[ResponseProfile] = None
+    api_key: Optional[str] = None
+
+
 class VerifyDataRequest(BaseModel):
     """
     Verify a proof file (JSON) from a URL or local path.
     Provide one of:
       - file_url
       - file_path
+    response_profile: full | compact | ids-only (default RESPONSE_PROFILE).
     """
     file_url: Optional[AnyUrl] = None
     file_path: Optional[str] = None
+    response_profile: Optional[ResponseProfile] = None
     api_key: Optional[str] = None  # forwarded to upstream if set
 
     @model_validator(mode="after")
@@ -107,6 +146,88 @@ class VerifyDataRequest(BaseModel):
         return self
 
 
+class VerifyDataBatchRequest(BaseModel):
+    """
+    Verify many proof files in one call. Sources are combined:
+      - directory  (every *.json directly inside it)
+      - glob       (server-side pattern, ** allowed)
+      - files      (list of URLs or local paths)
+    Identical proof contents are verified once. response_profile applies to
+    every item result.
+    """
+    directory: Optional[str] = None
+    glob: Optional[str] = None
+    files: Optional[List[str]] = None
+    concurrency: Optional[int] = Field(default=None, ge=1)
+    response_profile: Optional[ResponseProfile] = None
+    api_key: Optional[str] = None  # forwarded to upstream if set
+
+    @model_validator(mode="after")
+    def _one_of(self):
+        if not (self.directory or self.glob or self.files):
+            raise ValueError("Provide directory, glob, or files.")
+        return self
+
+
+class StampJobStatusRequest(BaseModel):
+    """Look up an async stamp job (StampDataRequest.async_job) by id."""
+    job_id: str
+
+
+# ---------- Stamp status ----------
+
+class StampStatusRequest(BaseModel):
+    """
+    Look up stamps by uid. Pending stamps are polled (shared, batched) until
+    they land on chain, fail, or the server's attempt budget runs out.
+    wait=False answers at once (last poll, or one lookup now); subscribe to
+    integritas://stamp/{uid} to be notified instead of waiting.
+    """
+    uids: List[str]
+    wait: bool = True
+    api_key: Optional[str] = None  # forwarded to upstream if set
+
+
+class StampStatusResultSuccess(BaseModel):
+    """On chain: proof fields are present."""
+    model_config = ConfigDict(extra="allow")
+    status: Literal[True] = True
+    uid: str
+    data: str
+    number: int
+    datecreated: str
+    datestamped: Optional[str] = None
+    root: Optional[str] = None
+    proof: Optional[str] = None
+    address: Optional[str] = None
+    onchain: Literal[True] = True
+
+
+class StampStatusResultPending(BaseModel):
+    """Accepted but not yet on chain (or still unresolved when polling stopped)."""
+    model_config = ConfigDict(extra="allow")
+    status: Literal[True] = True
+    uid: str
+    data: str = ""
+    number: int = 0
+    datecreated: str = ""
+    onchain: Literal[False] = False
+
+
+class StampStatusResultError(BaseModel):
+    status: Literal[False] = False
+    uid: str
+    error: str
+
+
+StampStatusResult = Union[StampStatusResultSuccess, StampStatusResultPending, StampStatusResultError]
+
+
+class StampStatusResponse(BaseModel):
+    requestId: str
+    data: List[StampStatusResult]
+
+
 # ---------- Health (optional but handy) ----------
 
 class HealthResponse(BaseModel):
@@ -118,4 +239,5 @@ class HealthResponse(BaseModel):
     upstream_reachable: bool = True
     upstream_status: Optional[int] = None
     upstream_latency_ms: Optional[int] = None
+    upstream_circuit: Literal["closed", "open", "half_open"] = "closed"
     summary: str = "Healthy"
\ No newline at end of file
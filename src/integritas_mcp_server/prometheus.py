@@ -0,0 +1,75 @@
+# src/integritas_mcp_server/prometheus.py
+from __future__ import annotations
+import hmac
+import math
+from typing import List
+
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+
+from .config import get_settings
+from .metrics import Counter, Gauge, Histogram, LabelKey, registry
+from . import http_client, instrumentation  # register their metrics before first use
+
+# GET /metrics on the SSE and HTTP apps: the metrics.py registry in the
+# Prometheus text format (0.0.4). Unauthenticated like /healthz unless
+# METRICS_TOKEN is set, in which case scrapers send it as a bearer token
+# (deliberately separate from MCP_ACCESS_TOKEN).
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(key: LabelKey, extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _le(bound: str) -> str:
+    return f'le="{bound}"'
+
+
+def _num(v: float) -> str:
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+def render() -> str:
+    out: List[str] = []
+    for name, m in sorted(registry().items()):
+        out.append(f"# HELP {name} {m.help}")
+        out.append(f"# TYPE {name} {m.kind}")
+        if isinstance(m, (Counter, Gauge)):
+            for key, v in sorted(m.samples().items()):
+                out.append(f"{name}{_labels(key)} {_num(v)}")
+        elif isinstance(m, Histogram):
+            for key, row in sorted(m.samples().items()):
+                # per-bucket counts are already cumulative (observe counts every bucket >= value)
+                for upper, n in zip(m.buckets, row):
+                    out.append(f"{name}_bucket{_labels(key, _le(_num(upper)))} {_num(n)}")
+                out.append(f"{name}_bucket{_labels(key, _le('+Inf'))} {_num(row[-2])}")
+                out.append(f"{name}_count{_labels(key)} {_num(row[-2])}")
+                out.append(f"{name}_sum{_labels(key)} {_num(row[-1])}")
+    return "\n".join(out) + "\n"
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    token = get_settings().metrics_token
+    if token:
+        auth = request.headers.get("authorization") or ""
+        provided = auth[7:] if auth.lower().startswith("bearer ") else ""
+        if not hmac.compare_digest(provided.encode(), token.encode()):
+            return PlainTextResponse(
+                "invalid token", status_code=401, headers={"WWW-Authenticate": 'Bearer realm="metrics"'}
+            )
+    return PlainTextResponse(render(), media_type=CONTENT_TYPE)
+
+
+metrics_route = Route("/metrics", metrics_endpoint, methods=["GET"])
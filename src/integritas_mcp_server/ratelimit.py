@@ -0,0 +1,110 @@
+# src/integritas_mcp_server/ratelimit.py
+from __future__ import annotations
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from .config import get_settings
+from . import metrics
+
+# Client-side rate limiting toward the upstream API.
+#
+# One token bucket per API key (UPSTREAM_RATE_PER_SECOND, UPSTREAM_RATE_BURST).
+# Callers queue rather than fail: a caller that finds the bucket empty takes a
+# token on credit and sleeps until it would have refilled, so waiters are
+# released in arrival order at the configured rate. A 429 with Retry-After
+# pauses the key's bucket; nobody on that key is released before it expires.
+
+RATE_LIMIT_WAIT = metrics.histogram(
+    "integritas_upstream_rate_limit_wait_seconds", "Time spent queued by the client-side rate limiter."
+)
+
+
+class TokenBucket:
+    """`rate` tokens/second, at most `burst` banked. rate <= 0 disables."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.stamp = time.monotonic()     # time `tokens` refers to; may be in the future
+        self.paused_until = 0.0
+
+    def reserve(self) -> float:
+        """Take one token; returns how long the caller must wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        if now > self.stamp:
+            self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+        self.tokens -= 1
+        return (self.stamp - now) + max(0.0, -self.tokens) / self.rate
+
+    async def acquire(self) -> float:
+        waited = 0.0
+        delay = self.reserve()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            waited += delay
+            # a Retry-After may have arrived while we slept
+            delay = self.paused_until - time.monotonic()
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """Release nothing for `seconds`; banked tokens are forfeited."""
+        if seconds <= 0:
+            return
+        until = time.monotonic() + seconds
+        self.paused_until = max(self.paused_until, until)
+        if self.rate > 0 and until > self.stamp:
+            self.tokens = min(self.tokens, 0.0)
+            self.stamp = until
+
+
+_buckets: Dict[str, TokenBucket] = {}
+
+
+def _bucket_id(api_key: Optional[str]) -> str:
+    return hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+
+
+def bucket_for(api_key: Optional[str]) -> TokenBucket:
+    bid = _bucket_id(api_key)
+    b = _buckets.get(bid)
+    if b is None:
+        s = get_settings()
+        b = _buckets[bid] = TokenBucket(s.upstream_rate_per_second, s.upstream_rate_burst)
+    return b
+
+
+async def throttle(api_key: Optional[str], endpoint: str = "") -> None:
+    waited = await bucket_for(api_key).acquire()
+    if waited:
+        RATE_LIMIT_WAIT.observe(waited, endpoint=endpoint)
+
+
+def reset() -> None:
+    """Forget all buckets (tests, settings changes)."""
+    _buckets.clear()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as delta-seconds or HTTP-date; None if absent/unparsable."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
@@ -1,8 +1,13 @@
 # integritas_mcp/resources.py
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import os
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
 
 from pydantic import BaseModel
 from mcp.server.fastmcp import Context
@@ -15,6 +20,65 @@ from integritas_mcp_server.core import mcp
 def iso_now() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
+# ---------------------------------------------------------------
+# 0b) Document cache: every document below is built once, on first
+# read, and served from memory. Documents are a pure function of this
+# module and models.py, so each carries an ETag (digest of those
+# sources and the document key) and lastModified (their mtime), known
+# without building anything and the same across restarts and workers.
+# They are set as the resource's meta at registration, which FastMCP
+# sends as the read's _meta. A read whose request _meta has
+# {"ifNoneMatch": <etag>} gets the same marker for every document, Markdown
+# or JSON: {"etag": ..., "lastModified": ..., "notModified": true} (schemas
+# add their name), without building the document.
+# ---------------------------------------------------------------
+_DOCS: dict[str, str] = {}
+
+def _sources() -> tuple[str, ...]:
+    from . import models
+    return (__file__, models.__file__)
+
+@lru_cache(maxsize=1)
+def _built_at() -> str:
+    mtime = max(os.path.getmtime(f) for f in _sources())
+    return datetime.fromtimestamp(int(mtime), timezone.utc).isoformat()
+
+@lru_cache(maxsize=1)
+def _source_digest() -> str:
+    h = hashlib.sha256()
+    for f in _sources():
+        with open(f, "rb") as fh:
+            h.update(fh.read())
+    return h.hexdigest()
+
+def _etag(key: str) -> str:
+    return '"' + hashlib.sha256(f"{_source_digest()}:{key}".encode()).hexdigest()[:32] + '"'
+
+def _meta(key: str) -> dict[str, str]:
+    return {"etag": _etag(key), "lastModified": _built_at()}
+
+def _document(key: str, build: Callable[[], str]) -> str:
+    body = _DOCS.get(key)
+    if body is None:
+        body = _DOCS[key] = build()
+    return body
+
+def _if_none_match() -> Optional[str]:
+    try:
+        meta = mcp.get_context().request_context.meta
+    except (LookupError, ValueError):  # not inside a request
+        return None
+    return getattr(meta, "ifNoneMatch", None) if meta is not None else None
+
+def _not_modified(head: dict[str, str]) -> str:
+    return json.dumps({**head, "notModified": True})
+
+def _serve(uri: str, build: Callable[[], str]) -> str:
+    """Cached body of a static resource (registered with meta=_meta(uri))."""
+    if _if_none_match() == _etag(uri):
+        return _not_modified(_meta(uri))
+    return _document(uri, build)
+
 # --------------------------------
 # 1) Static Markdown documentation
 # --------------------------------
@@ -47,15 +111,15 @@ Either supply a hash for on-chain lookup or provide a proof bundle.
 Depends on your upstream policy; include `api_key` when needed.
 """
 
-@mcp.resource("integritas://docs/overview", mime_type="text/markdown")
+@mcp.resource("integritas://docs/overview", mime_type="text/markdown", meta=_meta("integritas://docs/overview"))
 def docs_overview() -> str:
     """Integritas product overview (Markdown)"""
-    return _OVERVIEW_MD
+    return _serve("integritas://docs/overview", lambda: _OVERVIEW_MD)
 
-@mcp.resource("integritas://docs/faq", mime_type="text/markdown")
+@mcp.resource("integritas://docs/faq", mime_type="text/markdown", meta=_meta("integritas://docs/faq"))
 def docs_faq() -> str:
     """Frequently asked questions (Markdown)"""
-    return _FAQ_MD
+    return _serve("integritas://docs/faq", lambda: _FAQ_MD)
 
 # -------------------------------------------------------
 # 2) Dynamic tool catalog (Markdown) from your own models
@@ -66,14 +130,26 @@ def docs_faq() -> str:
 try:
     from .models import (
         StampDataRequest, StampDataResponse,
+        StampDataBatchRequest, StampDataBatchResponse,
         VerifyDataRequest, VerifyDataResponse,
+        VerifyDataBatchRequest, VerifyDataBatchResponse,
+        StampStatusRequest, StampStatusResponse,
+        StampJobStatusRequest, StampJobStatusResponse,
     )
 except Exception:
     # Fallback stubs if imports aren’t ready yet
     class StampDataRequest(BaseModel): hash: Optional[str] = None
     class StampDataResponse(BaseModel): status: str
+    class StampDataBatchRequest(BaseModel): items: list = []
+    class StampDataBatchResponse(BaseModel): status: str
     class VerifyDataRequest(BaseModel): hash: Optional[str] = None
     class VerifyDataResponse(BaseModel): is_valid: bool
+    class VerifyDataBatchRequest(BaseModel): files: list = []
+    class VerifyDataBatchResponse(BaseModel): status: str
+    class StampStatusRequest(BaseModel): uids: list = []
+    class StampStatusResponse(BaseModel): data: list = []
+    class StampJobStatusRequest(BaseModel): job_id: str = ""
+    class StampJobStatusResponse(BaseModel): status: str
 
 TOOL_REGISTRY: list[dict[str, Any]] = [
     {
@@ -87,6 +163,36 @@ TOOL_REGISTRY: list[dict[str, Any]] = [
             {"file_url": "https://example.com/file.pdf"}
         ],
     },
+    {
+        "name": "stamp_batch.v1",
+        "title": "Stamp many items",
+        "description": "Stamp a list of hashes/files with bounded concurrency; one aggregated result.",
+        "input_model": StampDataBatchRequest,
+        "output_model": StampDataBatchResponse,
+        "examples": [
+            {"items": [{"file_hash": "4f48…34998"}, {"file_url": "https://example.com/a.pdf"}], "concurrency": 4}
+        ],
+    },
+    {
+        "name": "stamp_status.v1",
+        "title": "Stamp status by uid",
+        "description": "Resolve uids to on-chain proof data; pending uids are polled (shared, batched).",
+        "input_model": StampStatusRequest,
+        "output_model": StampStatusResponse,
+        "examples": [
+            {"uids": ["0x54C8EF1CFCE47CCB1ACE"]}
+        ],
+    },
+    {
+        "name": "stamp_job_status.v1",
+        "title": "Async stamp job status",
+        "description": "Read a stamp queued with async_job: queued/running/done/failed plus the stamp result.",
+        "input_model": StampJobStatusRequest,
+        "output_model": StampJobStatusResponse,
+        "examples": [
+            {"job_id": "4c1f0e9a2b7d4e36a1c0d5f7e8b9a012"}
+        ],
+    },
     {
         "name": "verify.v1",
         "title": "Verify hash or proof bundle",
@@ -98,6 +204,18 @@ TOOL_REGISTRY: list[dict[str, Any]] = [
             {"proof_url": "https://example.com/proof.json"}
         ],
     },
+    {
+        "name": "verify_batch.v1",
+        "title": "Verify many proof files",
+        "description": "Verify a directory, glob or list of proofs; identical proofs are verified once.",
+        "input_model": VerifyDataBatchRequest,
+        "output_model": VerifyDataBatchResponse,
+        "examples": [
+            {"directory": "/data/proofs"},
+            {"glob": "/data/**/*.json", "concurrency": 4},
+            {"files": ["/data/a.json", "https://example.com/b.json"]}
+        ],
+    },
 ]
 
 def _render_tools_markdown() -> str:
@@ -112,24 +230,24 @@ def _render_tools_markdown() -> str:
             "",
             "### Input schema",
             "```json",
-            __import__("json").dumps(in_schema, indent=2),
+            json.dumps(in_schema, indent=2),
             "```",
             "### Output schema",
             "```json",
-            __import__("json").dumps(out_schema, indent=2),
+            json.dumps(out_schema, indent=2),
             "```",
         ]
         if ex := tool.get("examples"):
             lines += ["### Examples", "```json",
-                      __import__("json").dumps(ex, indent=2),
+                      json.dumps(ex, indent=2),
                       "```"]
         lines.append("")
     return "\n".join(lines)
 
-@mcp.resource("integritas://docs/tools", mime_type="text/markdown")
+@mcp.resource("integritas://docs/tools", mime_type="text/markdown", meta=_meta("integritas://docs/tools"))
 def docs_tools_catalog() -> str:
     """Human-readable catalog of tools with schemas/examples"""
-    return _render_tools_markdown()
+    return _serve("integritas://docs/tools", _render_tools_markdown)
 
 # ------------------------------------------------------
 # 3) Schema template: integritas://schema/{name} (JSON)
@@ -138,21 +256,47 @@ def docs_tools_catalog() -> str:
 _SCHEMA_INDEX: dict[str, type[BaseModel]] = {
     "stamp_input": StampDataRequest,
     "stamp_output": StampDataResponse,
+    "stamp_batch_input": StampDataBatchRequest,
+    "stamp_batch_output": StampDataBatchResponse,
+    "stamp_status_input": StampStatusRequest,
+    "stamp_status_output": StampStatusResponse,
+    "stamp_job_status_input": StampJobStatusRequest,
+    "stamp_job_status_output": StampJobStatusResponse,
     "verify_input": VerifyDataRequest,
-    "verify_output": VerifyDataResponse
+    "verify_output": VerifyDataResponse,
+    "verify_batch_input": VerifyDataBatchRequest,
+    "verify_batch_output": VerifyDataBatchResponse,
 }
 
 @mcp.resource("integritas://schema/{name}", mime_type="application/json")
-def schema_by_name(name: str) -> dict:
+def schema_by_name(name: str) -> str:
     """JSON Schema for inputs/outputs (e.g., schema/stamp_input)"""
     model = _SCHEMA_INDEX.get(name)
     if not model:
-        return {"error": {"code": "NOT_FOUND", "message": f"Unknown schema '{name}'"}}
-    return {
-        "name": name,
-        "lastModified": iso_now(),
-        "schema": model.model_json_schema(),
-    }
+        return json.dumps({"error": {"code": "NOT_FOUND", "message": f"Unknown schema '{name}'"}})
+    key = f"schema/{name}"
+    head = {"name": name, **_meta(key)}
+    if _if_none_match() == head["etag"]:
+        return _not_modified(head)
+    # the schema is spliced in pre-serialized; only the small head is encoded per read
+    body = _document(key, lambda: json.dumps(model.model_json_schema()))
+    return json.dumps(head)[:-1] + ', "schema": ' + body + "}"
+
+# ----------------------------------------------------------------
+# 3b) Raw upstream payloads: integritas://raw/{raw_id} (JSON)
+# ----------------------------------------------------------------
+# Linked (rel "raw") from results returned with a compact or ids-only
+# response profile, which leave data.raw out of structuredContent. Only
+# served to the API key the payload was fetched with.
+@mcp.resource("integritas://raw/{raw_id}", mime_type="application/json")
+async def raw_payload(raw_id: str) -> str:
+    """Full upstream payload of a stamp/verify result (compact / ids-only responses link here)"""
+    from .secrets import resolve_api_key_async
+    from .services.raw_payloads import lookup
+    payload = await asyncio.to_thread(lookup, raw_id, await resolve_api_key_async())
+    if payload is None:
+        return json.dumps({"error": {"code": "NOT_FOUND", "message": f"No payload kept for '{raw_id}'"}})
+    return payload
 
 # -----------------------------------------
 # 4) Server info: integritas://server/info
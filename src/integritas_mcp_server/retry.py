@@ -0,0 +1,210 @@
+# src/integritas_mcp_server/retry.py
+from __future__ import annotations
+import random
+import time
+from dataclasses import dataclass, field, replace
+from typing import Dict, FrozenSet, Optional
+
+import httpx
+import structlog
+from tenacity import AsyncRetrying, RetryCallState, stop_after_attempt
+from tenacity.wait import wait_base
+
+from .config import get_settings
+from .circuit import breaker
+from .ratelimit import parse_retry_after
+from . import metrics
+
+log = structlog.get_logger()
+
+# The one retry layer for upstream calls (used by http_client.request).
+#
+# - Policy per endpoint (longest path-prefix match, adjusted by
+#   RETRY_POLICIES): attempts, backoff, which statuses are retryable and
+#   whether the endpoint is idempotent.
+# - Idempotent endpoints (status polls, verify, GETs) retry transport errors
+#   and retryable statuses freely. Non-idempotent ones (one-shot stamps) only
+#   when the caller supplies an idempotency key, which is sent upstream.
+# - 429s are retried for any replayable request: nothing was processed, and
+#   the rate limiter holds the call until Retry-After has passed.
+# - Backoff is decorrelated jitter: sleep = min(cap, U(base, 3 * previous)).
+# - A process-wide retry budget caps retries to RETRY_BUDGET_RATIO of
+#   requests (plus a small per-second floor), so an outage does not multiply
+#   upstream load; an open circuit ends retrying at once.
+
+UPSTREAM_RETRIES = metrics.counter(
+    "integritas_upstream_retries_total", "Upstream requests retried, by reason."
+)
+RETRY_BUDGET_EXHAUSTED = metrics.counter(
+    "integritas_upstream_retry_budget_exhausted_total", "Retries skipped because the retry budget was spent."
+)
+
+BUDGET_MAX_TOKENS = 20.0     # also the starting balance
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: Optional[int] = None              # total attempts; None = Settings.max_retries
+    base: float = 0.2                           # seconds
+    cap: float = 2.0
+    statuses: FrozenSet[int] = field(default_factory=lambda: frozenset({502, 503, 504}))
+    idempotent: bool = True
+    hedge: bool = False                         # eligible for hedging (hedging.py)
+
+
+DEFAULT_POLICIES: Dict[str, RetryPolicy] = {
+    "/v1/timestamp/status": RetryPolicy(hedge=True),
+    "/v1/timestamp/one-shot": RetryPolicy(idempotent=False),
+    "/v1/verify": RetryPolicy(hedge=True),
+    "health": RetryPolicy(attempts=1, hedge=True),
+}
+
+_UNSAFE_METHODS = {"POST", "PATCH"}
+
+
+def policy_for(endpoint: str, method: str) -> RetryPolicy:
+    """
+    The longest matching default, else a method-based one; then every
+    matching RETRY_POLICIES override, shortest prefix first.
+    """
+    defaults = [p for p in DEFAULT_POLICIES if endpoint.startswith(p)]
+    if defaults:
+        policy = DEFAULT_POLICIES[max(defaults, key=len)]
+    else:
+        policy = RetryPolicy(idempotent=method.upper() not in _UNSAFE_METHODS)
+    overrides = get_settings().retry_policies
+    for prefix in sorted((p for p in overrides if endpoint.startswith(p)), key=len):
+        opts = dict(overrides[prefix])
+        if "statuses" in opts:
+            opts["statuses"] = frozenset(opts["statuses"])
+        policy = replace(policy, **opts)
+    return policy
+
+
+class RetryBudget:
+    """Each request earns `ratio` of a retry; `floor` retries/second are always allowed."""
+
+    def __init__(self, ratio: float, floor: float):
+        self.ratio = ratio
+        self.floor = floor
+        self.tokens = BUDGET_MAX_TOKENS
+        self.stamp = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(BUDGET_MAX_TOKENS, self.tokens + (now - self.stamp) * self.floor)
+        self.stamp = now
+
+    def deposit(self) -> None:
+        self._refill()
+        self.tokens = min(BUDGET_MAX_TOKENS, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        self._refill()
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+_budget: Optional[RetryBudget] = None
+
+
+def budget() -> RetryBudget:
+    global _budget
+    if _budget is None:
+        s = get_settings()
+        _budget = RetryBudget(s.retry_budget_ratio, s.retry_budget_min_per_second)
+    return _budget
+
+
+def reset() -> None:
+    """Forget the retry budget (tests, settings changes)."""
+    global _budget
+    _budget = None
+
+
+def _reason(rs: RetryCallState, policy: RetryPolicy) -> Optional[str]:
+    """Why this outcome is worth another attempt ("transport"/"status"/"throttled"), if it is."""
+    out = rs.outcome
+    if out is None:
+        return None
+    if out.failed:
+        return "transport" if isinstance(out.exception(), httpx.TransportError) else None
+    resp: httpx.Response = out.result()
+    if resp.status_code == 429:
+        return "throttled"
+    if resp.status_code in policy.statuses:
+        return "status"
+    return None
+
+
+class wait_decorrelated_jitter(wait_base):
+    """AWS-style decorrelated jitter; 429s don't wait here (the rate limiter does)."""
+
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+
+    def __call__(self, rs: RetryCallState) -> float:
+        if _reason(rs, self.policy) == "throttled":
+            return 0.0
+        prev = rs.upcoming_sleep or self.policy.base
+        return min(self.policy.cap, random.uniform(self.policy.base, prev * 3))
+
+
+def retrying(
+    *,
+    method: str,
+    endpoint: str,
+    replayable: bool,
+    idempotency_key: Optional[str] = None,
+    retry: bool = True,
+    retry_throttled: bool = True,
+    policy: Optional[RetryPolicy] = None,
+) -> AsyncRetrying:
+    """
+    A tenacity retryer for one upstream request. The wrapped call returns an
+    httpx.Response or raises httpx.TransportError; when attempts run out the
+    last response is returned / the last error re-raised.
+    """
+    s = get_settings()
+    policy = policy or policy_for(endpoint, method)
+    attempts = max(1, policy.attempts if policy.attempts is not None else s.max_retries)
+    safe = retry and replayable and (policy.idempotent or bool(idempotency_key))
+    b = budget()
+    b.deposit()
+
+    def should_retry(rs: RetryCallState) -> bool:
+        reason = _reason(rs, policy)
+        if reason is None:
+            return False
+        if reason == "throttled":
+            pause = parse_retry_after(rs.outcome.result().headers.get("retry-after"))
+            return retry_throttled and replayable and (pause or 0.0) <= s.upstream_retry_after_max_seconds
+        if not safe or breaker().state == "open":
+            return False
+        if not b.withdraw():
+            RETRY_BUDGET_EXHAUSTED.inc(endpoint=endpoint)
+            log.warning("upstream_retry_budget_exhausted", endpoint=endpoint)
+            return False
+        return True
+
+    def before_sleep(rs: RetryCallState) -> None:
+        reason = _reason(rs, policy)
+        UPSTREAM_RETRIES.inc(method=method, endpoint=endpoint, reason=reason)
+        log.warning(
+            "upstream_retrying",
+            endpoint=endpoint,
+            attempt=rs.attempt_number,
+            reason=reason,
+            delay=round(rs.upcoming_sleep, 3),
+            error=repr(rs.outcome.exception()) if rs.outcome.failed else None,
+        )
+
+    return AsyncRetrying(
+        stop=stop_after_attempt(attempts),
+        wait=wait_decorrelated_jitter(policy),
+        retry=should_retry,
+        before_sleep=before_sleep,
+        retry_error_callback=lambda rs: rs.outcome.result(),  # last response / re-raise last error
+    )
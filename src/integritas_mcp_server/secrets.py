@@ -1,54 +1,190 @@
 # secrets.py
-from typing import Optional
+from typing import Optional, Tuple
+import asyncio
 import os
-import keyring
+import time
 from .config import get_settings  # <-- import settings
+from .state import open_store
 
 SERVICE_NAME = "integritas-mcp"
 ACCOUNT = "integritas_api_key"
 
 _memory_key: Optional[str] = None
+_memory_generation: int = 0
+_resolved: Optional[Tuple[int, Optional[str]]] = None  # (generation, key) last resolved
+_generation: Optional[Tuple[float, int]] = None       # (checked at, generation) last read
+
+GENERATION_TTL_SECONDS = 1.0
+
+# Worker processes each hold their own in-memory key. Every set/clear bumps a
+# generation counter in STATE_DIR/shared.db; a memory key from an older
+# generation (set/cleared by another worker since) is dropped and resolution
+# falls through to the keyring, which all workers share.
+#
+# The resolved key (or its absence) is cached per generation, so keyring
+# (D-Bus / Secret Service, possibly slow) is read once per set/clear rather
+# than per tool call; the async path reads it in a worker thread. The
+# generation itself is re-read at most every GENERATION_TTL_SECONDS, so a
+# set/clear in another worker is noticed within that time.
+
+_SHARED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shared_kv (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+def _shared():
+    return open_store("shared.db", _SHARED_SCHEMA)
+
+def _key_generation() -> int:
+    global _generation
+    now = time.monotonic()
+    if _generation is not None and now - _generation[0] < GENERATION_TTL_SECONDS:
+        return _generation[1]
+    row = _shared().query_one("SELECT value FROM shared_kv WHERE key = 'api_key_generation'")
+    gen = int(row["value"]) if row else 0
+    _generation = (now, gen)
+    return gen
+
+def _bump_key_generation() -> int:
+    global _generation
+    with _shared().transaction() as db:
+        row = db.execute("SELECT value FROM shared_kv WHERE key = 'api_key_generation'").fetchone()
+        gen = (int(row["value"]) if row else 0) + 1
+        db.execute(
+            "INSERT OR REPLACE INTO shared_kv (key, value) VALUES ('api_key_generation', ?)",
+            (str(gen),),
+        )
+    _generation = (time.monotonic(), gen)
+    return gen
 
 def set_api_key_memory(key: str) -> None:
-    global _memory_key
+    global _memory_key, _memory_generation, _resolved
     _memory_key = key
+    _memory_generation = _bump_key_generation()
+    _resolved = (_memory_generation, key)
 
 def clear_api_key_memory() -> None:
-    global _memory_key
+    global _memory_key, _memory_generation, _resolved
     _memory_key = None
+    _memory_generation = _bump_key_generation()
+    _resolved = None
+
+# keyring (and its platform backends) is imported on first use, off the
+# startup path; resolution normally runs it in a worker thread anyway.
+
+def keyring_available() -> bool:
+    """Whether a real keyring backend (not the fail/null one) is configured."""
+    try:
+        import keyring
+        return keyring.get_keyring().priority > 0
+    except Exception:
+        return False
 
 def save_api_key_keyring(key: str) -> None:
+    import keyring
     keyring.set_password(SERVICE_NAME, ACCOUNT, key)
 
 def load_api_key_keyring() -> Optional[str]:
     try:
+        import keyring
         return keyring.get_password(SERVICE_NAME, ACCOUNT)
     except Exception:
         return None
 
 def clear_api_key_keyring() -> None:
     try:
+        import keyring
         keyring.delete_password(SERVICE_NAME, ACCOUNT)
     except Exception:
         pass
 
+# Setting or clearing the key writes the keyring before bumping the
+# generation: a worker that sees the new generation must already find the
+# new (or no) key there, or it would cache the old one until the next bump.
+
+def set_api_key(key: str) -> bool:
+    """Persist `key` (keyring, if available) and hold it in memory; True if persisted."""
+    try:
+        save_api_key_keyring(key)
+        saved = True
+    except Exception:
+        saved = False  # still fine this session via memory
+    set_api_key_memory(key)
+    return saved
+
+def clear_api_key() -> None:
+    clear_api_key_keyring()
+    clear_api_key_memory()
+
+# Per-call keys of queued stamp jobs (services/stamp_jobs.py) sit in the
+# keyring under the job id until the job finishes, never in jobs.db.
+
+JOB_ACCOUNT = "integritas_job_key:{job_id}"
+
+def save_job_key(job_id: str, key: str) -> None:
+    import keyring
+    keyring.set_password(SERVICE_NAME, JOB_ACCOUNT.format(job_id=job_id), key)
+
+def load_job_key(job_id: str) -> Optional[str]:
+    try:
+        import keyring
+        return keyring.get_password(SERVICE_NAME, JOB_ACCOUNT.format(job_id=job_id))
+    except Exception:
+        return None
+
+def clear_job_key(job_id: str) -> None:
+    try:
+        import keyring
+        keyring.delete_password(SERVICE_NAME, JOB_ACCOUNT.format(job_id=job_id))
+    except Exception:
+        pass
+
+def _memory(generation: int) -> Optional[str]:
+    global _memory_key
+    if _memory_key:
+        if _memory_generation == generation:
+            return _memory_key
+        _memory_key = None  # superseded by a set/clear in another worker
+    return None
+
+def _settings_key() -> Optional[str]:
+    s = get_settings()
+    if getattr(s, "minima_api_key", None):
+        return str(s.minima_api_key)
+    return os.getenv("INTEGRITAS_API_KEY")
+
+def _cache(generation: int, key: Optional[str]) -> Optional[str]:
+    global _resolved
+    _resolved = (generation, key)
+    return key
+
 def resolve_api_key() -> Optional[str]:
     """
     Order:
-      1) in-memory (auth_set_api_key)
+      1) in-memory (auth_set_api_key), unless another worker has set/cleared since
       2) keyring
       3) Settings (.env): minima_api_key (accepts MINIMA_API_KEY or INTEGRITAS_API_KEY)
       4) raw env var INTEGRITAS_API_KEY (last-ditch)
+    Cached until the next set/clear (in any worker). On a miss keyring is
+    read in the calling thread; async callers use resolve_api_key_async.
     """
-    if _memory_key:
-        return _memory_key
+    gen = _key_generation()
+    if _resolved is not None and _resolved[0] == gen:
+        return _resolved[1]
+    return _cache(gen, _memory(gen) or load_api_key_keyring() or _settings_key())
 
-    k = load_api_key_keyring()
-    if k:
-        return k
+async def resolve_api_key_async() -> Optional[str]:
+    """resolve_api_key without blocking the event loop on keyring."""
+    gen = _key_generation()
+    if _resolved is not None and _resolved[0] == gen:
+        return _resolved[1]
+    key = _memory(gen) or await asyncio.to_thread(load_api_key_keyring) or _settings_key()
+    return _cache(gen, key)
 
-    s = get_settings()
-    if getattr(s, "minima_api_key", None):
-        return str(s.minima_api_key)
-
-    return os.getenv("INTEGRITAS_API_KEY")
+def reset_api_key_cache() -> None:
+    """Forget the resolved key and generation (tests, settings changes)."""
+    global _resolved, _generation
+    _resolved = None
+    _generation = None
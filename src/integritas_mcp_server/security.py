@@ -26,6 +26,7 @@ class BearerGuard:
             return await self.app(scope, receive, send)
 
         # Allow a minimal health check path to be unauthenticated if you want.
+        # (/metrics is routed outside this guard; see prometheus.py.)
         path = scope.get("path") or ""
         if path == "/healthz":
             return await self.app(scope, receive, send)
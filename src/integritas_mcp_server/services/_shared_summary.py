@@ -56,3 +56,15 @@ def compose_verify_summary(fields: Dict[str, Optional[str | int]]) -> str:
     # if transactionid:
     #     parts.append(f"· tx {transactionid}")
     return " ".join(parts)
+
+
+def compose_batch_summary(counts: Dict[str, int], total: int, verb: str = "Stamped") -> str:
+    """
+    counts: per-status tallies of the items ("finalized", "pending", "failed", ...)
+    """
+    ok = counts.get("finalized", 0)
+    parts = [f"{verb} {ok}/{total}"]
+    for status in ("pending", "failed", "unknown"):
+        if counts.get(status):
+            parts.append(f"· {counts[status]} {status}")
+    return " ".join(parts)
@@ -1,7 +1,10 @@
 from __future__ import annotations
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
 
-from ..models import ToolResultEnvelopeV1, ToolLink, STAMP_RESULT_KIND, VERIFY_RESULT_KIND
+from ..models import (
+    ToolResultEnvelopeV1, ToolLink,
+    STAMP_RESULT_KIND, VERIFY_RESULT_KIND, STAMP_BATCH_RESULT_KIND, VERIFY_BATCH_RESULT_KIND,
+)
 from ..utils.time import utc_iso
 
 
@@ -29,6 +32,8 @@ def canonical_verify_status(result: Optional[str]) -> str:
         "exists": "finalized",
         "found": "finalized",
         "success": "finalized",
+        "full match": "finalized",
+        "full_match": "finalized",
         # negative/error
         "mismatch": "failed",
         "no_match": "failed",
@@ -39,6 +44,14 @@ def canonical_verify_status(result: Optional[str]) -> str:
     }.get(m, "unknown")
 
 
+# ----- construction ------------------------------------------------------------
+#
+# Builders return {"summary", "structuredContent": ToolResultEnvelopeV1}: the
+# envelope is validated once, here, and tool responses take the instance as
+# is (pydantic does not revalidate instances), instead of dumping it to a
+# dict for the response model to validate again. With pydantic 2, validating
+# pre-built ToolLinks this way is also faster than model_construct.
+
 # ----- stamp envelope ----------------------------------------------------------
 
 def build_stamp_envelope(
@@ -50,16 +63,20 @@ def build_stamp_envelope(
     summary: str,
     raw: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
+    links = [ToolLink(rel="proof", href=proof_url, label="Download proof")] if proof_url else []
+    if uid and canonical_status(status) != "failed":
+        # resources/subscribe on this URI pushes an update once the uid is on chain
+        links.append(ToolLink(rel="status", href=f"integritas://stamp/{uid}", label="Watch on-chain status"))
     env = ToolResultEnvelopeV1(
         kind=STAMP_RESULT_KIND,
         status=canonical_status(status),
         summary=summary,
-        ids=({"uid": uid} if uid else None),
+        ids=({"uid": str(uid)} if uid else None),
         timestamps=({"stamped_at": utc_iso(stamped_at)} if stamped_at else None),
-        links=([ToolLink(rel="proof", href=proof_url, label="Download proof")] if proof_url else None),
+        links=(links or None),
         data={"status": status, "uid": uid, "stamped_at": stamped_at, "proof_url": proof_url, "raw": raw or {}},
     )
-    return {"summary": summary, "structuredContent": env.model_dump(by_alias=True, exclude_none=True)}
+    return {"summary": summary, "structuredContent": env}
 
 
 # ----- verify envelope ---------------------------------------------------------
@@ -77,10 +94,10 @@ def build_verify_envelope(
     raw: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     ids = {}
-    if txpow_id: ids["txpow_id"] = txpow_id
-    if transactionid: ids["tx_id"] = transactionid
-    if uid: ids["uid"] = uid
-    if matched_hash: ids["matched_hash"] = matched_hash
+    if txpow_id: ids["txpow_id"] = str(txpow_id)
+    if transactionid: ids["tx_id"] = str(transactionid)
+    if uid: ids["uid"] = str(uid)
+    if matched_hash: ids["matched_hash"] = str(matched_hash)
 
     ts = {"verified_at": utc_iso()}
     if block_number is not None:
@@ -104,4 +121,58 @@ def build_verify_envelope(
             "raw": raw or {},
         },
     )
-    return {"summary": summary, "structuredContent": env.model_dump(by_alias=True, exclude_none=True)}
+    return {"summary": summary, "structuredContent": env}
+
+
+# ----- batch envelope ----------------------------------------------------------
+
+def aggregate_status(counts: Dict[str, int]) -> str:
+    """Any failure flags the batch; otherwise pending wins over finalized."""
+    if counts.get("failed"):
+        return "failed"
+    if counts.get("pending") or counts.get("unknown"):
+        return "pending"
+    return "finalized"
+
+def _batch_envelope(
+    *,
+    kind: str,
+    items: List[Dict[str, Any]],
+    counts: Dict[str, int],
+    summary: str,
+    extra: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    env = ToolResultEnvelopeV1(
+        kind=kind,
+        status=aggregate_status(counts),
+        summary=summary,
+        data={"total": sum(counts.values()), "counts": counts, **(extra or {}), "items": items},
+    )
+    return {"summary": summary, "structuredContent": env}
+
+def build_stamp_batch_envelope(
+    *,
+    items: List[Dict[str, Any]],
+    counts: Dict[str, int],
+    summary: str,
+) -> Dict[str, Any]:
+    """
+    items: [{ index, requestId, result: <per-item ToolResultEnvelopeV1 dict> }]
+    """
+    return _batch_envelope(kind=STAMP_BATCH_RESULT_KIND, items=items, counts=counts, summary=summary)
+
+def build_verify_batch_envelope(
+    *,
+    items: List[Dict[str, Any]],
+    counts: Dict[str, int],
+    unique: int,
+    summary: str,
+) -> Dict[str, Any]:
+    """
+    counts are per file; items are per unique proof content:
+    [{ content_hash?, files: [ref, ...], requestId, result: <verify_result@v1 envelope> }]
+    """
+    return _batch_envelope(
+        kind=VERIFY_BATCH_RESULT_KIND, items=items, counts=counts, summary=summary,
+        extra={"unique": unique},
+    )
@@ -1,10 +1,11 @@
 # src/integritas_mcp_server/services/health.py
 import time
-import httpx
 from typing import Optional, Literal
 from ..config import get_settings
 from ..models import HealthResponse
 from ..secrets import resolve_api_key
+from ..http_client import request
+from ..circuit import breaker
 from .tool_helpers.api import build_headers
 
 def _as_str(v):
@@ -27,13 +28,14 @@ async def check_readiness(
 
     rid = request_id or "unknown"
 
-    headers = build_headers(req.api_key, api_key)
+    headers = await build_headers(req.api_key, api_key)
     if not headers.get("x-api-key"):
         return HealthResponse(
             status="down",
             upstream_reachable=False,
             upstream_status=None,
             upstream_latency_ms=0,
+            upstream_circuit=breaker().state,
             summary="No API key configured. Set INTEGRITAS_API_KEY in .env or run auth_set_api_key."
         )
 
@@ -53,8 +55,8 @@ async def check_readiness(
             summary = "Upstream health URL not configured"
         else:
             # cast to str in case url is a pydantic HttpUrl
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                r = await client.get(str(url), headers=headers)
+            # single attempt: a readiness probe should report, not retry
+            r = await request("GET", str(url), headers=headers, timeout=5.0, retry=False, retry_throttled=False, endpoint="health")
             code = r.status_code
             if code >= 300:
                 status = "degraded"
@@ -74,5 +76,6 @@ async def check_readiness(
         upstream_reachable=reachable,
         upstream_status=code,
         upstream_latency_ms=latency_ms,
+        upstream_circuit=breaker().state,
         summary=summary,
     )
\ No newline at end of file
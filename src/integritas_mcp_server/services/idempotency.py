@@ -0,0 +1,108 @@
+# src/integritas_mcp_server/services/idempotency.py
+from __future__ import annotations
+import asyncio
+import hashlib
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from ..config import get_settings
+from ..logging_setup import get_logger
+from ..models import StampDataResponse
+from ..state import open_store
+from .. import metrics
+
+log = get_logger().bind(component="idempotency")
+
+# One stamp per (API key, normalized hash) per window.
+#
+# A successful (non-failed) one-shot response is stored in SQLite and
+# replayed for repeats within STAMP_IDEMPOTENCY_WINDOW_SECONDS, so retries
+# upstream of us do not create duplicate stamps. Concurrent identical calls
+# in this process share one in-flight upstream call. Failures are not stored.
+
+DB_NAME = "stamps.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stamp_idempotency (
+    key        TEXT PRIMARY KEY,
+    response   TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS stamp_idempotency_created ON stamp_idempotency (created_at);
+"""
+
+_inflight: Dict[str, "asyncio.Future[StampDataResponse]"] = {}
+
+CACHE_LOOKUPS = metrics.counter("integritas_cache_lookups_total", "Local cache lookups by cache and result.")
+
+
+def idempotency_key(api_key: Optional[str], normalized_hash: str) -> str:
+    """Key identity is a digest of the API key; the key itself is never stored."""
+    who = hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+    return f"{who}:{normalized_hash}"
+
+
+def _store():
+    return open_store(DB_NAME, _SCHEMA)
+
+
+def lookup(key: str) -> Optional[StampDataResponse]:
+    window = get_settings().stamp_idempotency_window_seconds
+    if window <= 0:
+        return None
+    row = _store().query_one(
+        "SELECT response FROM stamp_idempotency WHERE key = ? AND created_at >= ?",
+        (key, time.time() - window),
+    )
+    CACHE_LOOKUPS.inc(cache="stamp_idempotency", result="hit" if row else "miss")
+    return StampDataResponse.model_validate_json(row["response"]) if row else None
+
+
+def remember(key: str, resp: StampDataResponse) -> None:
+    window = get_settings().stamp_idempotency_window_seconds
+    if window <= 0 or resp.structuredContent.status == "failed":
+        return
+    now = time.time()
+    with _store().transaction() as db:
+        db.execute(
+            "INSERT OR REPLACE INTO stamp_idempotency (key, response, created_at) VALUES (?, ?, ?)",
+            (key, resp.model_dump_json(by_alias=True), now),
+        )
+        db.execute("DELETE FROM stamp_idempotency WHERE created_at < ?", (now - window,))
+
+
+async def stamp_once(
+    key: str,
+    call: Callable[[], Awaitable[StampDataResponse]],
+) -> StampDataResponse:
+    """
+    Replay a stored response, join an identical in-flight call, or make the
+    call and store its result.
+    """
+    pending = _inflight.get(key)
+    if pending is None:
+        cached = await asyncio.to_thread(lookup, key)  # SQLite stays off the event loop
+        if cached is not None:
+            log.info("stamp_idempotent_replay", key=key)
+            return cached
+        pending = _inflight.get(key)  # an identical call may have started meanwhile
+    if pending is not None:
+        log.info("stamp_idempotent_join", key=key)
+        return await asyncio.shield(pending)
+
+    fut: "asyncio.Future[StampDataResponse]" = asyncio.get_running_loop().create_future()
+    _inflight[key] = fut
+    try:
+        resp = await call()
+        await asyncio.to_thread(remember, key, resp)
+        fut.set_result(resp)
+        return resp
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    except Exception as e:
+        fut.set_exception(e)
+        fut.exception()  # mark retrieved; joiners re-raise it themselves
+        raise
+    finally:
+        _inflight.pop(key, None)
@@ -0,0 +1,99 @@
+# src/integritas_mcp_server/services/raw_payloads.py
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from typing import Any, Dict, Optional, TypeVar
+
+from ..config import get_settings
+from ..models import ToolLink, ToolResponse
+from ..state import open_store
+from .tool_helpers.api import build_headers
+
+# Response profiles (models.ResponseProfile) for stamp and verify results.
+#
+# Envelopes are always built in full; the profile is applied on the way out,
+# so cached results (idempotent replays) can be served in any profile. When
+# a profile drops data.raw, the upstream payload is kept in SQLite under
+# STATE_DIR (any worker can serve it) for RAW_PAYLOAD_RETENTION_SECONDS and
+# linked as integritas://raw/{rawId}. The id is generated here (request ids
+# repeat across sessions) and the payload is only served back to the API key
+# it was fetched with.
+
+DB_NAME = "raw.db"
+RAW_URI = "integritas://raw/{raw_id}"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS raw_payloads (
+    raw_id     TEXT PRIMARY KEY,
+    owner      TEXT NOT NULL,
+    payload    TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS raw_payloads_created ON raw_payloads (created_at);
+"""
+
+R = TypeVar("R", bound=ToolResponse)
+
+
+def _store():
+    return open_store(DB_NAME, _SCHEMA)
+
+
+def _owner(api_key: Optional[str]) -> str:
+    return hashlib.sha256((api_key or "").encode()).hexdigest()
+
+
+def raw_uri(raw_id: str) -> str:
+    return RAW_URI.format(raw_id=raw_id)
+
+
+def remember(payload: Any, api_key: Optional[str]) -> str:
+    """Keep `payload` for `api_key`; returns its new raw id."""
+    raw_id = uuid.uuid4().hex
+    retention = get_settings().raw_payload_retention_seconds
+    now = time.time()
+    with _store().transaction() as db:
+        db.execute(
+            "INSERT INTO raw_payloads (raw_id, owner, payload, created_at) VALUES (?, ?, ?, ?)",
+            (raw_id, _owner(api_key), json.dumps(payload, default=str), now),
+        )
+        db.execute("DELETE FROM raw_payloads WHERE created_at < ?", (now - retention,))
+    return raw_id
+
+
+def lookup(raw_id: str, api_key: Optional[str]) -> Optional[str]:
+    """The stored payload as JSON text, if still retained and kept for `api_key`."""
+    row = _store().query_one(
+        "SELECT payload FROM raw_payloads WHERE raw_id = ? AND owner = ? AND created_at >= ?",
+        (raw_id, _owner(api_key), time.time() - get_settings().raw_payload_retention_seconds),
+    )
+    return row["payload"] if row else None
+
+
+async def apply_profile(resp: R, profile: Optional[str] = None, api_key: Optional[Any] = None) -> R:
+    """
+    Shape a full stamp/verify response for `profile` (default RESPONSE_PROFILE).
+    `api_key` is the call's key as given (request or tool argument); it is
+    resolved like the upstream headers and owns any kept raw payload.
+    """
+    profile = profile or get_settings().response_profile
+    if profile == "full":
+        return resp
+    env = resp.structuredContent
+    data: Optional[Dict[str, Any]] = env.data if isinstance(env.data, dict) else None
+    links = list(env.links or [])
+    if data and data.get("raw"):
+        owner = (await build_headers(api_key, None)).get("x-api-key")
+        raw_id = await asyncio.to_thread(remember, data["raw"], owner)
+        links.append(ToolLink(rel="raw", href=raw_uri(raw_id), label="Upstream payload"))
+
+    if profile == "compact":
+        update: Dict[str, Any] = {"links": links or None}
+        if data is not None:
+            update["data"] = {k: v for k, v in data.items() if k != "raw"}
+    else:  # ids-only
+        update = {"summary": None, "timestamps": None, "data": None, "links": links or None}
+    return resp.model_copy(update={"structuredContent": env.model_copy(update=update)})
@@ -0,0 +1,186 @@
+# src/integritas_mcp_server/services/root_cache.py
+from __future__ import annotations
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import get_settings
+from ..logging_setup import get_logger
+from ..state import open_store, Store
+from .. import metrics
+
+log = get_logger().bind(component="root_cache")
+
+# Persistent cache of verification results by Merkle root.
+#
+# Rows are (root, matched_hash) -> chain facts {block_number, txpow_id,
+# transactionid} as last reported by the upstream. An exact row means the
+# upstream confirmed that hash under that root; any row for a root means the
+# root itself is on chain. Entries expire after KNOWN_ROOTS_TTL_SECONDS and
+# the table is trimmed to KNOWN_ROOTS_MAX rows, least recently used first.
+#
+# Proof files (a JSON list of { address, data, proof, root } hex strings) are
+# answered from here when the upstream has already confirmed every entry's
+# exact (root, data) pair. The Merkle path in `proof` is not recomputed.
+# Callers on the event loop run these in a thread; a database locked by
+# other workers past the (short) busy timeout counts as a miss.
+
+DB_NAME = "verify_cache.db"
+BUSY_TIMEOUT_SECONDS = 0.25  # a cache miss beats waiting on another worker's write
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verified_roots (
+    root         TEXT NOT NULL,
+    matched_hash TEXT NOT NULL,
+    facts        TEXT NOT NULL,
+    confirmed_at REAL NOT NULL,
+    used_at      REAL NOT NULL,
+    PRIMARY KEY (root, matched_hash)
+);
+CREATE INDEX IF NOT EXISTS verified_roots_used ON verified_roots (used_at);
+"""
+
+FACT_FIELDS = ("block_number", "txpow_id", "transactionid")
+
+MAX_PROOF_FILE_BYTES = 1024 * 1024  # proofs are tiny; don't parse arbitrary uploads
+
+CACHE_LOOKUPS = metrics.counter("integritas_cache_lookups_total", "Local cache lookups by cache and result.")
+
+
+class RootCache:
+    def __init__(self, store: Store, max_size: int, ttl_seconds: float):
+        self.store = store
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, root: bytes, matched_hash: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
+        """
+        Facts for `root`; with `matched_hash`, only an exact confirmation
+        counts. Expired rows are ignored (and swept on the next put).
+        """
+        now = time.time()
+        fresh = now - self.ttl_seconds
+        if matched_hash is None:
+            row = self.store.query_one(
+                "SELECT matched_hash, facts FROM verified_roots WHERE root = ? AND confirmed_at >= ? "
+                "ORDER BY confirmed_at DESC LIMIT 1",
+                (root.hex(), fresh),
+            )
+        else:
+            row = self.store.query_one(
+                "SELECT matched_hash, facts FROM verified_roots WHERE root = ? AND matched_hash = ? "
+                "AND confirmed_at >= ?",
+                (root.hex(), matched_hash.hex(), fresh),
+            )
+        if row is None:
+            return None
+        self.store.execute(
+            "UPDATE verified_roots SET used_at = ? WHERE root = ? AND matched_hash = ?",
+            (now, root.hex(), row["matched_hash"]),
+        )
+        return json.loads(row["facts"])
+
+    def put(self, root: bytes, matched_hash: bytes, facts: Optional[Dict[str, Any]] = None) -> None:
+        now = time.time()
+        clean = {f: (facts or {}).get(f) for f in FACT_FIELDS if (facts or {}).get(f) is not None}
+        with self.store.transaction() as db:
+            db.execute(
+                "INSERT INTO verified_roots (root, matched_hash, facts, confirmed_at, used_at) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (root, matched_hash) DO UPDATE SET "
+                "facts = excluded.facts, confirmed_at = excluded.confirmed_at, used_at = excluded.used_at",
+                (root.hex(), matched_hash.hex(), json.dumps(clean), now, now),
+            )
+            db.execute("DELETE FROM verified_roots WHERE confirmed_at < ?", (now - self.ttl_seconds,))
+            db.execute(
+                "DELETE FROM verified_roots WHERE rowid IN (SELECT rowid FROM verified_roots "
+                "ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_size,),
+            )
+
+    def __len__(self) -> int:
+        row = self.store.query_one("SELECT COUNT(*) AS n FROM verified_roots")
+        return int(row["n"]) if row else 0
+
+    def clear(self) -> None:
+        self.store.execute("DELETE FROM verified_roots")
+
+
+def root_cache() -> RootCache:
+    s = get_settings()
+    store = open_store(DB_NAME, _SCHEMA, busy_timeout=BUSY_TIMEOUT_SECONDS)
+    return RootCache(store, s.known_roots_max, s.known_roots_ttl_seconds)
+
+
+# ----- proof files -------------------------------------------------------------
+
+def _hex(v: Any) -> Optional[bytes]:
+    if not isinstance(v, str):
+        return None
+    try:
+        return bytes.fromhex(v[2:] if v[:2].lower() == "0x" else v)
+    except ValueError:
+        return None
+
+
+def proof_pairs(content: bytes) -> Optional[List[Tuple[bytes, bytes]]]:
+    """(root, data) of every entry of a proof file; None if it is not one."""
+    if len(content) > MAX_PROOF_FILE_BYTES:
+        return None
+    try:
+        doc = json.loads(content)
+    except ValueError:
+        return None
+    pairs = []
+    for it in doc if isinstance(doc, list) else [doc]:
+        root, data = (_hex(it.get("root")), _hex(it.get("data"))) if isinstance(it, dict) else (None, None)
+        if not root or not data:
+            return None
+        pairs.append((root, data))
+    return pairs or None
+
+
+@dataclass(frozen=True)
+class ProofHit:
+    pairs: List[Tuple[bytes, bytes]]
+    facts: Dict[str, Any]
+
+
+def lookup_proof(content: bytes) -> Optional[ProofHit]:
+    """Facts for a proof file whose every (root, data) entry is confirmed; else None."""
+    hit = _lookup_proof(content)
+    CACHE_LOOKUPS.inc(cache="verify_roots", result="hit" if hit is not None else "miss")
+    return hit
+
+
+def _lookup_proof(content: bytes) -> Optional[ProofHit]:
+    pairs = proof_pairs(content)
+    if pairs is None:
+        log.info("proof_unparsable")
+        return None
+    facts: Dict[str, Any] = {}
+    cache = root_cache()
+    try:
+        for root, data in pairs:
+            known = cache.get(root, data)
+            if known is None:
+                return None
+            facts = facts or known
+    except sqlite3.OperationalError as e:  # e.g. database is locked
+        log.warning("root_cache_unavailable", err=str(e))
+        return None
+    return ProofHit(pairs, facts)
+
+
+def learn_proof(content: bytes, facts: Optional[Dict[str, Any]] = None) -> int:
+    """Record the entries of a proof file the upstream just confirmed; returns how many."""
+    pairs = proof_pairs(content) or []
+    cache = root_cache()
+    try:
+        for root, data in pairs:
+            cache.put(root, data, facts)
+    except sqlite3.OperationalError as e:  # the next confirmation records it
+        log.warning("root_cache_unavailable", err=str(e))
+        return 0
+    return len(pairs)
@@ -0,0 +1,98 @@
+# src/integritas_mcp_server/services/stamp_batch.py
+from __future__ import annotations
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..config import get_settings
+from ..logging_setup import get_logger
+from ..models import StampDataBatchRequest, StampDataBatchResponse, StampDataRequest, StampDataResponse
+from .stamp_data import stamp_data_complete, _fail_response
+from .envelopes import build_stamp_batch_envelope
+from ._shared_summary import compose_batch_summary
+
+log = get_logger().bind(component="stamp_batch")
+
+ProgressFn = Callable[[int, int], Awaitable[None]]
+
+
+def _item_request(item: StampDataRequest, batch: StampDataBatchRequest) -> StampDataRequest:
+    update: Dict[str, Any] = {}
+    if not item.api_key and batch.api_key:
+        update["api_key"] = batch.api_key
+    if not item.response_profile and batch.response_profile:
+        update["response_profile"] = batch.response_profile
+    return item.model_copy(update=update) if update else item
+
+
+async def _report(progress: Optional[ProgressFn], done: int, total: int) -> None:
+    if progress is None:
+        return
+    try:
+        await progress(done, total)
+    except Exception as e:
+        # Progress is best effort; never fail the batch because a client went away.
+        log.warning("stamp_batch_progress_failed", err=str(e))
+
+
+async def stamp_data_batch_complete(
+    req: StampDataBatchRequest,
+    request_id: Optional[str] = None,
+    api_key: Optional[str] = None,
+    progress: Optional[ProgressFn] = None,
+) -> StampDataBatchResponse:
+    """
+    Run every item through stamp_data_complete with a fixed pool of workers
+    (bounded concurrency, O(workers) tasks regardless of batch size).
+    Items keep their input order in the aggregated envelope.
+    """
+    rid = request_id or "unknown"
+    s = get_settings()
+    total = len(req.items)
+
+    if total > s.stamp_batch_max_items:
+        human = f"Batch too large: {total} items (max {s.stamp_batch_max_items})."
+        pkg = build_stamp_batch_envelope(items=[], counts={"failed": total}, summary=human)
+        return StampDataBatchResponse(requestId=rid, summary=human, structuredContent=pkg["structuredContent"])
+
+    concurrency = min(req.concurrency or s.stamp_batch_concurrency, total)
+    results: List[Optional[StampDataResponse]] = [None] * total
+    next_index = 0
+    done = 0
+
+    async def worker() -> None:
+        nonlocal next_index, done
+        while next_index < total:
+            i = next_index
+            next_index += 1
+            item = _item_request(req.items[i], req)
+            try:
+                results[i] = await stamp_data_complete(item, f"{rid}:{i}", api_key=api_key)
+            except Exception as e:  # stamp_data_complete already catches; belt and braces
+                results[i] = _fail_response(request_id=f"{rid}:{i}", human=f"Exception calling API: {e}")
+            done += 1
+            await _report(progress, done, total)
+
+    log.info("stamp_batch_start", req_id=rid, total=total, concurrency=concurrency)
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    items: List[Dict[str, Any]] = []
+    counts: Counter[str] = Counter()
+    for i, res in enumerate(results):
+        assert res is not None
+        env = res.structuredContent
+        counts[env.status or "unknown"] += 1
+        items.append({
+            "index": i,
+            "requestId": res.requestId,
+            "result": env.model_dump(by_alias=True, exclude_none=True),
+        })
+
+    summary = compose_batch_summary(dict(counts), total)
+    log.info("stamp_batch_done", req_id=rid, total=total, **dict(counts))
+    pkg = build_stamp_batch_envelope(items=items, counts=dict(counts), summary=summary)
+    return StampDataBatchResponse(
+        requestId=rid,
+        summary=pkg["summary"],
+        structuredContent=pkg["structuredContent"],
+    )
@@ -1,21 +1,28 @@
 # src/integritas_mcp_server/services/stamp_data.py
 from __future__ import annotations
+import asyncio
+import os
 from typing import Optional, Any, Dict
 
-import aiohttp
-
+from ..config import get_settings
 from ..models import StampDataRequest, StampDataResponse
-from .tool_helpers.api import API_BASE_URL, build_headers, post_multipart, post_json
+from .tool_helpers.api import API_BASE_URL, build_headers, post_multipart, post_multipart_stream, post_json
 from .tool_helpers.upload import (
+    declared_size,
     form_from_file_path,
-    form_from_file_url,
     maybe_await,
+    multipart_from_file_url,
     normalize_form_result,
+    open_file_url,
+    sha3_256_file_url,
 )
-from ..utils.hash import normalize_hash
+from ..utils.hash import normalize_hash, sha3_256_file
 from ..utils.time import utc_iso
 from .envelopes import build_stamp_envelope
+from .idempotency import idempotency_key, stamp_once
+from .raw_payloads import apply_profile
 from ._shared_summary import normalize_status, compose_stamp_summary
+from ..tracing import span
 
 
 # ---- payload extraction -------------------------------------------------------
@@ -115,84 +122,150 @@ def _require_api_key_or_fail(headers: Dict[str, str], rid: str):
                 "or set INTEGRITAS_API_KEY, then retry."
         )
 
+# ---- local hashing ------------------------------------------------------------
+
+def _should_hash_locally(req: StampDataRequest, size: Optional[int]) -> bool:
+    """
+    Explicit request flag wins; otherwise hash when the file is known to be
+    above the size threshold (unknown sizes keep the upload path).
+    """
+    if req.hash_locally is not None:
+        return req.hash_locally
+    return size is not None and size > get_settings().local_hash_threshold_bytes
+
+def _local_size(path: str) -> Optional[int]:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None  # let the upload path report the missing file
+
+async def _hash_local_file(path: str) -> str:
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"file_path not found: {path}")
+    # Blocking read in a worker thread; memory bounded by one chunk.
+    with span("stamp.hash_file"):
+        return await asyncio.to_thread(sha3_256_file, path, get_settings().hash_chunk_bytes)
+
+def _from_upstream(resp: Dict[str, Any] | str, rid: str) -> StampDataResponse:
+    """Shared tail of every path: upstream payload (or error text) -> response."""
+    with span("stamp.envelope"):
+        if isinstance(resp, str):
+            return _fail_response(request_id=rid, human=resp)
+
+        reqid = resp.get("requestId") or rid
+        fields = _extract_fields(resp)
+
+        if fields["status"] == "failed":
+            return _fail_response(
+                request_id=reqid,
+                human="Stamp failed.",
+                maybe_proof_url=fields.get("proof_url"),
+                raw=resp,
+            )
+
+        return _ok_response(request_id=reqid, fields=fields, raw=resp)
+
+async def _stamp_hash(endpoint: str, h: str, headers: Dict[str, str], rid: str) -> StampDataResponse:
+    """One-shot stamp of a normalized hash, at most once per key and window."""
+    key = idempotency_key(headers.get("x-api-key"), h)
+
+    async def call() -> StampDataResponse:
+        return _from_upstream(await post_json(endpoint, {"hash": h}, headers, idempotency_key=key), rid)
+
+    return await stamp_once(key, call)
+
 # ---- main entrypoint ----------------------------------------------------------
 
 async def stamp_data_complete(
     req: StampDataRequest,
     request_id: Optional[str] = None,
     api_key: Optional[str] = None,
+    *,
+    idempotency_key: Optional[str] = None,
 ) -> StampDataResponse:
     """
     If file_hash is provided, send JSON; else upload file (URL preferred).
-    Returns { requestId, summary, structuredContent } only.
+    Files may be hashed here instead (see _should_hash_locally), in which
+    case only the hash is sent. URL downloads are streamed, never buffered.
+    Returns { requestId, summary, structuredContent } only, shaped by
+    req.response_profile.
+
+    `idempotency_key` (queued jobs pass their job id) makes file and URL
+    uploads at-most-once as well: it is sent upstream as Idempotency-Key
+    and a successful result is replayed for repeats (see idempotency.py).
+    Hash stamps are keyed by (API key, hash) either way.
     """
+    if idempotency_key:
+        res = await stamp_once(idempotency_key, lambda: _stamp_data(req, request_id, api_key, idempotency_key))
+    else:
+        res = await _stamp_data(req, request_id, api_key)
+    return await apply_profile(res, req.response_profile, req.api_key or api_key)
+
+async def _stamp_data(
+    req: StampDataRequest,
+    request_id: Optional[str],
+    api_key: Optional[str],
+    idempotency_key: Optional[str] = None,
+) -> StampDataResponse:
     rid = request_id or "unknown"
 
-    headers = build_headers(req.api_key, api_key)
+    headers = await build_headers(req.api_key, api_key)
     maybe_err = _require_api_key_or_fail(headers, rid)
     if maybe_err:
         return maybe_err
+
+    if req.async_job:
+        from .stamp_jobs import submit_stamp_job  # the job worker calls back into this module
+        try:
+            return await submit_stamp_job(req, rid, api_key)
+        except Exception as e:
+            return _fail_response(request_id=rid, human=f"Could not queue stamp job: {e}")
     
     endpoint = f"{API_BASE_URL}/v1/timestamp/one-shot"
 
-    async with aiohttp.ClientSession() as session:
-        cleanup = None
-        try:
-            # --- HASH PATH (JSON) ------------------------------------------------
-            if req.file_hash:
-                h = normalize_hash(str(req.file_hash))
-                resp = await post_json(session, endpoint, {"hash": h}, headers)
-                if isinstance(resp, str):
-                    return _fail_response(request_id=rid, human=resp)
-
-                reqid = resp.get("requestId") or rid
-                fields = _extract_fields(resp)
-
-                if fields["status"] == "failed":
-                    return _fail_response(
-                        request_id=reqid,
-                        human="Stamp failed.",
-                        maybe_proof_url=fields.get("proof_url"),
-                        raw=resp,
-                    )
-
-                return _ok_response(request_id=reqid, fields=fields, raw=resp)
-
-            # --- MULTIPART PATH (URL or local file) -----------------------------
-            if req.file_url:
-                built = await maybe_await(
-                    form_from_file_url(session, str(req.file_url), "application/octet-stream")
-                )
-            else:
-                built = await maybe_await(
-                    form_from_file_path(req.file_path, "application/octet-stream")
-                )
+    cleanup = None
+    try:
+        # --- HASH PATH (JSON) ------------------------------------------------
+        h: Optional[str] = None
+        if req.file_hash:
+            h = normalize_hash(str(req.file_hash))
+        elif req.file_path and not req.file_url and _should_hash_locally(req, _local_size(req.file_path)):
+            h = await _hash_local_file(req.file_path)
 
-            form, cleanup = normalize_form_result(built)
-            resp = await post_multipart(session, endpoint, form, headers)
-            if isinstance(resp, str):
-                return _fail_response(request_id=rid, human=resp)
+        if h:
+            return await _stamp_hash(endpoint, h, headers, rid)
 
-            reqid = resp.get("requestId") or rid
-            fields = _extract_fields(resp)
+        # --- STREAMED URL PATH (hash while downloading, or relay upload) ----
+        if req.file_url:
+            async with open_file_url(str(req.file_url)) as download:
+                if _should_hash_locally(req, declared_size(download)):
+                    with span("stamp.download_hash"):
+                        h = await sha3_256_file_url(download)
+                else:
+                    with span("stamp.relay_upload"):  # download, multipart encoding and upstream wait overlap
+                        body, body_headers = multipart_from_file_url(download)
+                        resp = await post_multipart_stream(
+                            endpoint, body, {**headers, **body_headers}, idempotency_key=idempotency_key
+                        )
+                    return _from_upstream(resp, rid)
+            return await _stamp_hash(endpoint, h, headers, rid)
 
-            if fields["status"] == "failed":
-                return _fail_response(
-                    request_id=reqid,
-                    human="Stamp failed.",
-                    maybe_proof_url=fields.get("proof_url"),
-                    raw=resp,
-                )
+        # --- MULTIPART PATH (local file) ------------------------------------
+        with span("stamp.upload"):  # multipart encoding happens while the body is sent
+            built = await maybe_await(
+                form_from_file_path(req.file_path, "application/octet-stream")
+            )
+            form, cleanup = normalize_form_result(built)
+            resp = await post_multipart(endpoint, form, headers, idempotency_key=idempotency_key)
+        return _from_upstream(resp, rid)
 
-            return _ok_response(request_id=reqid, fields=fields, raw=resp)
+    except Exception as e:
+        # Keep a single friendly error surface
+        return _fail_response(request_id=rid, human=f"Exception calling API: {e}")
 
-        except Exception as e:
-            # Keep a single friendly error surface
-            return _fail_response(request_id=rid, human=f"Exception calling API: {e}")
-
-        finally:
-            if cleanup:
-                try:
-                    cleanup()
-                except Exception:
-                    pass
+    finally:
+        if cleanup:
+            try:
+                cleanup()
+            except Exception:
+                pass
@@ -0,0 +1,336 @@
+# src/integritas_mcp_server/services/stamp_jobs.py
+from __future__ import annotations
+import asyncio
+import contextvars
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from ..config import get_settings
+from ..logging_setup import get_logger
+from ..models import (
+    StampDataRequest, StampDataResponse, StampJobStatusRequest, StampJobStatusResponse,
+    ToolResultEnvelopeV1, STAMP_JOB_RESULT_KIND,
+)
+from ..ratelimit import TokenBucket
+from .. import secrets
+from ..state import open_store
+from ..tracing import span
+from .. import metrics
+
+log = get_logger().bind(component="stamp_jobs")
+
+# Durable queue for async stamping (StampDataRequest.async_job).
+#
+# Jobs are rows in STATE_DIR/jobs.db, so they survive restarts (pm2) and are
+# shared by every worker process on the host. Workers claim a job with a
+# lease that is renewed while the job runs (long uploads included); a job
+# whose worker died is claimed again once the lease expires. Failed attempts
+# are retried with exponential backoff up to STAMP_JOB_MAX_ATTEMPTS, except
+# errors a retry cannot fix (no API key, missing file_path), which fail the
+# job at once. Starts are spaced to STAMP_JOB_RATE_PER_SECOND per
+# process so a burst drains at a pace the upstream can absorb. Every attempt
+# stamps with the job id as idempotency key, so a retry after an upload
+# whose answer was lost (timeout, lease expiry) does not stamp twice.
+#
+# API keys are never written to jobs.db. A job stamped with the server key
+# resolves it through secrets when it runs (key_ref NULL); a per-call key is
+# kept in the keyring under the job id (key_ref 'keyring') and deleted when
+# the job finishes.
+
+DB_NAME = "jobs.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stamp_jobs (
+    id          TEXT PRIMARY KEY,
+    state       TEXT NOT NULL,              -- queued | running | done | failed
+    request     TEXT NOT NULL,
+    result      TEXT,
+    error       TEXT,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    key_ref     TEXT,                       -- NULL (server key) | keyring
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL,
+    not_before  REAL NOT NULL,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS stamp_jobs_ready ON stamp_jobs (state, not_before);
+"""
+
+LEASE_SECONDS = 300.0
+LEASE_RENEW_SECONDS = LEASE_SECONDS / 3
+IDLE_POLL_SECONDS = 1.0      # picks up jobs enqueued by other processes
+RETRY_BASE_SECONDS = 2.0
+RETRY_MAX_SECONDS = 300.0
+
+JOBS_ENQUEUED = metrics.counter("integritas_stamp_jobs_enqueued_total", "Async stamp jobs enqueued.")
+JOBS_FINISHED = metrics.counter("integritas_stamp_jobs_finished_total", "Async stamp jobs finished, by state.")
+
+
+def _store():
+    return open_store(DB_NAME, _SCHEMA)
+
+
+# ----- queue operations ----------------------------------------------------------
+
+def enqueue(req: StampDataRequest, api_key: Optional[str] = None) -> str:
+    """Queue a stamp; may touch the keyring, so async callers run it in a thread."""
+    job_id = uuid.uuid4().hex
+    key = req.api_key or api_key
+    key_ref = None
+    if key and key != secrets.resolve_api_key():
+        try:
+            secrets.save_job_key(job_id, key)
+        except Exception as e:
+            raise RuntimeError(
+                "queuing a stamp with a per-call api_key needs a keyring backend; "
+                "set the server key (auth_set_api_key) or stamp without async_job"
+            ) from e
+        key_ref = "keyring"
+    now = time.time()
+    body = req.model_copy(update={"async_job": False}).model_dump_json(exclude={"api_key"})
+    _store().execute(
+        "INSERT INTO stamp_jobs (id, state, request, key_ref, created_at, updated_at, not_before) "
+        "VALUES (?, 'queued', ?, ?, ?, ?, ?)",
+        (job_id, body, key_ref, now, now, now),
+    )
+    JOBS_ENQUEUED.inc()
+    _wake()
+    return job_id
+
+
+def claim() -> Optional[Dict[str, Any]]:
+    """Lease the oldest runnable job (queued and due, or running with an expired lease)."""
+    now = time.time()
+    with _store().transaction() as db:
+        row = db.execute(
+            "SELECT id, request, attempts, key_ref FROM stamp_jobs "
+            "WHERE (state = 'queued' AND not_before <= ?) OR (state = 'running' AND lease_until < ?) "
+            "ORDER BY not_before LIMIT 1",
+            (now, now),
+        ).fetchone()
+        if row is None:
+            return None
+        db.execute(
+            "UPDATE stamp_jobs SET state = 'running', attempts = attempts + 1, lease_until = ?, updated_at = ? "
+            "WHERE id = ?",
+            (now + LEASE_SECONDS, now, row["id"]),
+        )
+    return {"id": row["id"], "request": row["request"], "attempts": row["attempts"] + 1, "key_ref": row["key_ref"]}
+
+
+def renew_lease(job_id: str) -> None:
+    now = time.time()
+    _store().execute(
+        "UPDATE stamp_jobs SET lease_until = ?, updated_at = ? WHERE id = ? AND state = 'running'",
+        (now + LEASE_SECONDS, now, job_id),
+    )
+
+
+def _finish(job_id: str, state: str, result: Optional[str], error: Optional[str], not_before: Optional[float] = None) -> None:
+    now = time.time()
+    _store().execute(
+        "UPDATE stamp_jobs SET state = ?, result = ?, error = ?, updated_at = ?, lease_until = NULL, "
+        "not_before = COALESCE(?, not_before) WHERE id = ?",
+        (state, result, error, now, not_before, job_id),
+    )
+    if state in ("done", "failed"):
+        JOBS_FINISHED.inc(state=state)
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    row = _store().query_one(
+        "SELECT id, state, result, error, attempts, created_at, updated_at FROM stamp_jobs WHERE id = ?",
+        (job_id,),
+    )
+    return dict(row) if row else None
+
+
+def purge_finished(older_than_seconds: float) -> int:
+    cur = _store().execute(
+        "DELETE FROM stamp_jobs WHERE state IN ('done', 'failed') AND updated_at < ?",
+        (time.time() - older_than_seconds,),
+    )
+    return cur.rowcount
+
+
+# ----- execution ---------------------------------------------------------------
+
+async def _forget_key(job: Dict[str, Any]) -> None:
+    if job.get("key_ref") == "keyring":
+        await asyncio.to_thread(secrets.clear_job_key, job["id"])
+
+
+async def _keep_leased(job_id: str) -> None:
+    while True:
+        await asyncio.sleep(LEASE_RENEW_SECONDS)
+        try:
+            await asyncio.to_thread(renew_lease, job_id)
+        except Exception as e:  # e.g. database is locked; try again next tick
+            log.warning("stamp_job_lease_renew_failed", job_id=job_id, err=str(e))
+
+
+async def _permanent_error(req: StampDataRequest) -> Optional[str]:
+    """Problems a retry cannot fix; the job fails without further attempts."""
+    if req.file_path and not req.file_hash and not req.file_url and not os.path.isfile(req.file_path):
+        return f"file_path not found: {req.file_path}"
+    if not req.api_key and not await secrets.resolve_api_key_async():
+        return "No API key configured. Run `auth_set_api_key` once, or set INTEGRITAS_API_KEY."
+    return None
+
+
+async def run_job(job: Dict[str, Any]) -> str:
+    """Run one claimed job; returns the state it was left in."""
+    from .stamp_data import stamp_data_complete  # stamp_data imports this module
+
+    s = get_settings()
+    req = StampDataRequest.model_validate_json(job["request"])
+    if job.get("key_ref") == "keyring":
+        key = await asyncio.to_thread(secrets.load_job_key, job["id"])
+        if not key:  # never fall back to the server key for someone else's job
+            await asyncio.to_thread(_finish, job["id"], "failed", None, "the API key for this job is no longer available")
+            return "failed"
+        req = req.model_copy(update={"api_key": key})
+    permanent = await _permanent_error(req)
+    if permanent:
+        await asyncio.to_thread(_finish, job["id"], "failed", None, permanent)
+        await _forget_key(job)
+        log.warning("stamp_job_failed", job_id=job["id"], attempts=job["attempts"], error=permanent)
+        return "failed"
+
+    keeper = asyncio.create_task(_keep_leased(job["id"]))
+    try:
+        with span("stamp.job", job_id=job["id"], attempt=job["attempts"]):
+            res = await stamp_data_complete(req, f"job:{job['id']}", idempotency_key=f"job:{job['id']}")
+        failed = res.structuredContent.status == "failed"
+        error = res.summary if failed else None
+        result = res.model_dump_json(by_alias=True)
+    except Exception as e:  # stamp_data_complete already catches; belt and braces
+        failed, error, result = True, f"{type(e).__name__}: {e}", None
+    finally:
+        keeper.cancel()
+
+    if not failed:
+        await asyncio.to_thread(_finish, job["id"], "done", result, None)
+        await _forget_key(job)
+        return "done"
+    if job["attempts"] >= s.stamp_job_max_attempts:
+        await asyncio.to_thread(_finish, job["id"], "failed", result, error)
+        await _forget_key(job)
+        log.warning("stamp_job_failed", job_id=job["id"], attempts=job["attempts"], error=error)
+        return "failed"
+    delay = min(RETRY_BASE_SECONDS * 2 ** (job["attempts"] - 1), RETRY_MAX_SECONDS)
+    await asyncio.to_thread(_finish, job["id"], "queued", result, error, not_before=time.time() + delay)
+    log.info("stamp_job_retry", job_id=job["id"], attempts=job["attempts"], delay=delay)
+    return "queued"
+
+
+_tasks: List["asyncio.Task[None]"] = []
+_wakeup: Optional[asyncio.Event] = None
+
+def _wake() -> None:
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def _worker(n: int, pacer: TokenBucket, wakeup: asyncio.Event) -> None:
+    while True:
+        wakeup.clear()  # before claiming: a job queued meanwhile still wakes us
+        try:
+            job = await asyncio.to_thread(claim)
+        except Exception as e:
+            log.warning("stamp_job_claim_failed", worker=n, err=str(e))
+            job = None
+        if job is None:
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=IDLE_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        await pacer.acquire()
+        try:
+            await run_job(job)
+        except Exception as e:
+            # keep the worker alive; the job is claimed again once its lease expires
+            log.error("stamp_job_run_failed", worker=n, job_id=job["id"], err=f"{type(e).__name__}: {e}")
+
+
+async def start_workers() -> None:
+    global _wakeup
+    if _tasks:
+        return
+    s = get_settings()
+    if s.stamp_job_workers <= 0:
+        return
+    await asyncio.to_thread(purge_finished, s.stamp_job_retention_seconds)
+    _wakeup = asyncio.Event()
+    pacer = TokenBucket(s.stamp_job_rate_per_second, 1)  # starts spaced evenly, no burst
+    # workers may be started from inside a tool call: don't inherit its trace/request id
+    _tasks.extend(
+        asyncio.create_task(_worker(i, pacer, _wakeup), name=f"stamp-job-worker-{i}", context=contextvars.Context())
+        for i in range(s.stamp_job_workers)
+    )
+    log.info("stamp_job_workers_started", workers=s.stamp_job_workers)
+
+
+async def stop_workers() -> None:
+    """Cancel workers; a job cut off mid-run is re-claimed after its lease."""
+    global _wakeup
+    tasks = list(_tasks)
+    _tasks.clear()
+    _wakeup = None
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# ----- tool surfaces ---------------------------------------------------------------
+
+def _job_envelope(job_id: str, job: Optional[Dict[str, Any]]) -> StampJobStatusResponse:
+    if job is None:
+        human = f"Unknown job {job_id}."
+        env = ToolResultEnvelopeV1(kind=STAMP_JOB_RESULT_KIND, status="unknown", summary=human,
+                                   ids={"job_id": job_id}, data={"job_id": job_id, "state": "unknown"})
+        return StampJobStatusResponse(requestId=job_id, summary=human, structuredContent=env)
+
+    state = job["state"]
+    result = json.loads(job["result"]) if job.get("result") else None
+    stamp = (result or {}).get("structuredContent") or {}
+    if state == "done":
+        human = stamp.get("summary") or "Stamp job complete."
+    elif state == "failed":
+        human = f"Stamp job failed after {job['attempts']} attempt(s): {job.get('error') or 'unknown error'}"
+    else:
+        human = f"Stamp job {state}" + (f" (attempt {job['attempts']})" if job["attempts"] else "") + "."
+    ids = {"job_id": job_id, **(stamp.get("ids") or {})} if state == "done" else {"job_id": job_id}
+    env = ToolResultEnvelopeV1(
+        kind=STAMP_JOB_RESULT_KIND,
+        status={"done": stamp.get("status") or "finalized", "failed": "failed"}.get(state, "pending"),
+        summary=human,
+        ids=ids,
+        links=stamp.get("links") if state == "done" else None,
+        data={
+            "job_id": job_id, "state": state, "attempts": job["attempts"],
+            "error": job.get("error"), "result": stamp or None,
+        },
+    )
+    return StampJobStatusResponse(requestId=job_id, summary=human, structuredContent=env)
+
+
+async def submit_stamp_job(
+    req: StampDataRequest, request_id: Optional[str] = None, api_key: Optional[str] = None
+) -> StampDataResponse:
+    job_id = await asyncio.to_thread(enqueue, req, api_key)
+    log.info("stamp_job_enqueued", job_id=job_id, req_id=request_id)
+    res = _job_envelope(job_id, get_job(job_id))
+    return StampDataResponse(
+        requestId=request_id or job_id,
+        summary=f"Stamp queued · job {job_id}",
+        structuredContent=res.structuredContent.model_copy(update={"summary": f"Stamp queued · job {job_id}"}),
+    )
+
+
+def stamp_job_status(req: StampJobStatusRequest) -> StampJobStatusResponse:
+    return _job_envelope(req.job_id, get_job(req.job_id))
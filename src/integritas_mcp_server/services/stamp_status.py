@@ -5,6 +5,8 @@ import structlog
 from ..config import get_settings
 from ..http_client import post_json
 from ..errors import map_status_to_error, MCPServerError
+from .status_poller import STATUS_BATCH_MAX, StatusPoller, PollOutcome, classify
+from ..tracing import current_request_id
 from ..models import (
     StampStatusRequest,
     StampStatusResult,
@@ -49,57 +51,108 @@ async def _get_batch_stamp_status(
         raise MCPServerError(f"Batch request failed: {e}") from e
 
 
+# ---- shared poller -------------------------------------------------------------
+
+_poller: Optional[StatusPoller] = None
+_poller_loop: Optional[asyncio.AbstractEventLoop] = None
+
+async def _fetch(uids: List[str], api_key: Optional[str]) -> List[Dict[str, Any]]:
+    # the poller sets a fresh request id per round
+    return await _get_batch_stamp_status(uids, current_request_id(), api_key)
+
+def get_poller() -> StatusPoller:
+    """Process-wide poller, recreated if the event loop changed (like http_client)."""
+    global _poller, _poller_loop
+    loop = asyncio.get_running_loop()
+    if _poller is None or _poller_loop is not loop:
+        _poller = StatusPoller(fetch=_fetch)
+        _poller_loop = loop
+    return _poller
+
+async def stop_poller() -> None:
+    global _poller, _poller_loop
+    poller, _poller, _poller_loop = _poller, None, None
+    if poller is not None:
+        await poller.stop()
+
+
+def _to_result(uid: str, outcome: PollOutcome) -> StampStatusResult:
+    if outcome.state == "error":
+        e = outcome.error
+        if isinstance(e, MCPServerError):
+            return StampStatusResultError(uid=uid, error=f"Batch request failed: {e}")
+        return StampStatusResultError(uid=uid, error=f"Polling exception: {e}")
+
+    item = outcome.item or {}
+    kind = classify(item) if outcome.state == "done" else None
+    if kind == "success":
+        return StampStatusResultSuccess(**item)
+    if kind == "error":
+        default = "Proof error" if item.get("proof") == "ERROR" else "Unknown error"
+        return StampStatusResultError(uid=uid, error=item.get("error") or default)
+    try:
+        return StampStatusResultPending(**{**item, "uid": uid, "status": True, "onchain": False})
+    except Exception:
+        return StampStatusResultPending(uid=uid)
+
+
+async def _status_now(
+    uids: List[str], request_id: Optional[str], api_key: Optional[str]
+) -> Dict[str, PollOutcome]:
+    """
+    wait=False: answer at once. Uids the poller is already watching for this
+    key are served from its last poll; the rest are fetched in one batched
+    request now rather than joining the next poll round.
+    """
+    poller = get_poller()
+    outcomes: Dict[str, PollOutcome] = {}
+    missing = []
+    for uid in uids:
+        item = poller.last(uid, api_key)
+        if item is None:
+            missing.append(uid)
+        else:
+            outcomes[uid] = PollOutcome("done" if classify(item) else "pending", item)
+    if not missing:
+        return outcomes
+    items: Dict[str, Dict[str, Any]] = {}
+    try:
+        for i in range(0, len(missing), STATUS_BATCH_MAX):
+            for item in await _get_batch_stamp_status(missing[i:i + STATUS_BATCH_MAX], request_id, api_key):
+                if isinstance(item, dict) and item.get("uid"):
+                    items[item["uid"]] = item
+    except Exception as e:
+        outcomes.update((uid, PollOutcome("error", None, e)) for uid in missing)
+        return outcomes
+    for uid in missing:
+        item = items.get(uid)
+        outcomes[uid] = PollOutcome("done" if item and classify(item) else "pending", item)
+    return outcomes
+
+
 async def get_definitive_stamp_status(
     req: StampStatusRequest, request_id: Optional[str] = None, api_key: Optional[str] = None
 ) -> List[StampStatusResult]:
-    """Fetches the status for all UIDs, polling until a definitive result for each."""
-    # Initialize results with pending status for all requested UIDs
-    current_results: Dict[str, StampStatusResult] = {
-        uid: StampStatusResultPending(status=True, uid=uid, data="", number=0, datecreated="", onchain=False) # Placeholder
-        for uid in req.uids
-    }
-
-    for attempt in range(MAX_ATTEMPTS):
-        pending_uids_list = [
-            uid for uid, result in current_results.items()
-            if isinstance(result, StampStatusResultPending) and not result.onchain
-        ]
-
-        if not pending_uids_list:
-            log.info("all_uids_resolved", attempt=attempt)
-            break # All UIDs have been resolved
-
-        log.info("polling_uids", uids=pending_uids_list, attempt=attempt + 1)
-
-        try:
-            # Always send all original UIDs in the request
-            response_data_raw = await _get_batch_stamp_status(req.uids, request_id, api_key)
-
-            for item_data in response_data_raw:
-                uid_from_response = item_data.get("uid")
-                if uid_from_response and uid_from_response in current_results:
-                    # Apply user's specific logic for determining definitive status
-                    if item_data.get("status") is False: # API returned status=False (error)
-                        current_results[uid_from_response] = StampStatusResultError(uid=uid_from_response, error=item_data.get("error", "Unknown error"))
-                    elif item_data.get("onchain") is True: # API returned onchain=True (success)
-                        current_results[uid_from_response] = StampStatusResultSuccess(**item_data)
-                    elif item_data.get("onchain") is False and item_data.get("proof") == "ERROR": # Specific error condition
-                        current_results[uid_from_response] = StampStatusResultError(uid=uid_from_response, error=item_data.get("error", "Proof error"))
-                    # Otherwise, if status is True and onchain is False (and not proof==ERROR), it remains pending
-
-        except MCPServerError as e:
-            log.error("polling_mcp_error", error=str(e), uids=pending_uids_list)
-            # If the batch request itself failed, mark all currently pending UIDs as errors
-            for uid in pending_uids_list:
-                current_results[uid] = StampStatusResultError(uid=uid, error=f"Batch request failed: {e}")
-            break # Stop polling on batch error
-        except Exception as e:
-            log.error("polling_exception", error=str(e), uids=pending_uids_list)
-            for uid in pending_uids_list:
-                current_results[uid] = StampStatusResultError(uid=uid, error=f"Polling exception: {e}")
-            break # Stop polling on exception
-
-        if attempt < MAX_ATTEMPTS - 1:
-            await asyncio.sleep(POLLING_INTERVAL_SECONDS)
-
-    return list(current_results.values())
\ No newline at end of file
+    """
+    Resolve every uid through the shared poller: one batched upstream request
+    per round for all concurrent callers, unresolved uids only, each uid
+    polled at most MAX_ATTEMPTS times for this caller, rounds spaced from
+    POLLING_INTERVAL_SECONDS upwards by observed confirmation times.
+    With req.wait False the answer comes at once (see _status_now).
+    """
+    uids = list(dict.fromkeys(req.uids))
+    if not uids:
+        return []
+    key = api_key or req.api_key
+    if not req.wait:
+        now = await _status_now(uids, request_id, key)
+        return [_to_result(uid, now[uid]) for uid in req.uids]
+    poller = get_poller()
+    futures = [
+        poller.watch(uid, key, max_attempts=MAX_ATTEMPTS, interval=POLLING_INTERVAL_SECONDS)
+        for uid in uids
+    ]
+    log.info("polling_uids", uids=uids, request_id=request_id)
+    outcomes = await asyncio.gather(*futures)
+    by_uid = {uid: _to_result(uid, o) for uid, o in zip(uids, outcomes)}
+    return [by_uid[uid] for uid in req.uids]
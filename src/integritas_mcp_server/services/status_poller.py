@@ -0,0 +1,227 @@
+# src/integritas_mcp_server/services/status_poller.py
+from __future__ import annotations
+import asyncio
+import contextvars
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..logging_setup import get_logger
+from ..tracing import request_id_var, span
+from .. import metrics
+
+log = get_logger().bind(component="status_poller")
+
+# One background loop per process polls stamp status for every waiting caller.
+#
+# - Callers register (uid, api_key) watches and await a future per uid.
+# - Each round sends one batched request per API key with the union of
+#   unresolved uids only; resolved uids drop out immediately.
+# - The next round is scheduled from observed confirmation times (EWMA of
+#   datestamped - datecreated): fresh stamps are not polled before they can
+#   plausibly be on chain; overdue ones are polled at the base interval.
+# - New watches join the next scheduled round (sooner only if that round is
+#   further away than their own interval); they never trigger an extra round.
+#   A watch is charged an attempt only when it is itself due in a round.
+# - The loop exits when nobody is waiting and restarts on the next watch.
+#   It runs in a fresh context (not the first caller's trace or request id);
+#   each round is its own trace with its own request id (request_id_var).
+
+Fetch = Callable[[List[str], Optional[str]], Awaitable[List[Dict[str, Any]]]]
+
+STATUS_BATCH_MAX = 100       # uids per upstream request
+COALESCE_SECONDS = 0.01      # let concurrent callers join the first round
+MAX_INTERVAL_SECONDS = 60.0
+EWMA_ALPHA = 0.3
+
+POLL_ROUNDS = metrics.counter("integritas_status_poll_rounds_total", "Stamp status poll rounds.")
+POLL_UIDS = metrics.counter("integritas_status_polled_uids_total", "Uids sent in stamp status polls.")
+
+
+@dataclass(frozen=True)
+class PollOutcome:
+    """state: "done" (definitive item), "pending" (budget spent), "error"."""
+    state: str
+    item: Optional[Dict[str, Any]] = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class _Watch:
+    uid: str
+    api_key: Optional[str]
+    max_attempts: int
+    interval: float
+    future: "asyncio.Future[PollOutcome]"
+    attempts: int = 0
+    last: Optional[Dict[str, Any]] = None
+    due: Optional[float] = None  # monotonic; None = next scheduled round
+
+
+def _parse_ts(v: Any) -> Optional[float]:
+    if not isinstance(v, str) or not v:
+        return None
+    try:
+        return datetime.strptime(v, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+
+def classify(item: Dict[str, Any]) -> Optional[str]:
+    """'success' | 'error' for definitive upstream items, None while pending."""
+    if item.get("status") is False:
+        return "error"
+    if item.get("onchain") is True:
+        return "success"
+    if item.get("onchain") is False and item.get("proof") == "ERROR":
+        return "error"
+    return None
+
+
+@dataclass
+class StatusPoller:
+    fetch: Fetch
+    _watches: List[_Watch] = field(default_factory=list)
+    _wake: asyncio.Event = field(default_factory=asyncio.Event)
+    _task: Optional["asyncio.Task[None]"] = None
+    _next_round: float = 0.0  # monotonic time of the next scheduled round
+    confirm_seconds: Optional[float] = None  # EWMA of observed confirmation time
+
+    # ---- caller API -------------------------------------------------------
+
+    def watch(
+        self, uid: str, api_key: Optional[str], *, max_attempts: int, interval: float
+    ) -> "asyncio.Future[PollOutcome]":
+        fut: "asyncio.Future[PollOutcome]" = asyncio.get_running_loop().create_future()
+        w = _Watch(uid, api_key, max(1, max_attempts), interval, fut)
+        self._watches.append(w)
+        now = time.monotonic()
+        if self._task is None or self._task.done():
+            self._next_round = now + COALESCE_SECONDS  # concurrent callers join the first round
+            self._task = asyncio.create_task(
+                self._run(), name="stamp-status-poller", context=contextvars.Context()
+            )
+        elif self._next_round - now > interval:
+            # don't make a new caller wait longer than its own interval;
+            # the wake only reschedules the sleep, it does not start a round
+            w.due = now + interval
+            self._wake.set()
+        return fut
+
+    def last(self, uid: str, api_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Latest item polled for a uid watched with `api_key`, if any."""
+        for w in self._watches:
+            if w.uid == uid and w.api_key == api_key and w.last is not None:
+                return w.last
+        return None
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        for w in self._watches:
+            if not w.future.done():
+                w.future.set_result(PollOutcome("pending", w.last))
+        self._watches.clear()
+
+    # ---- loop -------------------------------------------------------------
+
+    def _due(self, w: _Watch) -> float:
+        return self._next_round if w.due is None else w.due
+
+    async def _run(self) -> None:
+        while True:
+            self._watches = [w for w in self._watches if not w.future.done()]
+            if not self._watches:
+                return
+            now = time.monotonic()
+            at = min(self._due(w) for w in self._watches)
+            if at > now:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=at - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._round(now)
+
+    async def _round(self, now: float) -> None:
+        due = [w for w in self._watches if not w.future.done() and self._due(w) <= now]
+        groups: Dict[Optional[str], List[_Watch]] = {}
+        for w in due:
+            w.due = None  # from now on it follows the shared schedule
+            groups.setdefault(w.api_key, []).append(w)
+        POLL_ROUNDS.inc()
+        token = request_id_var.set(f"integritas-poll-{uuid.uuid4().hex[:12]}")
+        try:
+            with span("stamp.status_poll", uids=len(due), keys=len(groups)):
+                await asyncio.gather(*(self._poll_group(k, ws) for k, ws in groups.items()))
+        finally:
+            request_id_var.reset(token)
+        delay = self._next_delay()
+        if delay is not None:
+            self._next_round = time.monotonic() + delay
+
+    async def _poll_group(self, api_key: Optional[str], watches: List[_Watch]) -> None:
+        uids = list(dict.fromkeys(w.uid for w in watches))
+        items: Dict[str, Dict[str, Any]] = {}
+        try:
+            for i in range(0, len(uids), STATUS_BATCH_MAX):
+                chunk = uids[i:i + STATUS_BATCH_MAX]
+                POLL_UIDS.inc(len(chunk))
+                for item in await self.fetch(chunk, api_key):
+                    if isinstance(item, dict) and item.get("uid"):
+                        items[item["uid"]] = item
+        except Exception as e:
+            log.warning("status_poll_failed", uids=len(uids), err=str(e))
+            for w in watches:
+                if not w.future.done():
+                    w.future.set_result(PollOutcome("error", w.last, e))
+            return
+
+        for w in watches:
+            if w.future.done():
+                continue
+            w.attempts += 1
+            item = items.get(w.uid)
+            if item is not None:
+                w.last = item
+                if classify(item) is not None:
+                    self._observe(item)
+                    w.future.set_result(PollOutcome("done", item))
+                    continue
+            if w.attempts >= w.max_attempts:
+                w.future.set_result(PollOutcome("pending", w.last))
+
+    # ---- adaptive schedule --------------------------------------------------
+
+    def _observe(self, item: Dict[str, Any]) -> None:
+        created, stamped = _parse_ts(item.get("datecreated")), _parse_ts(item.get("datestamped"))
+        if created is None or stamped is None or stamped < created:
+            return
+        took = stamped - created
+        prev = self.confirm_seconds
+        self.confirm_seconds = took if prev is None else prev + EWMA_ALPHA * (took - prev)
+
+    def _next_delay(self) -> Optional[float]:
+        waiting = [w for w in self._watches if not w.future.done()]
+        if not waiting:
+            return None
+        base = min(w.interval for w in waiting)
+        if self.confirm_seconds is None:
+            return base
+        now = time.time()
+        remaining = []
+        for w in waiting:
+            created = _parse_ts((w.last or {}).get("datecreated"))
+            if created is None:
+                return base
+            remaining.append(created + self.confirm_seconds - now)
+        # soonest expected confirmation, never faster than base, never idle too long
+        return min(max(min(remaining), base), max(MAX_INTERVAL_SECONDS, base))
@@ -1,17 +1,17 @@
 # services/stamp_data_helpers/api.py
-import aiohttp
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
 from ...config import get_settings
-from ...secrets import resolve_api_key
+from ...secrets import resolve_api_key_async
+from ...http_client import request
 
 s = get_settings()
 API_BASE_URL = s.minima_api_base.rstrip("/")
 
-def build_headers(possible_secret: Optional[Any], fallback: Optional[str]) -> Dict[str, str]:
+async def build_headers(possible_secret: Optional[Any], fallback: Optional[str]) -> Dict[str, str]:
     """
     Accepts either a plain string, a Pydantic SecretStr (with get_secret_value),
     or None. Falls back to `fallback`, then to the hybrid provider
-    (memory -> keyring -> env var).
+    (memory -> keyring -> env var), cached and off the event loop.
     """
     key: Optional[str] = None
 
@@ -35,44 +35,61 @@ def build_headers(possible_secret: Optional[Any], fallback: Optional[str]) -> Di
 
     # 3) global provider
     if not key:
-        key = resolve_api_key()
+        key = await resolve_api_key_async()
 
     return {"x-api-key": key} if key else {}
 
 async def post_json(
-    session: aiohttp.ClientSession,
     url: str,
     payload: Dict[str, Any],
     headers: Dict[str, str],
+    *,
+    idempotency_key: Optional[str] = None,
 ):
     """
     Posts JSON; returns JSON payload dict or error string.
+    Retried per the endpoint's policy; one-shot endpoints create a stamp per
+    call, so they are retried only when `idempotency_key` is given.
     """
-    merged = {"Content-Type": "application/json", **headers}
-    async with session.post(url, json=payload, headers=merged) as resp:
-        if resp.status < 200 or resp.status >= 300:
-            text = await resp.text()
-            return f"API error {resp.status}: {text}"
-        return await resp.json()
-
-# src/integritas_mcp_server/services/stamp_data_helpers/api.py
-import aiohttp
-from typing import Dict, Union, Any
+    resp = await request("POST", url, json=payload, headers=headers, idempotency_key=idempotency_key)
+    if resp.status_code < 200 or resp.status_code >= 300:
+        return f"API error {resp.status_code}: {resp.text}"
+    return resp.json()
 
 async def post_multipart(
-    session: aiohttp.ClientSession,
     url: str,
-    form: aiohttp.FormData,
+    files: Dict[str, Any],
     headers: Dict[str, str],
+    *,
+    idempotency_key: Optional[str] = None,
 ) -> Union[Dict[str, Any], str]:
     try:
-        # ✅ Always pass the FormData; do NOT write "form or False"
-        async with session.post(url, data=form, headers=headers) as resp:
-            text = await resp.text()
-            try:
-                return await resp.json()
-            except Exception:
-                # return text so caller can surface upstream error body
-                return text
+        # Retried/hedged per endpoint policy only if every part is in-memory
+        # bytes; open file objects are not replayable (see http_client._replayable).
+        resp = await request("POST", url, files=files, headers=headers, idempotency_key=idempotency_key)
+        try:
+            return resp.json()
+        except Exception:
+            # return text so caller can surface upstream error body
+            return resp.text
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+async def post_multipart_stream(
+    url: str,
+    body: Any,
+    headers: Dict[str, str],
+    *,
+    idempotency_key: Optional[str] = None,
+) -> Union[Dict[str, Any], str]:
+    """Like post_multipart, for a pre-encoded streamed body (see upload.multipart_from_file_url)."""
+    try:
+        resp = await request(
+            "POST", url, content=body, headers=headers, retry=False, idempotency_key=idempotency_key
+        )
+        try:
+            return resp.json()
+        except Exception:
+            return resp.text
     except Exception as e:
         return f"{type(e).__name__}: {e}"
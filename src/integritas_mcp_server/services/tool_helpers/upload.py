@@ -32,22 +32,35 @@
 #     return form  # no cleanup needed
 
 # src/integritas_mcp_server/services/stamp_data_helpers/upload.py
-import os, aiohttp, pathlib
-from typing import Callable, Tuple, Dict, Any, Callable, Tuple, Union, Optional
+import asyncio
+import hashlib
+import pathlib
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Tuple, Union, Optional
 import inspect
 
+import httpx
+
+from ...config import get_settings
+from ...errors import InvalidInputError
+from ...http_client import stream
+
+# httpx multipart spec: {"file": (filename, bytes | file object, content_type)}
+Files = Dict[str, Tuple[str, Any, str]]
+
 async def maybe_await(value):
     return await value if inspect.isawaitable(value) else value
 
 def normalize_form_result(
-    res: Union[aiohttp.FormData, Tuple[aiohttp.FormData, Optional[Callable[[], None]]]]
-) -> Tuple[aiohttp.FormData, Optional[Callable[[], None]]]:
+    res: Union[Files, Tuple[Files, Optional[Callable[[], None]]]]
+) -> Tuple[Files, Optional[Callable[[], None]]]:
     if isinstance(res, tuple):
         form, cleanup = res
         return form, cleanup
     return res, None
 
-async def form_from_file_path(path: str, content_type: str = "application/octet-stream") -> tuple[aiohttp.FormData, Callable[[], None]]:
+async def form_from_file_path(path: str, content_type: str = "application/octet-stream") -> tuple[Files, Callable[[], None]]:
     if not path:
         raise ValueError("file_path is required")
     p = pathlib.Path(path)
@@ -55,19 +68,86 @@ async def form_from_file_path(path: str, content_type: str = "application/octet-
         raise FileNotFoundError(f"file_path not found: {path}")
 
     f = open(path, "rb")
-    form = aiohttp.FormData()
-    form.add_field(
-        "file",
-        f,
-        filename=p.name,
-        content_type=content_type,
-    )
+    form: Files = {"file": (p.name, f, content_type)}
     return form, f.close
 
-async def form_from_file_url(session: aiohttp.ClientSession, url: str, content_type: str = "application/octet-stream") -> aiohttp.FormData:
-    async with session.get(str(url)) as r:
+# ---- file_url streaming ---------------------------------------------------------
+# Downloads are never held in memory whole: bodies are consumed in
+# Settings.stream_chunk_bytes pieces (the per-request buffer ceiling) and
+# capped at Settings.max_download_bytes.
+
+def _too_large(limit: int) -> InvalidInputError:
+    return InvalidInputError(f"file_url exceeds the maximum size of {limit} bytes")
+
+def declared_size(resp: httpx.Response) -> Optional[int]:
+    try:
+        return int(resp.headers["content-length"])
+    except (KeyError, ValueError):
+        return None
+
+@asynccontextmanager
+async def open_file_url(url: str) -> AsyncIterator[httpx.Response]:
+    """Open a streamed download; rejects declared sizes above the guard up front."""
+    limit = get_settings().max_download_bytes
+    async with stream("GET", str(url), endpoint="download") as r:
         r.raise_for_status()
-        data = await r.read()
-    form = aiohttp.FormData()
-    form.add_field("file", data, filename="upload.bin", content_type=content_type)
-    return form
+        size = declared_size(r)
+        if size is not None and size > limit:
+            raise _too_large(limit)
+        yield r
+
+async def iter_file_url(resp: httpx.Response) -> AsyncIterator[bytes]:
+    """Yield body chunks, enforcing the size guard on bytes actually received."""
+    s = get_settings()
+    total = 0
+    async for chunk in resp.aiter_bytes(s.stream_chunk_bytes):
+        total += len(chunk)
+        if total > s.max_download_bytes:
+            raise _too_large(s.max_download_bytes)
+        yield chunk
+
+async def sha3_256_file_url(resp: httpx.Response) -> str:
+    """Incremental SHA3-256 of a streamed download (hashing off the event loop)."""
+    h = hashlib.sha3_256()
+    async for chunk in iter_file_url(resp):
+        await asyncio.to_thread(h.update, chunk)
+    return h.hexdigest()
+
+def multipart_from_file_url(
+    resp: httpx.Response,
+    filename: str = "upload.bin",
+    content_type: str = "application/octet-stream",
+) -> tuple[AsyncIterator[bytes], Dict[str, str]]:
+    """
+    Relay a streamed download as a single-file multipart body.
+    Returns (body iterator, headers); Content-Length is set when the
+    download declares its size, otherwise the upload is chunked.
+    """
+    boundary = uuid.uuid4().hex
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+
+    async def body() -> AsyncIterator[bytes]:
+        yield head
+        async for chunk in iter_file_url(resp):
+            yield chunk
+        yield tail
+
+    headers = {"content-type": f"multipart/form-data; boundary={boundary}"}
+    size = declared_size(resp)
+    # Content-Length counts encoded bytes; only trust it for identity bodies.
+    if size is not None and resp.headers.get("content-encoding", "identity") == "identity":
+        headers["content-length"] = str(len(head) + size + len(tail))
+    return body(), headers
+
+async def form_from_file_url(url: str, content_type: str = "application/octet-stream") -> Files:
+    """Small files only (e.g. proof JSON): buffered, but still size-guarded."""
+    data = bytearray()
+    async with open_file_url(url) as r:
+        async for chunk in iter_file_url(r):
+            data += chunk
+    return {"file": ("upload.bin", bytes(data), content_type)}
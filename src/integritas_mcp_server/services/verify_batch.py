@@ -0,0 +1,202 @@
+# src/integritas_mcp_server/services/verify_batch.py
+from __future__ import annotations
+import asyncio
+import glob as _glob
+import hashlib
+import os
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..config import get_settings
+from ..logging_setup import get_logger
+from ..models import VerifyDataBatchRequest, VerifyDataBatchResponse, VerifyDataResponse
+from .verify_data import verify_proof_bytes, _fail_response
+from .root_cache import MAX_PROOF_FILE_BYTES
+from .raw_payloads import apply_profile
+from .tool_helpers.upload import open_file_url, iter_file_url
+from .envelopes import build_verify_batch_envelope
+from ._shared_summary import compose_batch_summary
+
+log = get_logger().bind(component="verify_batch")
+
+ProgressFn = Callable[[int, int], Awaitable[None]]
+
+
+# ----- source expansion --------------------------------------------------------
+
+def _is_url(ref: str) -> bool:
+    return ref.startswith(("http://", "https://"))
+
+def expand_sources(req: VerifyDataBatchRequest, limit: Optional[int] = None) -> List[str]:
+    """
+    directory + glob + files -> ordered, de-duplicated list of refs. With
+    `limit`, walking stops once more than `limit` refs are found (the result
+    then has limit + 1 entries), so a huge tree is never listed in full.
+    """
+    sources: List[Tuple[Iterable[str], bool]] = []  # (refs, sort them)
+    if req.directory:
+        sources.append((_glob.iglob(os.path.join(_glob.escape(req.directory), "*.json")), True))
+    if req.glob:
+        sources.append((_glob.iglob(req.glob, recursive=True), True))
+    if req.files:
+        sources.append((req.files, False))
+    seen: set[str] = set()
+    out: List[str] = []
+    for source, ordered in sources:
+        found: List[str] = []
+        for r in source:
+            key = r if _is_url(r) else os.path.abspath(r)
+            if key not in seen and (_is_url(r) or not os.path.isdir(r)):
+                seen.add(key)
+                found.append(r)
+                if limit is not None and len(out) + len(found) > limit:
+                    return out + found
+        out += sorted(found) if ordered else found
+    return out
+
+
+# ----- loading -----------------------------------------------------------------
+
+def _read_local(path: str, limit: int) -> bytes:
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"file not found: {path}")
+    if os.path.getsize(path) > limit:
+        raise ValueError(f"file exceeds the maximum size of {limit} bytes")
+    with open(path, "rb") as f:
+        return f.read()
+
+async def _load(ref: str) -> bytes:
+    """Proof bodies are tiny; anything above MAX_PROOF_FILE_BYTES is not a proof."""
+    limit = MAX_PROOF_FILE_BYTES
+    if _is_url(ref):
+        data = bytearray()
+        async with open_file_url(ref) as r:
+            async for chunk in iter_file_url(r):
+                data += chunk
+                if len(data) > limit:
+                    raise ValueError(f"file exceeds the maximum size of {limit} bytes")
+        return bytes(data)
+    return await asyncio.to_thread(_read_local, ref, limit)
+
+
+async def _report(progress: Optional[ProgressFn], done: int, total: int) -> None:
+    if progress is None:
+        return
+    try:
+        await progress(done, total)
+    except Exception as e:
+        log.warning("verify_batch_progress_failed", err=str(e))
+
+
+async def _pool(n: int, count: int, fn: Callable[[int], Awaitable[None]]) -> None:
+    """Run fn(0..count-1) on n workers."""
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < count:
+            i = next_index
+            next_index += 1
+            await fn(i)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(n, count)))))
+
+
+# ----- main entrypoint ---------------------------------------------------------
+
+async def verify_data_batch_complete(
+    req: VerifyDataBatchRequest,
+    request_id: Optional[str] = None,
+    api_key: Optional[str] = None,
+    progress: Optional[ProgressFn] = None,
+) -> VerifyDataBatchResponse:
+    """
+    1) expand directory/glob/files (stopping past VERIFY_BATCH_MAX_FILES),
+    2) on bounded workers, load each proof (capped at MAX_PROOF_FILE_BYTES),
+    hash its content and verify it unless identical content was already
+    taken up, so at most `concurrency` bodies are held at once,
+    3) aggregate: counts per file, one envelope per distinct proof.
+    Progress is reported per file.
+    """
+    rid = request_id or "unknown"
+    s = get_settings()
+    refs = expand_sources(req, limit=s.verify_batch_max_files)
+    total = len(refs)
+
+    def _reject(human: str) -> VerifyDataBatchResponse:
+        pkg = build_verify_batch_envelope(items=[], counts={"failed": total}, unique=0, summary=human)
+        return VerifyDataBatchResponse(requestId=rid, summary=human, structuredContent=pkg["structuredContent"])
+
+    if not refs:
+        return _reject("No proof files matched.")
+    if total > s.verify_batch_max_files:
+        return _reject(f"Batch too large: more than {s.verify_batch_max_files} files.")
+
+    concurrency = req.concurrency or s.verify_batch_concurrency
+    log.info("verify_batch_start", req_id=rid, files=total, concurrency=concurrency)
+
+    # ---- load, content-hash and verify each distinct content once ----------
+    digest_of: List[Optional[str]] = [None] * total
+    load_errors: Dict[int, str] = {}
+    results: Dict[str, VerifyDataResponse] = {}
+    claimed: set[str] = set()
+    done = 0
+
+    async def process(i: int) -> None:
+        nonlocal done
+        try:
+            data = await _load(refs[i])
+        except Exception as e:
+            log.warning("verify_batch_load_failed", req_id=rid, ref=refs[i], err=str(e))
+            load_errors[i] = str(e) or type(e).__name__
+        else:
+            digest = digest_of[i] = hashlib.sha3_256(data).hexdigest()
+            if digest not in claimed:  # duplicates reuse the first file's result
+                claimed.add(digest)
+                name = os.path.basename(refs[i]) or "proof.json"
+                res = await verify_proof_bytes(data, f"{rid}:{i}", api_key=req.api_key or api_key, filename=name)
+                results[digest] = await apply_profile(res, req.response_profile, req.api_key or api_key)
+        done += 1
+        await _report(progress, done, total)
+
+    await _pool(concurrency, total, process)
+
+    groups: Dict[str, List[int]] = {}
+    for i, digest in enumerate(digest_of):
+        if digest is not None:
+            groups.setdefault(digest, []).append(i)
+    digests = list(groups)
+
+    # ---- aggregate ----------------------------------------------------------
+    counts: Counter[str] = Counter()
+    items: List[Dict[str, Any]] = []
+    for digest in digests:
+        res = results[digest]
+        env = res.structuredContent
+        files = [refs[i] for i in groups[digest]]
+        counts[env.status or "unknown"] += len(files)
+        items.append({
+            "content_hash": digest,
+            "files": files,
+            "requestId": res.requestId,
+            "result": env.model_dump(by_alias=True, exclude_none=True),
+        })
+    for i, err in sorted(load_errors.items()):
+        res = _fail_response(request_id=f"{rid}:load:{i}", human=f"Could not load proof: {err}")
+        counts["failed"] += 1
+        items.append({
+            "files": [refs[i]],
+            "requestId": res.requestId,
+            "result": res.structuredContent.model_dump(by_alias=True, exclude_none=True),
+        })
+
+    summary = compose_batch_summary(dict(counts), total, verb="Verified")
+    if len(digests) < total - len(load_errors):
+        summary += f" · {len(digests)} unique"
+    log.info("verify_batch_done", req_id=rid, files=total, unique=len(digests), **dict(counts))
+    pkg = build_verify_batch_envelope(items=items, counts=dict(counts), unique=len(digests), summary=summary)
+    return VerifyDataBatchResponse(
+        requestId=rid,
+        summary=pkg["summary"],
+        structuredContent=pkg["structuredContent"],
+    )
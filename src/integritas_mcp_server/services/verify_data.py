@@ -1,10 +1,9 @@
 # src/integritas_mcp_server/services/verify_data.py
 from __future__ import annotations
+import asyncio
 from typing import Optional, Any, Dict
 from urllib.parse import urlsplit
 
-import aiohttp
-
 from ..models import VerifyDataRequest, VerifyDataResponse
 from .tool_helpers.api import API_BASE_URL, build_headers, post_multipart
 from .tool_helpers.upload import (
@@ -14,8 +13,12 @@ from .tool_helpers.upload import (
     normalize_form_result,
 )
 from ..logging_setup import get_logger
-from .envelopes import build_verify_envelope
+from .envelopes import build_verify_envelope, canonical_verify_status
+from .root_cache import MAX_PROOF_FILE_BYTES, learn_proof, lookup_proof
+from .raw_payloads import apply_profile
+from ..config import get_settings
 from ._shared_summary import compose_verify_summary  # <— use the shared composer
+from ..tracing import span
 
 log = get_logger().bind(component="verify")
 
@@ -138,6 +141,127 @@ def _require_api_key_or_fail(headers: Dict[str, str], rid: str):
                 "or set INTEGRITAS_API_KEY, then retry."
         )
     
+# ----- offline path ------------------------------------------------------------
+
+def _form_bytes(form: Dict[str, Any]) -> Optional[bytes]:
+    """Proof bytes from a prepared form, if small enough to check locally."""
+    value = (form.get("file") or (None, None))[1]
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value) if len(value) <= MAX_PROOF_FILE_BYTES else None
+    if hasattr(value, "read") and hasattr(value, "seek"):
+        head = value.read(MAX_PROOF_FILE_BYTES + 1)
+        value.seek(0)
+        return head if len(head) <= MAX_PROOF_FILE_BYTES else None
+    return None
+
+async def _offline_response(content: Optional[bytes], rid: str) -> Optional[VerifyDataResponse]:
+    if content is None or not get_settings().offline_verify:
+        return None
+    with span("verify.offline"):
+        res = await asyncio.to_thread(lookup_proof, content)  # SQLite stays off the event loop
+    if res is None:
+        return None
+    fields: Dict[str, Optional[str | int]] = {
+        "result": "full match",
+        "block_number": res.facts.get("block_number"),
+        "txpow_id": res.facts.get("txpow_id"),
+        "transactionid": res.facts.get("transactionid"),
+        "matched_hash": res.pairs[0][1].hex(),
+        "uid": None,
+        "verification_url": None,
+    }
+    log.info("verify_offline_match", req_id=rid, entries=len(res.pairs))
+    summary = compose_verify_summary(fields) + " · verified offline"
+    raw = {"offline": True, "roots": sorted({"0x" + root.hex() for root, _ in res.pairs})}
+    return _ok_response(request_id=rid, fields=fields, raw=raw, summary_override=summary)
+
+# ----- upstream call ------------------------------------------------------------
+
+def _verify_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    headers["x-report-required"] = "true"
+    headers["x-return-format"] = "link"
+    return headers
+
+async def _verify_upload(
+    form: Dict[str, Any],
+    headers: Dict[str, str],
+    endpoint: str,
+    rid: str,
+    content: Optional[bytes] = None,
+) -> VerifyDataResponse:
+    """
+    Post a prepared proof form upstream and map the answer to a response.
+    A confirmed result records the proof's (root, data) pairs in the root cache.
+    """
+    # ---- Call upstream -------------------------------------------------
+    if content is not None and isinstance(form.get("file"), tuple):
+        # send the bytes already read: replayable, so retries/hedges are safe
+        name, _, *rest = form["file"]
+        form = {**form, "file": (name, content, *rest)}
+    payload = await post_multipart(endpoint, form, headers)
+
+    # If HTTP helper returned raw string, treat as local/transport issue
+    if isinstance(payload, str):
+        log.warning("verify_local_nonjson_upstream", req_id=rid, sample=payload[:200])
+        return _fail_response(
+            request_id=rid,
+            human="Verification failed due to a local/transport issue.",
+        )
+
+    # Upstream error quick check
+    status = (payload.get("status") or "").lower()
+    status_code = payload.get("statusCode")
+    message = payload.get("message")
+    data = payload.get("data") or {}
+    verification = data.get("verification") or {}
+    vdata = verification.get("data") or {}
+
+    is_upstream_error = (
+        status in {"error", "fail", "failed"}
+        or (isinstance(status_code, int) and status_code >= 400)
+        or not vdata
+    )
+    if is_upstream_error:
+        parts = []
+        if isinstance(status_code, int): parts.append(str(status_code))
+        if message: parts.append(message)
+        human = " | ".join(p for p in parts if p) or "Upstream verification error"
+        log.info("verify_upstream_error", req_id=rid, status=status, status_code=status_code, message=message)
+        return _fail_response(
+            request_id=payload.get("requestId") or rid,
+            human=human,
+            maybe_verification_url=(data.get("file") or {}).get("download_url"),
+            raw=payload,
+        )
+
+    # Success path: extract fields & envelope
+    reqid = payload.get("requestId") or rid
+    fields = _extract_fields(payload)
+
+    # If upstream didn't provide a human summary, compose one
+    if not fields.get("summary"):
+        fields["summary"] = compose_verify_summary(
+            {
+                "result": fields.get("result"),
+                "block_number": fields.get("block_number"),
+                "txpow_id": fields.get("txpow_id"),
+                "transactionid": fields.get("transactionid"),
+            }
+        )
+
+    log.info(
+        "verify_success",
+        req_id=reqid,
+        result=fields.get("result"),
+        block_number=fields.get("block_number"),
+        has_link=bool(fields.get("verification_url")),
+    )
+    if content is not None and canonical_verify_status(fields.get("result")) == "finalized":
+        facts = {k: fields.get(k) for k in ("block_number", "txpow_id", "transactionid")}
+        await asyncio.to_thread(learn_proof, content, facts)
+
+    return _ok_response(request_id=reqid, fields=fields, raw=payload)
+
 # ----- main entrypoint ---------------------------------------------------------
 
 async def verify_data_complete(
@@ -150,17 +274,26 @@ async def verify_data_complete(
       - Upstream error envelope -> pass a friendly message through.
       - Local/transport/parsing problems -> one generic error message.
 
-    Returns only: { requestId, summary, structuredContent }.
+    Returns only: { requestId, summary, structuredContent }, shaped by
+    req.response_profile.
     """
+    return await apply_profile(
+        await _verify_data(req, request_id, api_key), req.response_profile, req.api_key or api_key
+    )
+
+async def _verify_data(
+    req: VerifyDataRequest,
+    request_id: Optional[str],
+    api_key: Optional[str],
+) -> VerifyDataResponse:
     rid = request_id or "unknown"
 
-    headers = build_headers(req.api_key, api_key)
+    headers = await build_headers(req.api_key, api_key)
     maybe_err = _require_api_key_or_fail(headers, rid)
     if maybe_err:
         return maybe_err
     
-    headers["x-report-required"] = "true"
-    headers["x-return-format"] = "link"
+    headers = _verify_headers(headers)
     endpoint = f"{API_BASE_URL}/v1/verify/post-lite-pdf"
 
     # Coerce HttpUrl → str for the uploader
@@ -180,107 +313,84 @@ async def verify_data_complete(
         header_keys=list(headers.keys()),
     )
 
-    async with aiohttp.ClientSession() as session:
-        cleanup = None
+    cleanup = None
+    try:
+        # ---- Build multipart form -----------------------------------------
         try:
-            # ---- Build multipart form -----------------------------------------
-            try:
+            with span("verify.build_form", download=bool(file_url_str)):
                 built = (
                     await maybe_await(
-                        form_from_file_url(session, file_url_str, "application/json")
+                        form_from_file_url(file_url_str, "application/json")
                     )
                     if file_url_str
                     else await maybe_await(
                         form_from_file_path(req.file_path, "application/json")
                     )
                 )
-            except Exception as e:
-                host = urlsplit(file_url_str).netloc if file_url_str else None
-                log.warning("verify_local_prepare_failed", req_id=rid, host=host, err=str(e))
-                return _fail_response(
-                    request_id=rid,
-                    human="Verification failed due to a local/transport issue.",
-                )
-
-            form, cleanup = normalize_form_result(built)
-            if not isinstance(form, aiohttp.FormData):
-                log.warning("verify_local_form_invalid", req_id=rid, form_type=str(type(form)))
-                return _fail_response(
-                    request_id=rid,
-                    human="Verification failed due to a local/transport issue.",
-                )
+        except Exception as e:
+            host = urlsplit(file_url_str).netloc if file_url_str else None
+            log.warning("verify_local_prepare_failed", req_id=rid, host=host, err=str(e))
+            return _fail_response(
+                request_id=rid,
+                human="Verification failed due to a local/transport issue.",
+            )
 
-            # ---- Call upstream -------------------------------------------------
-            payload = await post_multipart(session, endpoint, form, headers)
+        form, cleanup = normalize_form_result(built)
+        if not isinstance(form, dict):
+            log.warning("verify_local_form_invalid", req_id=rid, form_type=str(type(form)))
+            return _fail_response(
+                request_id=rid,
+                human="Verification failed due to a local/transport issue.",
+            )
 
-            # If HTTP helper returned raw string, treat as local/transport issue
-            if isinstance(payload, str):
-                log.warning("verify_local_nonjson_upstream", req_id=rid, sample=payload[:200])
-                return _fail_response(
-                    request_id=rid,
-                    human="Verification failed due to a local/transport issue.",
-                )
+        content = _form_bytes(form)
+        return (
+            await _offline_response(content, rid)
+            or await _verify_upload(form, headers, endpoint, rid, content)
+        )
 
-            # Upstream error quick check
-            status = (payload.get("status") or "").lower()
-            status_code = payload.get("statusCode")
-            message = payload.get("message")
-            data = payload.get("data") or {}
-            verification = data.get("verification") or {}
-            vdata = verification.get("data") or {}
-
-            is_upstream_error = (
-                status in {"error", "fail", "failed"}
-                or (isinstance(status_code, int) and status_code >= 400)
-                or not vdata
-            )
-            if is_upstream_error:
-                parts = []
-                if isinstance(status_code, int): parts.append(str(status_code))
-                if message: parts.append(message)
-                human = " | ".join(p for p in parts if p) or "Upstream verification error"
-                log.info("verify_upstream_error", req_id=rid, status=status, status_code=status_code, message=message)
-                return _fail_response(
-                    request_id=payload.get("requestId") or rid,
-                    human=human,
-                    maybe_verification_url=(data.get("file") or {}).get("download_url"),
-                    raw=payload,
-                )
+    except Exception as e:
+        log.exception("verify_local_uncaught", req_id=rid, endpoint=endpoint, err=str(e))
+        return _fail_response(
+            request_id=rid,
+            human="Verification failed due to a local/transport issue.",
+        )
+    finally:
+        if cleanup:
+            try:
+                cleanup()
+            except Exception:
+                log.warning("verify_cleanup_failed", req_id=rid)
 
-            # Success path: extract fields & envelope
-            reqid = payload.get("requestId") or rid
-            fields = _extract_fields(payload)
-
-            # If upstream didn't provide a human summary, compose one
-            if not fields.get("summary"):
-                fields["summary"] = compose_verify_summary(
-                    {
-                        "result": fields.get("result"),
-                        "block_number": fields.get("block_number"),
-                        "txpow_id": fields.get("txpow_id"),
-                        "transactionid": fields.get("transactionid"),
-                    }
-                )
 
-            log.info(
-                "verify_success",
-                req_id=reqid,
-                result=fields.get("result"),
-                block_number=fields.get("block_number"),
-                has_link=bool(fields.get("verification_url")),
-            )
+async def verify_proof_bytes(
+    data: bytes,
+    request_id: Optional[str] = None,
+    api_key: Optional[str] = None,
+    filename: str = "proof.json",
+) -> VerifyDataResponse:
+    """
+    Verify proof content already in memory (batch verification loads and
+    de-duplicates files first). Same error surface as verify_data_complete;
+    returned in full (the batch applies its response profile).
+    """
+    rid = request_id or "unknown"
 
-            return _ok_response(request_id=reqid, fields=fields, raw=payload)
+    headers = await build_headers(None, api_key)
+    maybe_err = _require_api_key_or_fail(headers, rid)
+    if maybe_err:
+        return maybe_err
 
-        except Exception as e:
-            log.exception("verify_local_uncaught", req_id=rid, endpoint=endpoint, err=str(e))
-            return _fail_response(
-                request_id=rid,
-                human="Verification failed due to a local/transport issue.",
-            )
-        finally:
-            if cleanup:
-                try:
-                    cleanup()
-                except Exception:
-                    log.warning("verify_cleanup_failed", req_id=rid)
+    headers = _verify_headers(headers)
+    endpoint = f"{API_BASE_URL}/v1/verify/post-lite-pdf"
+    try:
+        return (
+            await _offline_response(data, rid)
+            or await _verify_upload({"file": (filename, data, "application/json")}, headers, endpoint, rid, data)
+        )
+    except Exception as e:
+        log.exception("verify_local_uncaught", req_id=rid, endpoint=endpoint, err=str(e))
+        return _fail_response(
+            request_id=rid,
+            human="Verification failed due to a local/transport issue.",
+        )
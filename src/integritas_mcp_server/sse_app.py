@@ -7,6 +7,8 @@ from starlette.routing import Mount
 from .stdio_app import mcp
 from .config import get_settings
 from .security import BearerGuard
+from .lifecycle import app_lifespan
+from .prometheus import metrics_route
 
 # Build the inner MCP SSE ASGI app
 _inner = mcp.sse_app()
@@ -18,4 +20,7 @@ _settings = get_settings()
 _guarded = BearerGuard(_inner, _settings.mcp_access_token)
 
 # Mount at "/" so the effective SSE path is "/sse" (as you’re already using)
-app = Starlette(routes=[Mount("/", app=_guarded)])
+# The app-level lifespan keeps the shared upstream pool open for the whole
+# process rather than per SSE connection.
+# /metrics sits outside the bearer guard (optionally METRICS_TOKEN-guarded)
+app = Starlette(routes=[metrics_route, Mount("/", app=_guarded)], lifespan=app_lifespan)
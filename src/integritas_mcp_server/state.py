@@ -0,0 +1,87 @@
+# src/integritas_mcp_server/state.py
+from __future__ import annotations
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .config import get_settings
+
+# Small local state (caches, idempotency records, job queue) lives in SQLite
+# files under STATE_DIR, so it survives restarts and is shared by every worker
+# process on the host. WAL mode lets readers run alongside the single writer.
+# Statements are short, indexed, local-disk operations, but a writer in
+# another worker can hold the lock for up to the busy timeout, so async
+# callers run them in a thread (asyncio.to_thread); Store is thread-safe.
+# Caches open their store with a short busy timeout and treat a locked
+# database as a miss.
+
+BUSY_TIMEOUT_SECONDS = 5.0
+
+class Store:
+    def __init__(self, path: str, busy_timeout: float = BUSY_TIMEOUT_SECONDS):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=busy_timeout)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA busy_timeout={int(busy_timeout * 1000)}")
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def executescript(self, sql: str) -> None:
+        with self._lock:
+            self._conn.executescript(sql)
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def query_one(self, sql: str, params: Sequence[Any] = ()) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """BEGIN IMMEDIATE … COMMIT; serialises writers across processes."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_stores: Dict[str, Store] = {}
+_stores_lock = threading.Lock()
+
+def state_dir() -> str:
+    return os.path.abspath(os.path.expanduser(get_settings().state_dir))
+
+def open_store(name: str, schema: Optional[str] = None, busy_timeout: float = BUSY_TIMEOUT_SECONDS) -> Store:
+    """Process-wide Store for STATE_DIR/<name>, created (with schema) on first use."""
+    path = os.path.join(state_dir(), name)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            store = _stores[path] = Store(path, busy_timeout)
+            if schema:
+                store.executescript(schema)
+        return store
+
+def close_stores(names: Optional[Iterable[str]] = None) -> None:
+    with _stores_lock:
+        for path in list(_stores):
+            if names is None or os.path.basename(path) in names:
+                _stores.pop(path).close()
@@ -8,6 +8,8 @@ setup_logging()
 # Import side-effects: registers tools & resources on the shared mcp
 from integritas_mcp_server import tools as _tools   # noqa: F401
 from integritas_mcp_server import resources as _res # noqa: F401
+from integritas_mcp_server import subscriptions as _subs # noqa: F401
+from integritas_mcp_server import instrumentation as _inst # noqa: F401
 
 def build_app():
     if hasattr(_tools, "register_tools"):
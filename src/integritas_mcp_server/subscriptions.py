@@ -0,0 +1,177 @@
+# src/integritas_mcp_server/subscriptions.py
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+from mcp.server.lowlevel.server import NotificationOptions
+from mcp.server.models import InitializationOptions
+from mcp.server.session import ServerSession
+from pydantic import AnyUrl
+
+from integritas_mcp_server.core import mcp
+from .config import get_settings
+from .logging_setup import get_logger
+from .secrets import resolve_api_key_async
+from .services.status_poller import PollOutcome, classify
+
+log = get_logger().bind(component="subscriptions")
+
+# Push notifications for stamp finalization (SSE / streamable HTTP).
+#
+# Each stamp is a resource, integritas://stamp/{uid}. A client subscribes
+# (resources/subscribe) and gets notifications/resources/updated once the
+# uid is on chain, has failed, or the watch gave up; it then reads the
+# resource. All watches go through the shared stamp-status poller, so no
+# tool call is held open while waiting.
+#
+# Watches, subscribers and results are keyed by (uid, digest of the API key
+# used), so subscribers with different keys never share a watch or see each
+# other's results. Results are kept for RESULT_TTL_SECONDS after the final
+# notification, long enough for subscribers to read them.
+
+STAMP_URI = "integritas://stamp/{uid}"
+_PREFIX = "integritas://stamp/"
+RESULT_TTL_SECONDS = 3600.0
+
+_Key = Tuple[str, str]  # (uid, key digest)
+
+_subscribers: Dict[_Key, Set[ServerSession]] = {}
+_watches: Dict[_Key, "asyncio.Future[PollOutcome]"] = {}
+_last: Dict[_Key, Tuple[float, Dict[str, Any]]] = {}  # (expires_at, latest item)
+
+
+def stamp_uri(uid: str) -> str:
+    return STAMP_URI.format(uid=uid)
+
+def _uid(uri: AnyUrl | str) -> Optional[str]:
+    s = str(uri)
+    if not s.startswith(_PREFIX):
+        return None
+    return s[len(_PREFIX):] or None
+
+def _digest(api_key: Optional[str]) -> str:
+    return hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+
+
+def _remember(k: _Key, item: Dict[str, Any]) -> None:
+    now = time.monotonic()
+    for old in [o for o, (expires, _) in _last.items() if expires <= now]:
+        del _last[old]
+    _last[k] = (now + RESULT_TTL_SECONDS, item)
+
+
+def _state(uid: str, api_key: Optional[str]) -> Dict[str, Any]:
+    k = (uid, _digest(api_key))
+    kept = _last.get(k)
+    item = kept[1] if kept is not None and kept[0] > time.monotonic() else None
+    if item is None:
+        state = "watching" if k in _watches else "unknown"
+    else:
+        kind = classify(item)
+        state = {"success": "onchain", "error": "failed"}.get(kind or "", "pending")
+    return {"uid": uid, "state": state, "subscribed": k in _watches, "item": item}
+
+
+async def _notify(uid: str, sessions: Set[ServerSession]) -> None:
+    uri = AnyUrl(stamp_uri(uid))
+    for session in sessions:
+        try:
+            await session.send_resource_updated(uri)
+        except Exception as e:  # closed stream: nothing to tell
+            log.info("subscription_notify_failed", uid=uid, err=str(e))
+
+
+def _on_outcome(k: _Key, fut: "asyncio.Future[PollOutcome]") -> None:
+    if _watches.get(k) is not fut:
+        return  # unsubscribed, or superseded by a newer watch
+    del _watches[k]
+    sessions = _subscribers.pop(k, set())
+    if fut.cancelled():
+        return
+    outcome = fut.result()
+    if outcome.item is not None:
+        _remember(k, outcome.item)
+    log.info("subscription_resolved", uid=k[0], state=outcome.state)
+    asyncio.ensure_future(_notify(k[0], sessions))
+
+
+async def watch_uid(uid: str, session: ServerSession, api_key: Optional[str] = None) -> None:
+    """Subscribe `session` to `uid`; one shared watch per (uid, API key)."""
+    from .services import stamp_status  # lazy: pulls in the HTTP stack
+    key = api_key or await resolve_api_key_async()
+    k = (uid, _digest(key))
+    _subscribers.setdefault(k, set()).add(session)
+    if k in _watches:
+        return
+    fut = stamp_status.get_poller().watch(
+        uid,
+        key,
+        max_attempts=get_settings().stamp_subscription_max_polls,
+        interval=stamp_status.POLLING_INTERVAL_SECONDS,
+    )
+    _watches[k] = fut
+    fut.add_done_callback(lambda f: _on_outcome(k, f))
+    log.info("subscription_started", uid=uid)
+
+
+def unwatch_uid(uid: str, session: ServerSession) -> None:
+    for k in [k for k in _subscribers if k[0] == uid]:
+        subs = _subscribers[k]
+        subs.discard(session)
+        if not subs:
+            del _subscribers[k]
+            fut = _watches.pop(k, None)
+            if fut is not None and not fut.done():
+                fut.cancel()  # the poller drops done watches
+
+
+# ---- MCP wiring -------------------------------------------------------------
+
+@mcp.resource(STAMP_URI, mime_type="application/json")
+async def stamp_resource(uid: str) -> dict:
+    """Latest known on-chain status of a stamp; subscribe for updates."""
+    return _state(uid, await resolve_api_key_async())
+
+
+_server = mcp._mcp_server
+
+@_server.subscribe_resource()
+async def _subscribe(uri: AnyUrl) -> None:
+    uid = _uid(uri)
+    if uid:
+        await watch_uid(uid, _server.request_context.session)
+
+@_server.unsubscribe_resource()
+async def _unsubscribe(uri: AnyUrl) -> None:
+    uid = _uid(uri)
+    if uid:
+        unwatch_uid(uid, _server.request_context.session)
+
+
+# The lowlevel server derives resources.subscribe from nothing (always
+# false). Every transport builds its InitializationOptions through the
+# public create_initialization_options(), so the capability is declared
+# there: an experimental entry naming the subscribable template, and
+# resources.subscribe on the options it returns. Stateless HTTP has no
+# session to notify, so nothing is declared there.
+SUBSCRIBE_CAPABILITY = {"integritas/resourceSubscriptions": {"uriTemplates": [STAMP_URI]}}
+
+_create_initialization_options = _server.create_initialization_options
+
+def _initialization_options(
+    notification_options: Optional[NotificationOptions] = None,
+    experimental_capabilities: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> InitializationOptions:
+    if get_settings().stateless_http:
+        return _create_initialization_options(notification_options, experimental_capabilities)
+    opts = _create_initialization_options(
+        notification_options, {**SUBSCRIBE_CAPABILITY, **(experimental_capabilities or {})}
+    )
+    if opts.capabilities.resources is not None:
+        opts.capabilities.resources.subscribe = True
+    return opts
+
+_server.create_initialization_options = _initialization_options  # type: ignore[method-assign]
@@ -6,6 +6,8 @@ Liveness: quick, in-process check (no network).
 READY_DESCRIPTION = """
 Readiness probe: checks downstream Integritas API reachability and auth.
 Accepts optional api_key to test authenticated calls.
+Reports the upstream circuit breaker state (upstream_circuit: closed/open/half_open);
+while open, upstream calls fail fast and the probe reports "down".
 """
 
 STAMP_DATA_DESCRIPTION = """
@@ -16,6 +18,16 @@ Input (provide exactly one):
   - file_url: Presigned URL
   - file_path: Server-accessible local path
 
+Options:
+  - hash_locally: hash on the server (streamed for file_url) and stamp the
+    hash instead of uploading. Default: automatic for large files.
+  - async_job: queue the stamp and return at once with a job id
+    (structuredContent.kind "integritas/stamp_job@v1", ids.job_id);
+    read the outcome with stamp_job_status.
+
+Stamping the same hash again with the same API key (within the server's
+idempotency window) returns the first result; no duplicate stamp is made.
+
 Output:
   - summary: Plain, human-readable summary.
   - structuredContent (ToolResultEnvelopeV1):
@@ -28,6 +40,59 @@ Output:
       $schema: "https://integritas.dev/schemas/tool-result-v1.json"
 """
 
+STAMP_DATA_BATCH_DESCRIPTION = """
+Stamp many files or hashes in one call (same rules as stamp_data per item).
+
+Input:
+  - items: list of stamp_data inputs (file_hash | file_url | file_path, ...)
+  - concurrency: optional cap on items in flight (server default applies)
+  - api_key: optional, used for items without their own
+
+Progress is reported per completed item.
+
+Output:
+  - summary: e.g. "Stamped 98/100 · 2 failed"
+  - structuredContent (ToolResultEnvelopeV1):
+      kind: "integritas/stamp_batch_result@v1"
+      status: "finalized" (all) | "pending" | "failed" (any item failed)
+      data: { total, counts: {finalized?, pending?, failed?, unknown?},
+              items: [{ index, requestId, result: <stamp_result@v1 envelope> }] }
+"""
+
+STAMP_STATUS_DESCRIPTION = """
+Look up stamps by uid and wait (bounded) for pending ones to land on chain.
+
+Input:
+  - uids: list of stamp uids (from stamp_data)
+  - api_key: optional
+
+Pending uids are polled by a shared server-side poller: concurrent calls
+share batched upstream requests and each poll only asks for unresolved uids.
+
+Output:
+  - requestId
+  - data: one entry per uid, in request order:
+      { status: true, onchain: true, uid, data, number, datecreated,
+        datestamped, root, proof, address }          (on chain)
+      { status: true, onchain: false, uid, ... }     (still pending)
+      { status: false, uid, error }                  (failed / not found)
+"""
+
+STAMP_JOB_STATUS_DESCRIPTION = """
+Read an async stamp job (stamp_data with async_job: true).
+
+Input:
+  - job_id: from the stamp_data response (ids.job_id)
+
+Output:
+  - summary: job state, or the stamp summary once done
+  - structuredContent (ToolResultEnvelopeV1):
+      kind: "integritas/stamp_job@v1"
+      status: "pending" (queued/running/retrying) | "finalized" | "failed" | "unknown"
+      ids: { job_id, uid? }
+      data: { job_id, state, attempts, error?, result?: <stamp_result@v1 envelope> }
+"""
+
 VERIFY_DATA_DESCRIPTION = """
 Verify a proof file against the Minima blockchain via Integritas one-shot API.
 
@@ -46,3 +111,26 @@ Output:
       data: raw domain payload (may include result, block_number, etc.)
       $schema: "https://integritas.dev/schemas/tool-result-v1.json"
 """
+
+VERIFY_DATA_BATCH_DESCRIPTION = """
+Verify many proof files in one call (same upstream check as verify_data).
+
+Input (at least one; sources are combined):
+  - directory: server-accessible folder; every *.json file in it
+  - glob: server-side pattern, e.g. "/data/**/*.json" (recursive)
+  - files: list of local paths and/or http(s) URLs
+  - concurrency: optional cap on files in flight (server default applies)
+  - api_key: optional
+
+Files with identical content are verified once and share one result.
+Progress is reported per file (loaded and verified, or matched to an identical proof).
+
+Output:
+  - summary: e.g. "Verified 40/42 · 2 failed · 30 unique"
+  - structuredContent (ToolResultEnvelopeV1):
+      kind: "integritas/verify_batch_result@v1"
+      status: "finalized" (all) | "pending" | "failed" (any file failed)
+      data: { total, counts (per file), unique,
+              items: [{ content_hash?, files: [...], requestId,
+                        result: <verify_result@v1 envelope> }] }
+"""
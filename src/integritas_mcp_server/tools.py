@@ -1,4 +1,5 @@
 # src/integritas_mcp_server/tools.py
+import asyncio
 from typing import Optional, Dict, Any
 from pydantic import BaseModel
 from mcp.server.fastmcp import Context
@@ -6,17 +7,22 @@ from integritas_mcp_server.core import mcp
 
 from .models import (
     StampDataRequest, StampDataResponse,
+    StampDataBatchRequest, StampDataBatchResponse,
     VerifyDataRequest, VerifyDataResponse,
+    VerifyDataBatchRequest, VerifyDataBatchResponse,
+    StampStatusRequest, StampStatusResponse,
+    StampJobStatusRequest, StampJobStatusResponse,
 )
 from .tools_auth import auth_set_api_key as _set, auth_get_api_key as _get, auth_clear_api_key as _clear
 
-from .services.stamp_data import stamp_data_complete
-from .services.verify_data import verify_data_complete
-from .services.self_health import self_health
-from .services.health import check_readiness
+# Service modules (and through them http_client, tenacity, keyring, ...) are
+# imported by each tool on its first call, not at startup: hosts that spawn
+# a stdio server per session only pay for the tools they use.
 from .tool_descriptions import (
     HEALTH_DESCRIPTION, READY_DESCRIPTION,
-    STAMP_DATA_DESCRIPTION, VERIFY_DATA_DESCRIPTION,
+    STAMP_DATA_DESCRIPTION, STAMP_DATA_BATCH_DESCRIPTION, STAMP_STATUS_DESCRIPTION,
+    STAMP_JOB_STATUS_DESCRIPTION,
+    VERIFY_DATA_DESCRIPTION, VERIFY_DATA_BATCH_DESCRIPTION,
 )
 from .logging_utils import tool_logger
 from .logging_setup import get_logger
@@ -27,42 +33,81 @@ class ReadyRequest(BaseModel):
     api_key: str | None = None
 
 def register_tools() -> None:
-    @tool_logger
     @mcp.tool()
+    @tool_logger
     async def health() -> dict:
+        from .services.self_health import self_health
         # Keep as plain dict for simplicity/interop
         return self_health(version=None).model_dump()
     health.__doc__ = HEALTH_DESCRIPTION
 
-    @tool_logger
     @mcp.tool()
+    @tool_logger
     async def ready(req: ReadyRequest, ctx: Optional[Context] = None) -> dict:
+        from .services.health import check_readiness
         req_id = getattr(ctx, "request_id", None) if ctx else None
         return await check_readiness(req, req_id, api_key=req.api_key)
     ready.__doc__ = READY_DESCRIPTION
 
-    @tool_logger
     @mcp.tool(name="stamp_data")
+    @tool_logger
     async def stamp_data(req: StampDataRequest, ctx: Optional[Context] = None) -> StampDataResponse:
+        from .services.stamp_data import stamp_data_complete
         req_id = getattr(ctx, "request_id", None) if ctx else None
         return await stamp_data_complete(req, req_id, api_key=req.api_key)
     stamp_data.__doc__ = STAMP_DATA_DESCRIPTION
 
+    @mcp.tool(name="stamp_data_batch")
+    @tool_logger
+    async def stamp_data_batch(req: StampDataBatchRequest, ctx: Optional[Context] = None) -> StampDataBatchResponse:
+        from .services.stamp_batch import stamp_data_batch_complete
+        req_id = getattr(ctx, "request_id", None) if ctx else None
+        progress = ctx.report_progress if ctx else None
+        return await stamp_data_batch_complete(req, req_id, api_key=req.api_key, progress=progress)
+    stamp_data_batch.__doc__ = STAMP_DATA_BATCH_DESCRIPTION
+
+    @mcp.tool(name="stamp_status")
     @tool_logger
+    async def stamp_status(req: StampStatusRequest, ctx: Optional[Context] = None) -> StampStatusResponse:
+        from .services.stamp_status import get_definitive_stamp_status
+        req_id = getattr(ctx, "request_id", None) if ctx else None
+        data = await get_definitive_stamp_status(req, req_id, api_key=req.api_key)
+        return StampStatusResponse(requestId=str(req_id or "unknown"), data=data)
+    stamp_status.__doc__ = STAMP_STATUS_DESCRIPTION
+
+    @mcp.tool(name="stamp_job_status")
+    @tool_logger
+    async def stamp_job_status(req: StampJobStatusRequest) -> StampJobStatusResponse:
+        from .services.stamp_jobs import stamp_job_status as _stamp_job_status
+        return _stamp_job_status(req)
+    stamp_job_status.__doc__ = STAMP_JOB_STATUS_DESCRIPTION
+
     @mcp.tool(name="verify_data")
+    @tool_logger
     async def verify_data(req: VerifyDataRequest, ctx: Optional[Context] = None) -> VerifyDataResponse:
+        from .services.verify_data import verify_data_complete
         req_id = getattr(ctx, "request_id", None) if ctx else None
         return await verify_data_complete(req, req_id, api_key=req.api_key)
     verify_data.__doc__ = VERIFY_DATA_DESCRIPTION
 
+    @mcp.tool(name="verify_data_batch")
+    @tool_logger
+    async def verify_data_batch(req: VerifyDataBatchRequest, ctx: Optional[Context] = None) -> VerifyDataBatchResponse:
+        from .services.verify_batch import verify_data_batch_complete
+        req_id = getattr(ctx, "request_id", None) if ctx else None
+        progress = ctx.report_progress if ctx else None
+        return await verify_data_batch_complete(req, req_id, api_key=req.api_key, progress=progress)
+    verify_data_batch.__doc__ = VERIFY_DATA_BATCH_DESCRIPTION
+
+    # keyring calls can block (D-Bus / Secret Service): keep them off the loop
     @mcp.tool(name="auth_set_api_key")
     async def auth_set_api_key_tool(body: Dict[str, Any]) -> dict:
-        return _set(body)
+        return await asyncio.to_thread(_set, body)
 
     @mcp.tool(name="auth_get_api_key")
     async def auth_get_api_key_tool() -> dict:
-        return _get({})
+        return await asyncio.to_thread(_get, {})
 
     @mcp.tool(name="auth_clear_api_key")
     async def auth_clear_api_key_tool() -> dict:
-        return _clear({})
\ No newline at end of file
+        return await asyncio.to_thread(_clear, {})
\ No newline at end of file
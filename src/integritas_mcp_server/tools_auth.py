@@ -1,10 +1,7 @@
 # tools_auth.py (fixed)
 from typing import Dict, Any, Optional
 from pydantic import BaseModel, Field
-from .secrets import (
-    set_api_key_memory, clear_api_key_memory,
-    save_api_key_keyring, resolve_api_key, clear_api_key_keyring,
-)
+from .secrets import clear_api_key, resolve_api_key, set_api_key
 
 MASK = "••••••"
 
@@ -25,13 +22,8 @@ def auth_set_api_key(args: Dict[str, Any]) -> Dict[str, Any]:
     payload = SetApiKeyInput(**args)
     key = payload.api_key.strip()
 
-    # Memory (immediate) + keyring (persistence)
-    set_api_key_memory(key)
-    try:
-        save_api_key_keyring(key)
-    except Exception:
-        # still fine this session via memory
-        pass
+    # Keyring (persistence) + memory (immediate)
+    set_api_key(key)
 
     return GenericResult(
         ok=True,
@@ -48,8 +40,7 @@ def auth_get_api_key(_: Dict[str, Any]) -> Dict[str, Any]:
     ).model_dump()
 
 def auth_clear_api_key(_: Dict[str, Any]) -> Dict[str, Any]:
-    clear_api_key_memory()
-    clear_api_key_keyring()
+    clear_api_key()
     return GenericResult(
         ok=True,
         summary="API key cleared from memory and keyring.",
@@ -0,0 +1,224 @@
+# src/integritas_mcp_server/tracing.py
+from __future__ import annotations
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+import structlog
+
+from .config import get_settings
+
+log = structlog.get_logger()
+
+# Minimal OpenTelemetry-style tracing, dependency-free like metrics.py.
+#
+# `span(name, **attrs)` times a stage; spans nest through a contextvar, so
+# one tool call becomes one trace (tool -> hashing/download/encoding ->
+# upstream attempts -> envelope). Sampling is decided once per trace at its
+# root (TRACE_SAMPLE_RATE; 0 = off). Finished traces go to TRACE_EXPORTER:
+#   file -> JSON lines at TRACE_FILE (default STATE_DIR/traces.jsonl)
+#   otlp -> OTLP/HTTP JSON POSTed to TRACE_OTLP_ENDPOINT (e.g. a local collector)
+# The MCP request id of the current tool call is kept in `request_id_var`
+# and sent upstream as x-request-id, with a W3C traceparent when sampled.
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("integritas_request_id", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    sampled: bool
+    start_ns: int = 0
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    trace: List["Span"] = field(default_factory=list, repr=False)  # shared by the trace; root exports it
+
+    def set(self, **attrs: Any) -> None:
+        if self.sampled:
+            self.attributes.update(attrs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("integritas_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def current_request_id() -> Optional[str]:
+    return request_id_var.get()
+
+
+def _hex(nbytes: int) -> str:
+    return random.getrandbits(nbytes * 8).to_bytes(nbytes, "big").hex()
+
+
+_NOOP = Span("noop", "0" * 32, "0" * 16, None, False)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Span]:
+    parent = _current.get()
+    if parent is None:
+        rate = get_settings().trace_sample_rate
+        if rate <= 0:  # tracing off: no ids, no context switch
+            yield _NOOP
+            return
+        sp = Span(name, _hex(16), _hex(8), None, random.random() < rate)
+    else:
+        sp = Span(name, parent.trace_id, _hex(8), parent.span_id, parent.sampled, trace=parent.trace)
+    if sp.sampled:
+        sp.attributes.update(attrs)
+        rid = request_id_var.get()
+        if rid is not None:
+            sp.attributes.setdefault("request_id", rid)
+        sp.start_ns = time.time_ns()
+    token = _current.set(sp)
+    try:
+        yield sp
+    except BaseException as e:
+        if sp.sampled:
+            sp.status = "error"
+            sp.attributes["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        if sp.sampled:
+            sp.end_ns = time.time_ns()
+            sp.trace.append(sp)
+            if parent is None:
+                export(sp.trace)
+
+
+def traceparent() -> Optional[str]:
+    """W3C trace context for the current span, if it is being recorded."""
+    sp = _current.get()
+    if sp is None or not sp.sampled:
+        return None
+    return f"00-{sp.trace_id}-{sp.span_id}-01"
+
+
+# ---- exporters -----------------------------------------------------------------
+
+_file_lock = threading.Lock()
+_pending: Set["asyncio.Task[None]"] = set()
+
+
+def _trace_file() -> str:
+    s = get_settings()
+    return os.path.expanduser(s.trace_file or os.path.join(s.state_dir, "traces.jsonl"))
+
+
+def _export_file(spans: List[Span]) -> None:
+    path = _trace_file()
+    lines = "".join(json.dumps(sp.to_dict(), default=str) + "\n" for sp in spans)
+    with _file_lock:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+def _otlp_value(v: Any) -> Dict[str, Any]:
+    if isinstance(v, bool):
+        return {"boolValue": v}
+    if isinstance(v, int):
+        return {"intValue": str(v)}
+    if isinstance(v, float):
+        return {"doubleValue": v}
+    return {"stringValue": str(v)}
+
+
+def otlp_payload(spans: List[Span]) -> Dict[str, Any]:
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "integritas-mcp-server"}}]},
+            "scopeSpans": [{
+                "scope": {"name": "integritas_mcp_server"},
+                "spans": [
+                    {
+                        "traceId": sp.trace_id,
+                        "spanId": sp.span_id,
+                        **({"parentSpanId": sp.parent_id} if sp.parent_id else {}),
+                        "name": sp.name,
+                        "kind": 1,
+                        "startTimeUnixNano": str(sp.start_ns),
+                        "endTimeUnixNano": str(sp.end_ns),
+                        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in sp.attributes.items()],
+                        "status": {"code": 2 if sp.status == "error" else 1},
+                    }
+                    for sp in spans
+                ],
+            }],
+        }]
+    }
+
+
+_otlp_client: Any = None
+_otlp_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_otlp_client() -> Any:
+    """One exporter client per event loop, like http_client.get_client()."""
+    global _otlp_client, _otlp_loop
+    import httpx
+    loop = asyncio.get_running_loop()
+    if _otlp_client is None or _otlp_client.is_closed or _otlp_loop is not loop:
+        _otlp_client = httpx.AsyncClient(timeout=2.0)
+        _otlp_loop = loop
+    return _otlp_client
+
+
+async def close_exporter() -> None:
+    """Flush pending OTLP posts and close the exporter client."""
+    global _otlp_client, _otlp_loop
+    if _pending:
+        await asyncio.gather(*_pending, return_exceptions=True)
+    client, _otlp_client, _otlp_loop = _otlp_client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+async def _post_otlp(url: str, payload: Dict[str, Any]) -> None:
+    try:
+        await _get_otlp_client().post(url, json=payload)
+    except Exception as e:  # a missing collector must never affect tool calls
+        log.debug("trace_export_failed", err=str(e))
+
+
+def export(spans: List[Span]) -> None:
+    exporter = get_settings().trace_exporter
+    try:
+        if exporter == "file":
+            _export_file(spans)
+        elif exporter == "otlp":
+            task = asyncio.get_running_loop().create_task(
+                _post_otlp(get_settings().trace_otlp_endpoint, otlp_payload(spans))
+            )
+            _pending.add(task)
+            task.add_done_callback(_pending.discard)
+    except Exception as e:
+        log.debug("trace_export_failed", err=str(e))
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Final
 import base64
+import hashlib
 import re
 
 _HEX_RE: Final = re.compile(r"^(0x)?[0-9a-fA-F]+$")
@@ -17,3 +18,17 @@ def normalize_hash(value: str) -> str:
     if _HEX_RE.match(v):
         return v[2:].lower() if v.lower().startswith("0x") else v.lower()
     return _b64_to_hex(v).lower()
+
+def sha3_256_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    SHA3-256 of a file as lowercase hex, read in fixed-size chunks into one
+    reused buffer so memory stays bounded regardless of file size.
+    Blocking; run it off the event loop for large files.
+    """
+    h = hashlib.sha3_256()
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as f:
+        while n := f.readinto(buf):
+            h.update(view[:n])
+    return h.hexdigest()
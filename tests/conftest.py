@@ -1,6 +1,8 @@
 import pytest
 import structlog
 from integritas_mcp_server.config import get_settings
+from integritas_mcp_server.state import close_stores
+from integritas_mcp_server import circuit, hedging, ratelimit, retry, secrets
 
 # Configure logging for tests
 structlog.configure(
@@ -14,11 +16,19 @@ structlog.configure(
 )
 
 @pytest.fixture(autouse=True)
-def override_settings(monkeypatch):
+def override_settings(monkeypatch, tmp_path):
     """Override settings for all tests by setting environment variables."""
     monkeypatch.setenv("MINIMA_API_BASE", "https://upstream.example")
+    monkeypatch.setenv("STATE_DIR", str(tmp_path / "state"))
     # Clear the cache to ensure the new settings are loaded
     get_settings.cache_clear()
+    ratelimit.reset()
+    circuit.reset()
+    retry.reset()
+    hedging.reset()
+    secrets.reset_api_key_cache()
+    yield
+    close_stores()
 
 
 @pytest.fixture(autouse=True)
@@ -0,0 +1,84 @@
+# tests/test_circuit.py
+import httpx
+import pytest
+import respx
+
+from integritas_mcp_server import circuit, http_client
+from integritas_mcp_server.config import get_settings
+from integritas_mcp_server.errors import CircuitOpenError, TransientError
+from integritas_mcp_server.tools import ReadyRequest
+from integritas_mcp_server.services.health import check_readiness
+
+
+@pytest.fixture
+def fast(monkeypatch):
+    monkeypatch.setenv("RETRY_POLICIES", '{"/v1": {"base": 0, "cap": 0}}')
+    monkeypatch.setenv("CIRCUIT_FAILURE_THRESHOLD", "2")
+    monkeypatch.setenv("CIRCUIT_RESET_SECONDS", "0.05")
+    get_settings.cache_clear()
+    circuit.reset()
+
+
+def test_breaker_opens_half_opens_and_closes(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(circuit.time, "monotonic", lambda: now[0])
+    cb = circuit.CircuitBreaker(failure_threshold=2, reset_seconds=10)
+
+    cb.before_call(); cb.record_failure()
+    assert cb.state == "closed"
+    cb.before_call(); cb.record_failure()
+    assert cb.state == "open"
+    with pytest.raises(CircuitOpenError):
+        cb.before_call()
+
+    now[0] += 10
+    cb.before_call()                      # the single half-open probe
+    assert cb.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        cb.before_call()                  # others still fail fast
+    cb.record_success()
+    assert cb.state == "closed" and cb.failures == 0
+
+
+def test_failed_probe_reopens(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(circuit.time, "monotonic", lambda: now[0])
+    cb = circuit.CircuitBreaker(failure_threshold=1, reset_seconds=5)
+    cb.record_failure()
+    now[0] = 5
+    cb.before_call()
+    cb.record_failure()
+    assert cb.state == "open" and cb.retry_in() == 5
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_open_circuit_stops_retries_and_fails_fast(fast):
+    route = respx.post("https://upstream.example/v1/timestamp/status/").mock(side_effect=httpx.ConnectError("down"))
+
+    with pytest.raises(TransientError):
+        await http_client.request("POST", "/v1/timestamp/status/", json={})
+    assert route.call_count == 2          # opened after 2, not max_retries=3
+    assert circuit.breaker().state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        await http_client.request("POST", "/v1/timestamp/status/", json={})
+    assert route.call_count == 2          # failed fast, nothing sent
+    await http_client.close_client()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_readiness_reports_circuit_state(fast, monkeypatch):
+    monkeypatch.setenv("MINIMA_API_HEALTH", "https://upstream.example/health")
+    monkeypatch.setenv("CIRCUIT_RESET_SECONDS", "30")
+    get_settings.cache_clear()
+    respx.get("https://upstream.example/health").mock(return_value=httpx.Response(200))
+    cb = circuit.breaker()
+    cb.record_failure(); cb.record_failure()
+
+    res = await check_readiness(ReadyRequest(api_key="k" * 8))
+    assert res.status == "down"
+    assert res.upstream_circuit == "open"
+    assert "circuit open" in res.summary
+    await http_client.close_client()
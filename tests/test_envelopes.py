@@ -0,0 +1,86 @@
+# tests/test_envelopes.py
+import pytest
+
+from integritas_mcp_server.models import (
+    STAMP_RESULT_KIND,
+    StampDataBatchResponse,
+    StampDataResponse,
+    ToolLink,
+    ToolResultEnvelopeV1,
+    VerifyDataBatchResponse,
+    VerifyDataResponse,
+)
+from integritas_mcp_server.services.envelopes import (
+    build_stamp_batch_envelope,
+    build_stamp_envelope,
+    build_verify_batch_envelope,
+    build_verify_envelope,
+)
+
+# Builders validate the envelope once and hand the instance to the response
+# model, instead of dumping it to a dict and validating it again.
+
+RAW = {
+    "requestId": "up-1", "status": "success",
+    "data": {"uid": "0xUID", "proofFile": {"download_url": "https://example.com/proof.json"}},
+}
+FIELDS = dict(
+    status="success", uid="0xUID", stamped_at="2025-09-02T07:38:03Z",
+    proof_url="https://example.com/proof.json", summary="Stamped", raw=RAW,
+)
+VERIFY_FIELDS = dict(
+    result="full match", block_number=7, txpow_id="0xTX", transactionid="t1",
+    matched_hash="ab" * 32, uid="0xUID", verification_url=None, summary="Verified",
+)
+
+
+def round_trip() -> StampDataResponse:
+    """The previous dump-and-revalidate construction, kept as the reference output."""
+    links = [
+        ToolLink(rel="proof", href=FIELDS["proof_url"], label="Download proof"),
+        ToolLink(rel="status", href="integritas://stamp/0xUID", label="Watch on-chain status"),
+    ]
+    env = ToolResultEnvelopeV1(
+        kind=STAMP_RESULT_KIND, status="finalized", summary="Stamped",
+        ids={"uid": "0xUID"}, timestamps={"stamped_at": FIELDS["stamped_at"]}, links=links,
+        data={k: FIELDS[k] for k in ("status", "uid", "stamped_at", "proof_url")} | {"raw": RAW},
+    )
+    return StampDataResponse(
+        requestId="r", summary="Stamped", structuredContent=env.model_dump(by_alias=True, exclude_none=True)
+    )
+
+
+@pytest.fixture
+def no_round_trip(monkeypatch):
+    def boom(*a, **k):
+        raise AssertionError("envelope was dumped or re-validated")
+    monkeypatch.setattr(ToolResultEnvelopeV1, "model_validate", classmethod(boom))
+    monkeypatch.setattr(ToolResultEnvelopeV1, "model_dump", boom)
+
+
+def test_builder_output_matches_round_trip():
+    pkg = build_stamp_envelope(**FIELDS)
+    res = StampDataResponse(requestId="r", summary=pkg["summary"], structuredContent=pkg["structuredContent"])
+    dump = lambda r: r.model_dump(by_alias=True, exclude_none=True)
+    assert dump(res) == dump(round_trip())
+
+
+@pytest.mark.parametrize("build, response, kwargs", [
+    (build_stamp_envelope, StampDataResponse, FIELDS),
+    (build_verify_envelope, VerifyDataResponse, VERIFY_FIELDS),
+    (build_stamp_batch_envelope, StampDataBatchResponse,
+     dict(items=[], counts={"finalized": 1}, summary="1 stamped")),
+    (build_verify_batch_envelope, VerifyDataBatchResponse,
+     dict(items=[], counts={"finalized": 2}, unique=1, summary="2 verified")),
+])
+def test_builders_pass_the_envelope_instance_through(no_round_trip, build, response, kwargs):
+    pkg = build(**kwargs)
+    env = pkg["structuredContent"]
+    assert type(env) is ToolResultEnvelopeV1
+    res = response(requestId="r", summary=pkg["summary"], structuredContent=env)
+    assert res.structuredContent is env
+
+
+def test_builder_keeps_raw_payload_by_reference(no_round_trip):
+    pkg = build_stamp_envelope(**FIELDS)
+    assert pkg["structuredContent"].data["raw"] is RAW
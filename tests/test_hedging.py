@@ -0,0 +1,92 @@
+# tests/test_hedging.py
+import asyncio
+
+import httpx
+import pytest
+import respx
+
+from integritas_mcp_server import hedging, http_client
+from integritas_mcp_server.config import get_settings
+
+STATUS = "https://upstream.example/v1/timestamp/status/"
+
+
+@pytest.fixture
+def hedge_on(monkeypatch):
+    monkeypatch.setenv("HEDGE_ENABLED", "true")
+    monkeypatch.setenv("HEDGE_MIN_DELAY_SECONDS", "0.01")
+    get_settings.cache_clear()
+
+
+def test_percentile_needs_enough_samples():
+    w = hedging.LatencyWindow()
+    for i in range(hedging.HEDGE_MIN_SAMPLES - 1):
+        w.add(i / 100)
+    assert w.percentile(95) is None
+    w.add(1.0)
+    assert w.percentile(95) == pytest.approx(0.18)
+    assert w.percentile(100) == 1.0
+
+
+def test_delay_is_clamped_and_off_by_default(hedge_on, monkeypatch):
+    for _ in range(hedging.HEDGE_MIN_SAMPLES):
+        hedging.observe("/x", 0.001)
+    assert hedging.hedge_delay("/x") == 0.01
+    assert hedging.hedge_delay("/unseen") is None
+    monkeypatch.setenv("HEDGE_ENABLED", "false")
+    get_settings.cache_clear()
+    assert hedging.hedge_delay("/x") is None
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_and_loser_is_cancelled():
+    calls = []
+
+    async def call():
+        n = len(calls)
+        calls.append(asyncio.current_task())
+        await asyncio.sleep(1.0 if n == 0 else 0.01)
+        return n
+
+    before = hedging.HEDGES_WON.value(endpoint="e")
+    assert await hedging.hedged(call, 0.02, "e") == 1
+    assert calls[0].cancelled()
+    assert hedging.HEDGES_WON.value(endpoint="e") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_fast_call_is_not_hedged():
+    async def call():
+        return "ok"
+
+    before = hedging.HEDGES_FIRED.value(endpoint="fast")
+    assert await hedging.hedged(call, 0.5, "fast") == "ok"
+    assert hedging.HEDGES_FIRED.value(endpoint="fast") == before
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_slow_status_poll_is_hedged(hedge_on):
+    for _ in range(hedging.HEDGE_MIN_SAMPLES):
+        hedging.observe("/v1/timestamp/status/", 0.001)
+    n = {"calls": 0}
+
+    async def upstream(request):
+        n["calls"] += 1
+        if n["calls"] == 1:
+            await asyncio.sleep(1.0)
+        return httpx.Response(200, json=[{"uid": str(n["calls"])}])
+
+    respx.post(STATUS).mock(side_effect=upstream)
+    before = hedging.HEDGES_FIRED.value(endpoint="/v1/timestamp/status/")
+    resp = await http_client.request("POST", STATUS, json={"uids": ["u"]})
+    assert resp.json() == [{"uid": "2"}]
+    assert hedging.HEDGES_FIRED.value(endpoint="/v1/timestamp/status/") == before + 1
+    await http_client.close_client()
+
+
+def test_only_in_memory_bodies_are_replayable():
+    assert http_client._replayable(None, None)
+    assert http_client._replayable({"file": ("p.json", b"{}", "application/json")}, None)
+    with open(__file__, "rb") as f:
+        assert not http_client._replayable({"file": ("p.json", f, "application/json")}, None)
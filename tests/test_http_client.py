@@ -0,0 +1,83 @@
+# tests/test_http_client.py
+import pytest
+import respx
+import httpx
+
+from integritas_mcp_server import http_client
+from integritas_mcp_server.config import get_settings
+from integritas_mcp_server.errors import TransientError
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_requests_share_one_pooled_client():
+    respx.get("https://upstream.example/v1/ping").mock(return_value=httpx.Response(200, json={"ok": True}))
+
+    first = http_client.get_client()
+    r1 = await http_client.request("GET", "/v1/ping")
+    r2 = await http_client.request("GET", "v1/ping")
+
+    assert r1.status_code == r2.status_code == 200
+    assert http_client.get_client() is first
+    await http_client.close_client()
+    assert http_client.get_client() is not first
+    await http_client.close_client()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_transport_errors_retry_then_raise_transient(monkeypatch):
+    monkeypatch.setenv("RETRY_POLICIES", '{"/v1/timestamp/status": {"base": 0, "cap": 0}}')
+    get_settings.cache_clear()
+    route = respx.post("https://upstream.example/v1/timestamp/status/").mock(
+        side_effect=httpx.ConnectError("boom")
+    )
+    before = http_client.UPSTREAM_RETRIES.value(method="POST", endpoint="/v1/timestamp/status/", reason="transport")
+
+    with pytest.raises(TransientError):
+        await http_client.post_json("/v1/timestamp/status/", json={"uids": []}, headers={})
+
+    # default max_retries = 3 total attempts
+    assert route.call_count == 3
+    after = http_client.UPSTREAM_RETRIES.value(method="POST", endpoint="/v1/timestamp/status/", reason="transport")
+    assert after - before == 2
+    await http_client.close_client()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_retry_disabled_sends_once():
+    route = respx.post("https://upstream.example/v1/timestamp/one-shot").mock(
+        side_effect=httpx.ConnectError("boom")
+    )
+    with pytest.raises(TransientError):
+        await http_client.request("POST", "/v1/timestamp/one-shot", json={"hash": "aa"}, retry=False)
+    assert route.call_count == 1
+    await http_client.close_client()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_file_url_downloads_bypass_upstream_guards(monkeypatch):
+    from integritas_mcp_server import circuit, ratelimit
+    from integritas_mcp_server.tracing import request_id_var
+    monkeypatch.setenv("CIRCUIT_FAILURE_THRESHOLD", "1")
+    get_settings.cache_clear()
+    respx.get("https://files.example/dead").mock(side_effect=httpx.ConnectError("boom"))
+    busy = respx.get("https://files.example/busy").mock(
+        return_value=httpx.Response(429, headers={"retry-after": "60"})
+    )
+    token = request_id_var.set("7")
+    try:
+        with pytest.raises(TransientError):
+            async with http_client.stream("GET", "https://files.example/dead", endpoint="download"):
+                pass
+        async with http_client.stream("GET", "https://files.example/busy", endpoint="download") as r:
+            assert r.status_code == 429
+    finally:
+        request_id_var.reset(token)
+
+    assert circuit.breaker().state == "closed" and circuit.breaker().failures == 0
+    assert ratelimit.bucket_for(None).reserve() == 0
+    assert "x-request-id" not in busy.calls.last.request.headers
+    await http_client.close_client()
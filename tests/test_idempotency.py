@@ -0,0 +1,62 @@
+# tests/test_idempotency.py
+import asyncio
+import pytest
+import respx
+import httpx
+
+from integritas_mcp_server.config import get_settings
+from integritas_mcp_server.models import StampDataRequest
+from integritas_mcp_server.services.stamp_data import stamp_data_complete
+
+ONE_SHOT = "https://upstream.example/v1/timestamp/one-shot"
+
+
+def ok_payload():
+    return {"requestId": "up-1", "status": "success", "data": {"uid": "0xUID"}}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_repeat_stamp_replays_first_result_per_api_key():
+    route = respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json=ok_payload()))
+
+    first = await stamp_data_complete(StampDataRequest(file_hash="0xABCD", api_key="k1"), "r1")
+    again = await stamp_data_complete(StampDataRequest(file_hash="abcd", api_key="k1"), "r2")
+    other = await stamp_data_complete(StampDataRequest(file_hash="abcd", api_key="k2"), "r3")
+
+    assert route.call_count == 2  # k1 once, k2 once
+    assert again == first
+    assert other.structuredContent.ids == {"uid": "0xUID"}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_concurrent_identical_stamps_share_one_call():
+    async def slow(request):
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, json=ok_payload())
+
+    route = respx.post(ONE_SHOT).mock(side_effect=slow)
+    results = await asyncio.gather(
+        *(stamp_data_complete(StampDataRequest(file_hash="ee", api_key="k"), f"r{i}") for i in range(5))
+    )
+    assert route.call_count == 1
+    assert {r.structuredContent.status for r in results} == {"finalized"}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_failures_are_not_remembered_and_window_zero_disables(monkeypatch):
+    route = respx.post(ONE_SHOT).mock(
+        side_effect=[httpx.Response(200, json={"status": "failed"}), httpx.Response(200, json=ok_payload())]
+    )
+    failed = await stamp_data_complete(StampDataRequest(file_hash="ff", api_key="k"), "r1")
+    ok = await stamp_data_complete(StampDataRequest(file_hash="ff", api_key="k"), "r2")
+    assert (failed.structuredContent.status, ok.structuredContent.status) == ("failed", "finalized")
+
+    monkeypatch.setenv("STAMP_IDEMPOTENCY_WINDOW_SECONDS", "0")
+    get_settings.cache_clear()
+    route.side_effect = None
+    route.return_value = httpx.Response(200, json=ok_payload())
+    await stamp_data_complete(StampDataRequest(file_hash="ff", api_key="k"), "r3")
+    assert route.call_count == 3
@@ -0,0 +1,97 @@
+# tests/test_logging_utils.py
+import json
+
+import pytest
+from pydantic import BaseModel
+from structlog.testing import capture_logs
+
+from integritas_mcp_server import logging_utils
+from integritas_mcp_server.config import get_settings
+from integritas_mcp_server.logging_utils import _safe_json, tool_logger
+
+
+class Req(BaseModel):
+    api_key: str | None = None
+    file_hash: str
+
+
+class Counted:
+    renders = 0
+
+    def __str__(self):
+        Counted.renders += 1
+        return "counted"
+
+
+def test_safe_json_stops_walking_at_the_limit():
+    seen = []
+
+    def items():
+        for i in range(100_000):
+            seen.append(i)
+            yield "x" * 10
+
+    out = _safe_json({"raw": items()}, limit=200)
+    assert len(out) <= 200 + 3
+    assert len(seen) < 30
+
+
+def test_safe_json_redacts_and_walks_models():
+    out = json.loads(_safe_json({"req": Req(api_key="secret", file_hash="ab")}))
+    assert out == {"req": {"api_key": "[REDACTED]", "file_hash": "ab"}}
+
+
+@pytest.mark.asyncio
+async def test_payloads_are_lazy():
+    @tool_logger
+    async def tool(req=None):
+        return {"value": Counted()}
+
+    Counted.renders = 0
+    with capture_logs() as logs:
+        await tool(req=Counted())
+    assert Counted.renders == 0  # nothing rendered the lines, so nothing was serialized
+    success = next(e for e in logs if e["event"] == "tool_success")
+    assert json.loads(success["result"].__structlog__()) == {"value": "counted"}
+    assert "duration_ms" in success and "log_overhead_ms" in success
+
+
+@pytest.mark.asyncio
+async def test_unsampled_calls_log_no_payloads(monkeypatch):
+    monkeypatch.setenv("TOOL_LOG_SAMPLE_RATE", "0")
+    get_settings.cache_clear()
+
+    @tool_logger
+    async def tool(req=None):
+        return "ok"
+
+    before = logging_utils.TOOL_LOG_SECONDS.samples()
+    with capture_logs() as logs:
+        assert await tool(req="x") == "ok"
+    assert [e["event"] for e in logs] == ["tool_start", "tool_success"]
+    assert all("kwargs" not in e and "result" not in e for e in logs)
+    assert logging_utils.TOOL_LOG_SECONDS.samples() != before
+
+
+def test_registered_tools_are_wrapped():
+    from integritas_mcp_server import stdio_app  # noqa: F401 (registers tools)
+    from integritas_mcp_server.core import mcp
+
+    tool = mcp._tool_manager.get_tool("stamp_data")
+    assert tool.fn.__wrapped__.__name__ == "stamp_data"
+    assert tool.context_kwarg == "ctx"
+
+
+def test_log_level_comes_from_settings(monkeypatch):
+    import logging
+    from types import SimpleNamespace
+
+    from integritas_mcp_server import config, logging_setup
+
+    monkeypatch.setenv("LOG_LEVEL", "warning")
+    get_settings.cache_clear()
+    assert logging_setup._level() == logging.WARNING
+
+    # a Settings value (.env, overrides) wins over the process env
+    monkeypatch.setattr(config, "get_settings", lambda: SimpleNamespace(log_level="ERROR"))
+    assert logging_setup._level() == logging.ERROR
@@ -7,3 +7,12 @@ def test_normalize_hex():
 def test_normalize_base64():
     # 0xdeadbeef
     assert normalize_hash("3q2+7w==") == "deadbeef"
+
+def test_sha3_256_file_matches_hashlib(tmp_path):
+    import hashlib
+    from integritas_mcp_server.utils.hash import sha3_256_file
+    body = b"integritas" * 1000
+    p = tmp_path / "blob.bin"
+    p.write_bytes(body)
+    # chunk smaller than the file exercises the incremental path
+    assert sha3_256_file(str(p), chunk_size=64) == hashlib.sha3_256(body).hexdigest()
@@ -0,0 +1,63 @@
+# tests/test_prometheus.py
+import pytest
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from integritas_mcp_server import metrics, prometheus
+from integritas_mcp_server.config import get_settings
+from integritas_mcp_server.core import mcp
+from integritas_mcp_server.instrumentation import TOOL_INFLIGHT, TOOL_LATENCY
+
+
+def _client() -> TestClient:
+    return TestClient(Starlette(routes=[prometheus.metrics_route]))
+
+
+def test_render_text_format():
+    c = metrics.counter("test_prom_events_total", "Test events.")
+    c.inc(2, kind='a"b')
+    h = metrics.histogram("test_prom_seconds", "Test latency.", buckets=(0.1, 1.0))
+    h.observe(0.5, endpoint="/x")
+    g = metrics.gauge("test_prom_pool", "Test pool.", lambda: {metrics.labels(state="idle"): 3})
+
+    text = prometheus.render()
+    assert "# TYPE test_prom_events_total counter" in text
+    assert 'test_prom_events_total{kind="a\\"b"} 2' in text
+    assert 'test_prom_seconds_bucket{endpoint="/x",le="0.1"} 0' in text
+    assert 'test_prom_seconds_bucket{endpoint="/x",le="1"} 1' in text
+    assert 'test_prom_seconds_bucket{endpoint="/x",le="+Inf"} 1' in text
+    assert 'test_prom_seconds_sum{endpoint="/x"} 0.5' in text
+    assert 'test_prom_pool{state="idle"} 3' in text
+    assert g.value(state="idle") == 3
+
+
+def test_metrics_endpoint_is_open_by_default():
+    r = _client().get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    for name in ("integritas_upstream_request_seconds", "integritas_upstream_retries_total",
+                 "integritas_tool_call_seconds", "integritas_upstream_pool_connections"):
+        assert f"# TYPE {name}" in r.text
+
+
+def test_metrics_token_guards_endpoint(monkeypatch):
+    monkeypatch.setenv("METRICS_TOKEN", "scrape-me")
+    get_settings.cache_clear()
+    c = _client()
+    assert c.get("/metrics").status_code == 401
+    assert c.get("/metrics", headers={"Authorization": "Bearer nope"}).status_code == 401
+    assert c.get("/metrics", headers={"Authorization": "Bearer scrape-me"}).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_are_timed():
+    @mcp.tool(name="test_metrics_echo")
+    async def echo(x: int) -> int:
+        assert TOOL_INFLIGHT.value(tool="test_metrics_echo") == 1
+        return x
+
+    before = TOOL_LATENCY.count(tool="test_metrics_echo", outcome="ok")
+    await mcp.call_tool("test_metrics_echo", {"x": 1})
+    assert TOOL_LATENCY.count(tool="test_metrics_echo", outcome="ok") == before + 1
+    assert TOOL_INFLIGHT.value(tool="test_metrics_echo") == 0
+    mcp.remove_tool("test_metrics_echo")
@@ -0,0 +1,78 @@
+# tests/test_ratelimit.py
+import asyncio
+import time
+
+import httpx
+import pytest
+import respx
+
+from integritas_mcp_server import http_client, ratelimit
+from integritas_mcp_server.config import get_settings
+
+
+def test_bucket_queues_past_burst_at_rate():
+    b = ratelimit.TokenBucket(rate=10.0, burst=2)
+    waits = [b.reserve() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.1, abs=0.01)
+    assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_pause_holds_bucket_and_forfeits_tokens():
+    b = ratelimit.TokenBucket(rate=10.0, burst=5)
+    b.pause(1.0)
+    assert b.reserve() == pytest.approx(1.1, abs=0.02)
+
+
+def test_parse_retry_after():
+    assert ratelimit.parse_retry_after("3") == 3.0
+    assert ratelimit.parse_retry_after(None) is None
+    assert ratelimit.parse_retry_after("soon") is None
+    assert ratelimit.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+@pytest.mark.asyncio
+async def test_buckets_are_per_api_key(monkeypatch):
+    monkeypatch.setenv("UPSTREAM_RATE_PER_SECOND", "20")
+    monkeypatch.setenv("UPSTREAM_RATE_BURST", "1")
+    get_settings.cache_clear()
+
+    start = time.monotonic()
+    await asyncio.gather(ratelimit.throttle("a"), ratelimit.throttle("b"))
+    assert time.monotonic() - start < 0.04       # separate buckets, no queueing
+    await asyncio.gather(ratelimit.throttle("a"), ratelimit.throttle("a"))
+    assert time.monotonic() - start >= 0.09      # two more on "a": queued at 20/s
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_429_honours_retry_after_then_retries():
+    route = respx.post("https://upstream.example/v1/timestamp/post").mock(
+        side_effect=[
+            httpx.Response(429, headers={"Retry-After": "0.2"}),
+            httpx.Response(200, json={"ok": True}),
+        ]
+    )
+    start = time.monotonic()
+    resp = await http_client.request(
+        "POST", "/v1/timestamp/post", json={"hash": "ab"}, headers={"x-api-key": "k"}, retry=False
+    )
+    assert resp.status_code == 200
+    assert route.call_count == 2
+    assert time.monotonic() - start >= 0.2
+    assert http_client.UPSTREAM_THROTTLED.value(endpoint="/v1/timestamp/post") >= 1
+    await http_client.close_client()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_429_with_long_retry_after_is_returned(monkeypatch):
+    monkeypatch.setenv("UPSTREAM_RETRY_AFTER_MAX_SECONDS", "1")
+    get_settings.cache_clear()
+    respx.get("https://upstream.example/v1/ping").mock(
+        return_value=httpx.Response(429, headers={"Retry-After": "120"})
+    )
+    resp = await http_client.request("GET", "/v1/ping", headers={"x-api-key": "k"})
+    assert resp.status_code == 429
+    assert ratelimit.bucket_for("k").paused_until > time.monotonic() + 100
+    await http_client.close_client()
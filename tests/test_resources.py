@@ -0,0 +1,86 @@
+# tests/test_resources.py
+import json
+
+import pytest
+from mcp import types
+from mcp.shared.memory import create_connected_server_and_client_session
+from pydantic import AnyUrl
+
+from integritas_mcp_server import resources
+from integritas_mcp_server.stdio_app import mcp
+
+
+async def _read(client, uri, if_none_match=None):
+    params = {"uri": AnyUrl(uri)}
+    if if_none_match is not None:
+        params["_meta"] = {"ifNoneMatch": if_none_match}
+    req = types.ClientRequest(types.ReadResourceRequest(params=types.ReadResourceRequestParams(**params)))
+    res = await client.send_request(req, types.ReadResourceResult)
+    return res.contents[0]
+
+
+@pytest.mark.asyncio
+async def test_tools_catalog_is_built_once(monkeypatch):
+    resources._DOCS.clear()
+    calls = []
+    render = resources._render_tools_markdown
+    monkeypatch.setattr(resources, "_render_tools_markdown", lambda: calls.append(1) or render())
+
+    async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+        first = await _read(client, "integritas://docs/tools")
+        second = await _read(client, "integritas://docs/tools")
+    assert len(calls) == 1
+    assert first.text == second.text and first.text.startswith("# Integritas MCP")
+    etag = first.meta["etag"]
+    assert etag.startswith('"') and second.meta == first.meta
+    assert first.meta["lastModified"] == resources._built_at()
+
+
+@pytest.mark.asyncio
+async def test_conditional_read_of_markdown():
+    async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+        full = await _read(client, "integritas://docs/faq")
+        same = await _read(client, "integritas://docs/faq", full.meta["etag"])
+        stale = await _read(client, "integritas://docs/faq", '"old"')
+    assert json.loads(same.text) == {**full.meta, "notModified": True}
+    assert same.meta["etag"] == full.meta["etag"]
+    assert stale.text == full.text
+
+
+@pytest.mark.asyncio
+async def test_schema_has_stable_etag_and_conditional_read():
+    async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+        doc = json.loads((await _read(client, "integritas://schema/stamp_input")).text)
+        again = json.loads((await _read(client, "integritas://schema/stamp_input")).text)
+        not_modified = json.loads((await _read(client, "integritas://schema/stamp_input", doc["etag"])).text)
+        missing = json.loads((await _read(client, "integritas://schema/nope")).text)
+    assert doc == again
+    assert doc["schema"] == resources.StampDataRequest.model_json_schema()
+    assert doc["lastModified"] == resources._built_at()
+    assert not_modified == {**{k: doc[k] for k in ("name", "etag", "lastModified")}, "notModified": True}
+    assert missing["error"]["code"] == "NOT_FOUND"
+
+
+@pytest.mark.asyncio
+async def test_meta_is_set_at_registration_and_not_modified_skips_the_build(monkeypatch):
+    resources._DOCS.clear()
+    monkeypatch.setattr(resources, "_render_tools_markdown", lambda: pytest.fail("should not build"))
+
+    async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+        listed = {str(r.uri): r.meta for r in (await client.list_resources()).resources}
+        etag = listed["integritas://docs/tools"]["etag"]
+        same = await _read(client, "integritas://docs/tools", etag)
+    assert listed["integritas://docs/tools"] == resources._meta("integritas://docs/tools")
+    assert json.loads(same.text) == {**resources._meta("integritas://docs/tools"), "notModified": True}
+    assert resources._DOCS == {}
+
+
+@pytest.mark.asyncio
+async def test_not_modified_marker_is_the_same_for_documents_and_schemas():
+    async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+        doc = await _read(client, "integritas://docs/faq")
+        schema = json.loads((await _read(client, "integritas://schema/stamp_input")).text)
+        doc_nm = json.loads((await _read(client, "integritas://docs/faq", doc.meta["etag"])).text)
+        schema_nm = json.loads((await _read(client, "integritas://schema/stamp_input", schema["etag"])).text)
+    assert doc_nm["notModified"] is True and schema_nm["notModified"] is True
+    assert doc_nm == {k: v for k, v in schema_nm.items() if k != "name"} | {"etag": doc.meta["etag"]}
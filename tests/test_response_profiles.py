@@ -0,0 +1,104 @@
+# tests/test_response_profiles.py
+import json
+
+import httpx
+import pytest
+import respx
+from mcp.shared.memory import create_connected_server_and_client_session
+from pydantic import AnyUrl
+
+from integritas_mcp_server import secrets
+from integritas_mcp_server.config import get_settings
+from integritas_mcp_server.models import StampDataBatchRequest, StampDataRequest
+from integritas_mcp_server.services.stamp_batch import stamp_data_batch_complete
+from integritas_mcp_server.services.stamp_data import stamp_data_complete
+from integritas_mcp_server.stdio_app import mcp
+
+ONE_SHOT = "https://upstream.example/v1/timestamp/one-shot"
+HASH = "ab" * 32
+
+
+def ok_payload():
+    return {
+        "requestId": "up-1", "status": "success", "big": "x" * 1000,
+        "data": {"uid": "0xUID", "proofFile": {"download_url": "https://example.com/proof.json"}},
+    }
+
+
+async def _stamp(profile=None):
+    return await stamp_data_complete(StampDataRequest(file_hash=HASH, api_key="k", response_profile=profile), "rid")
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_full_is_the_default():
+    respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json=ok_payload()))
+    env = (await _stamp()).structuredContent
+    assert env.data["raw"] == ok_payload()
+    assert "raw" not in [l.rel for l in env.links]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_compact_links_raw_payload_resource(monkeypatch):
+    respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json=ok_payload()))
+    res = await _stamp("compact")
+    env = res.structuredContent
+    assert "raw" not in env.data and env.data["uid"] == "0xUID"
+    href = str(next(l for l in env.links if l.rel == "raw").href)
+    assert href.startswith("integritas://raw/") and "up-1" not in href
+
+    async def read(uri):
+        get_settings.cache_clear()
+        secrets.reset_api_key_cache()
+        async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+            return json.loads((await client.read_resource(AnyUrl(uri))).contents[0].text)
+
+    monkeypatch.setenv("MINIMA_API_KEY", "k")
+    assert await read(href) == ok_payload()
+    assert (await read("integritas://raw/nope"))["error"]["code"] == "NOT_FOUND"
+    monkeypatch.setenv("MINIMA_API_KEY", "someone-else")
+    assert (await read(href))["error"]["code"] == "NOT_FOUND"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_raw_links_are_unique_per_result():
+    # the upstream requestId (and the MCP request id) repeat across calls and sessions
+    respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json=ok_payload()))
+    first = await stamp_data_complete(StampDataRequest(file_hash=HASH, api_key="a", response_profile="compact"), "1")
+    second = await stamp_data_complete(StampDataRequest(file_hash="cd" * 32, api_key="b", response_profile="compact"), "1")
+    hrefs = {str(l.href) for r in (first, second) for l in r.structuredContent.links if l.rel == "raw"}
+    assert len(hrefs) == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_ids_only_and_server_wide_setting(monkeypatch):
+    monkeypatch.setenv("RESPONSE_PROFILE", "ids-only")
+    get_settings.cache_clear()
+    respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json=ok_payload()))
+    res = await _stamp()
+    dumped = res.structuredContent.model_dump(by_alias=True, exclude_none=True)
+    assert set(dumped) == {"kind", "status", "ids", "links", "$schema"}
+    assert dumped["ids"] == {"uid": "0xUID"}
+    assert res.summary  # the human summary stays outside structuredContent
+
+    # a per-request profile overrides the server default; the replayed
+    # (idempotent) result was cached in full
+    full = await _stamp("full")
+    assert full.structuredContent.data["raw"] == ok_payload()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_batch_profile_applies_to_items():
+    respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json=ok_payload()))
+    req = StampDataBatchRequest(
+        items=[StampDataRequest(file_hash=HASH), StampDataRequest(file_hash="cd" * 32, response_profile="full")],
+        api_key="k",
+        response_profile="compact",
+    )
+    items = (await stamp_data_batch_complete(req, "b")).structuredContent.data["items"]
+    assert "raw" not in items[0]["result"]["data"]
+    assert "raw" in items[1]["result"]["data"]
@@ -0,0 +1,95 @@
+# tests/test_retry.py
+import httpx
+import pytest
+import respx
+
+from integritas_mcp_server import http_client, retry
+from integritas_mcp_server.config import get_settings
+from integritas_mcp_server.errors import TransientError
+
+ONE_SHOT = "https://upstream.example/v1/timestamp/one-shot"
+STATUS = "https://upstream.example/v1/timestamp/status/"
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setenv("RETRY_POLICIES", '{"/v1": {"base": 0, "cap": 0}}')
+    get_settings.cache_clear()
+
+
+def test_policy_resolution_and_overrides(monkeypatch):
+    monkeypatch.setenv("RETRY_POLICIES", '{"/v1/timestamp/status": {"attempts": 7, "statuses": [500]}}')
+    get_settings.cache_clear()
+    status = retry.policy_for("/v1/timestamp/status/", "POST")
+    assert status.attempts == 7 and status.statuses == frozenset({500}) and status.idempotent
+    assert not retry.policy_for("/v1/timestamp/one-shot", "POST").idempotent
+    assert retry.policy_for("/v2/other", "GET").idempotent
+    assert not retry.policy_for("/v2/other", "POST").idempotent
+
+
+def test_decorrelated_jitter_stays_within_bounds():
+    wait = retry.wait_decorrelated_jitter(retry.RetryPolicy(base=0.1, cap=1.0))
+
+    class RS:
+        outcome = None
+        upcoming_sleep = 0.0
+
+    rs = RS()
+    for _ in range(50):
+        d = wait(rs)
+        assert 0.1 <= d <= min(1.0, max(rs.upcoming_sleep, 0.1) * 3)
+        rs.upcoming_sleep = d
+
+
+def test_budget_limits_retries_to_a_ratio_of_requests():
+    b = retry.RetryBudget(ratio=0.5, floor=0.0)
+    b.tokens = 0.0
+    assert not b.withdraw()
+    b.deposit(); b.deposit()
+    assert b.withdraw() and not b.withdraw()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_one_shot_retried_only_with_idempotency_key():
+    route = respx.post(ONE_SHOT).mock(side_effect=httpx.ConnectError("boom"))
+    with pytest.raises(TransientError):
+        await http_client.request("POST", ONE_SHOT, json={"hash": "aa"})
+    assert route.call_count == 1
+
+    route.reset()
+    with pytest.raises(TransientError):
+        await http_client.request("POST", ONE_SHOT, json={"hash": "aa"}, idempotency_key="k:aa")
+    assert route.call_count == 3
+    assert route.calls.last.request.headers["Idempotency-Key"] == "k:aa"
+    await http_client.close_client()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_status_poll_retries_5xx_then_returns_last_response():
+    route = respx.post(STATUS).mock(
+        side_effect=[httpx.Response(503), httpx.Response(200, json=[{"uid": "u"}])]
+    )
+    resp = await http_client.request("POST", STATUS, json={"uids": ["u"]})
+    assert resp.status_code == 200 and route.call_count == 2
+
+    route.reset()
+    route.mock(side_effect=None, return_value=httpx.Response(502))
+    resp = await http_client.request("POST", STATUS, json={"uids": ["u"]})
+    assert resp.status_code == 502 and route.call_count == 3
+    await http_client.close_client()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_spent_budget_stops_retrying():
+    route = respx.post(STATUS).mock(side_effect=httpx.ConnectError("boom"))
+    b = retry.budget()
+    b.tokens, b.floor, b.ratio = 0.0, 0.0, 0.0
+    before = retry.RETRY_BUDGET_EXHAUSTED.value(endpoint="/v1/timestamp/status/")
+    with pytest.raises(TransientError):
+        await http_client.request("POST", STATUS, json={"uids": []})
+    assert route.call_count == 1
+    assert retry.RETRY_BUDGET_EXHAUSTED.value(endpoint="/v1/timestamp/status/") == before + 1
+    await http_client.close_client()
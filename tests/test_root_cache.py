@@ -0,0 +1,102 @@
+# tests/test_root_cache.py
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from integritas_mcp_server.services import root_cache as rc
+from integritas_mcp_server.services import verify_data
+from integritas_mcp_server.state import close_stores
+
+ROOT = b"\x11" * 32
+SAMPLE = Path(__file__).parent.parent / "test-proof-file.json"
+
+
+def _proof_file(data: bytes, root: bytes = b"\x0f" * 32):
+    doc = [{"address": "0xFFEEDD", "data": "0x" + data.hex(), "proof": "0x000100000100", "root": "0x" + root.hex().upper()}]
+    return json.dumps(doc).encode(), root
+
+
+def test_exact_and_root_level_lookups_persist():
+    rc.root_cache().put(ROOT, b"\xaa" * 32, {"block_number": 368, "txpow_id": "0xT", "summary": "ignored"})
+    close_stores()  # a fresh process sees the same rows
+
+    cache = rc.root_cache()
+    assert cache.get(ROOT, b"\xaa" * 32) == {"block_number": 368, "txpow_id": "0xT"}
+    assert cache.get(ROOT, b"\xbb" * 32) is None
+    assert cache.get(ROOT) == {"block_number": 368, "txpow_id": "0xT"}
+
+
+def test_ttl_and_lru_eviction(monkeypatch):
+    monkeypatch.setenv("KNOWN_ROOTS_MAX", "2")
+    cache = rc.root_cache()
+    for i in range(3):
+        cache.put(bytes([i]) * 32, b"\x00", {"block_number": i})
+        if i == 1:
+            cache.get(bytes([0]) * 32)  # touch the oldest so #1 is evicted instead
+    assert len(cache) == 2
+    assert cache.get(bytes([1]) * 32) is None
+    assert cache.get(bytes([0]) * 32) == {"block_number": 0}
+
+    now = time.time()
+    monkeypatch.setattr(rc.time, "time", lambda: now + cache.ttl_seconds + 1)
+    assert cache.get(bytes([2]) * 32) is None
+
+
+def test_proof_served_only_for_confirmed_root_and_data():
+    content, root = _proof_file(b"\xaa" * 32)
+    assert rc.lookup_proof(content) is None  # unknown -> upstream
+
+    assert rc.learn_proof(content, {"block_number": 368, "txpow_id": None}) == 1
+    hit = rc.lookup_proof(content)
+    assert hit is not None and hit.facts == {"block_number": 368}
+    assert hit.pairs == [(root, b"\xaa" * 32)]
+
+    # a known root does not vouch for other data under it
+    other, _ = _proof_file(b"\xab" * 32, root)
+    assert rc.lookup_proof(other) is None
+
+
+def test_repo_sample_proof_is_served_once_confirmed():
+    content = SAMPLE.read_bytes()
+    assert rc.lookup_proof(content) is None
+    rc.learn_proof(content, {"block_number": 1})
+    assert rc.lookup_proof(content).facts == {"block_number": 1}
+
+
+def test_non_proofs_are_misses():
+    for content in (b"not json", b"[]", b'[{"root": "0x11"}]', b'[{"root": "zz", "data": "0x11"}]'):
+        assert rc.proof_pairs(content) is None
+        assert rc.lookup_proof(content) is None
+    assert rc.learn_proof(b"not json") == 0
+
+
+@pytest.mark.asyncio
+async def test_verify_proof_bytes_skips_upstream_for_confirmed_proof(monkeypatch):
+    content, _ = _proof_file(b"\xbb" * 32)
+    rc.learn_proof(content, {"block_number": 5})
+
+    async def no_upstream(*a, **k):
+        raise AssertionError("upstream must not be called")
+
+    monkeypatch.setattr(verify_data, "post_multipart", no_upstream)
+    res = await verify_data.verify_proof_bytes(content, "rid", api_key="k")
+    assert res.structuredContent.status == "finalized"
+    assert res.summary.endswith("verified offline")
+
+
+def test_locked_cache_is_a_miss():
+    import sqlite3
+
+    content, _ = _proof_file(b"\xcc" * 32)
+    rc.learn_proof(content, {"block_number": 9})
+    other = sqlite3.connect(rc.root_cache().store.path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")  # another worker mid-write
+    try:
+        assert rc.lookup_proof(content) is None
+        assert rc.learn_proof(content, {"block_number": 9}) == 0
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+    assert rc.lookup_proof(content).facts == {"block_number": 9}
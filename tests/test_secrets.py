@@ -0,0 +1,94 @@
+# tests/test_secrets.py
+import threading
+
+import pytest
+
+from integritas_mcp_server import secrets
+from integritas_mcp_server.services.tool_helpers.api import build_headers
+
+
+@pytest.fixture
+def keyring_calls(monkeypatch):
+    calls = []
+    store = {}
+
+    def load():
+        calls.append(threading.current_thread())
+        return store.get("k")
+
+    monkeypatch.setattr(secrets, "load_api_key_keyring", load)
+    monkeypatch.setattr(secrets, "save_api_key_keyring", lambda k: store.__setitem__("k", k))
+    monkeypatch.setattr(secrets, "clear_api_key_keyring", lambda: store.pop("k", None))
+    monkeypatch.delenv("INTEGRITAS_API_KEY", raising=False)
+    monkeypatch.delenv("MINIMA_API_KEY", raising=False)
+    store["k"] = "from-keyring"
+    yield calls, store
+    secrets.clear_api_key_memory()
+
+
+@pytest.mark.asyncio
+async def test_keyring_read_once_and_off_the_loop(keyring_calls):
+    calls, _ = keyring_calls
+    for _ in range(3):
+        assert await build_headers(None, None) == {"x-api-key": "from-keyring"}
+    assert len(calls) == 1
+    assert calls[0] is not threading.main_thread()
+
+
+@pytest.mark.asyncio
+async def test_missing_key_is_cached_too(keyring_calls):
+    calls, store = keyring_calls
+    store.clear()
+    assert await build_headers(None, None) == {}
+    assert await build_headers(None, None) == {}
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_set_and_clear_invalidate(keyring_calls):
+    calls, _ = keyring_calls
+    assert await secrets.resolve_api_key_async() == "from-keyring"
+
+    secrets.set_api_key_memory("new-key")
+    assert await secrets.resolve_api_key_async() == "new-key"
+    assert len(calls) == 1  # set primes the cache
+
+    secrets.clear_api_key_memory()
+    secrets.clear_api_key_keyring()
+    assert await secrets.resolve_api_key_async() is None
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_other_worker_change_invalidates(keyring_calls):
+    calls, store = keyring_calls
+    assert await secrets.resolve_api_key_async() == "from-keyring"
+    store["k"] = "rotated"
+    assert await secrets.resolve_api_key_async() == "from-keyring"
+    secrets._bump_key_generation()  # set elsewhere
+    assert secrets.resolve_api_key() == "rotated"
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_generation_is_rechecked_on_a_ttl(keyring_calls, monkeypatch):
+    calls, store = keyring_calls
+    clock = [1000.0]
+    monkeypatch.setattr(secrets.time, "monotonic", lambda: clock[0])
+    reads = []
+    shared = secrets._shared
+    monkeypatch.setattr(secrets, "_shared", lambda: reads.append(1) or shared())
+
+    for _ in range(5):
+        assert await secrets.resolve_api_key_async() == "from-keyring"
+    assert len(reads) == 1  # one SQLite read for the whole TTL
+
+    # another worker rotates the key: bump the shared row behind our back
+    store["k"] = "rotated"
+    shared().execute(
+        "INSERT OR REPLACE INTO shared_kv (key, value) VALUES ('api_key_generation', '41')"
+    )
+    assert await secrets.resolve_api_key_async() == "from-keyring"
+    clock[0] += secrets.GENERATION_TTL_SECONDS
+    assert await secrets.resolve_api_key_async() == "rotated"
+    assert len(reads) == 2
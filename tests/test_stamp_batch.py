@@ -0,0 +1,57 @@
+# tests/test_stamp_batch.py
+import asyncio
+import pytest
+
+from integritas_mcp_server.models import StampDataBatchRequest, StampDataRequest
+from integritas_mcp_server.services import stamp_batch
+from integritas_mcp_server.services.stamp_data import _ok_response, _fail_response
+
+
+@pytest.mark.asyncio
+async def test_batch_bounded_concurrency_order_and_progress(monkeypatch):
+    in_flight = 0
+    peak = 0
+    seen_keys = []
+
+    async def fake_stamp(item, rid, api_key=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        seen_keys.append(item.api_key)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if item.file_hash == "bad":
+            return _fail_response(request_id=rid, human="Stamp failed.")
+        return _ok_response(request_id=rid, fields={"status": "finalized", "uid": item.file_hash})
+
+    monkeypatch.setattr(stamp_batch, "stamp_data_complete", fake_stamp)
+    progress = []
+
+    async def on_progress(done, total):
+        progress.append((done, total))
+
+    hashes = [f"{i:02x}" for i in range(9)] + ["bad"]
+    req = StampDataBatchRequest(
+        items=[StampDataRequest(file_hash=h) for h in hashes], concurrency=3, api_key="batch-key"
+    )
+    res = await stamp_batch.stamp_data_batch_complete(req, "rid", progress=on_progress)
+
+    env = res.structuredContent
+    assert peak == 3
+    assert set(seen_keys) == {"batch-key"}
+    assert progress[-1] == (10, 10) and len(progress) == 10
+    assert env.kind == "integritas/stamp_batch_result@v1"
+    assert env.status == "failed"
+    assert env.data["counts"] == {"finalized": 9, "failed": 1}
+    assert [it["index"] for it in env.data["items"]] == list(range(10))
+    assert env.data["items"][3]["result"]["ids"]["uid"] == "03"
+    assert res.summary == "Stamped 9/10 · 1 failed"
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_more_than_max_items(monkeypatch):
+    monkeypatch.setenv("STAMP_BATCH_MAX_ITEMS", "2")
+    req = StampDataBatchRequest(items=[StampDataRequest(file_hash="aa")] * 3)
+    res = await stamp_batch.stamp_data_batch_complete(req, "rid")
+    assert res.structuredContent.status == "failed"
+    assert "too large" in res.summary
@@ -0,0 +1,102 @@
+# tests/test_stamp_data.py
+import hashlib
+import json
+import pytest
+import respx
+import httpx
+
+from integritas_mcp_server.models import StampDataRequest
+from integritas_mcp_server.services.stamp_data import stamp_data_complete
+
+ONE_SHOT = "https://upstream.example/v1/timestamp/one-shot"
+
+def ok_payload():
+    return {
+        "requestId": "up-1", "status": "success",
+        "data": {"uid": "0xUID", "proofFile": {"download_url": "https://example.com/proof.json"}},
+    }
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_file_path_hashed_locally_sends_only_hash(tmp_path):
+    body = b"a" * 4096
+    p = tmp_path / "big.bin"
+    p.write_bytes(body)
+    route = respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json=ok_payload()))
+
+    res = await stamp_data_complete(StampDataRequest(file_path=str(p), hash_locally=True, api_key="k"), "rid")
+
+    assert res.structuredContent.status == "finalized"
+    sent = route.calls.last.request
+    assert sent.headers["content-type"] == "application/json"
+    assert json.loads(sent.content) == {"hash": hashlib.sha3_256(body).hexdigest()}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_small_file_path_is_uploaded_by_default(tmp_path):
+    p = tmp_path / "small.bin"
+    p.write_bytes(b"tiny")
+    route = respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json=ok_payload()))
+
+    await stamp_data_complete(StampDataRequest(file_path=str(p), api_key="k"), "rid")
+
+    assert route.calls.last.request.headers["content-type"].startswith("multipart/form-data")
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_file_path_above_threshold_is_hashed(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOCAL_HASH_THRESHOLD_BYTES", "8")
+    p = tmp_path / "over.bin"
+    p.write_bytes(b"more than eight bytes")
+    route = respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json=ok_payload()))
+
+    await stamp_data_complete(StampDataRequest(file_path=str(p), api_key="k"), "rid")
+
+    assert "hash" in json.loads(route.calls.last.request.content)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_file_url_streamed_into_local_hash():
+    body = b"b" * 10_000
+    respx.get("https://files.example/blob").mock(return_value=httpx.Response(200, content=body))
+    route = respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json=ok_payload()))
+
+    await stamp_data_complete(
+        StampDataRequest(file_url="https://files.example/blob", hash_locally=True, api_key="k"), "rid"
+    )
+
+    assert json.loads(route.calls.last.request.content) == {"hash": hashlib.sha3_256(body).hexdigest()}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_file_url_relayed_as_multipart_upload():
+    body = b"c" * 10_000
+    respx.get("https://files.example/blob").mock(return_value=httpx.Response(200, content=body))
+    route = respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json=ok_payload()))
+
+    res = await stamp_data_complete(StampDataRequest(file_url="https://files.example/blob", api_key="k"), "rid")
+
+    assert res.structuredContent.status == "finalized"
+    sent = route.calls.last.request
+    assert sent.headers["content-type"].startswith("multipart/form-data; boundary=")
+    assert body in sent.content
+    assert int(sent.headers["content-length"]) == len(sent.content)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_file_url_over_max_size_is_rejected(monkeypatch):
+    monkeypatch.setenv("MAX_DOWNLOAD_BYTES", "100")
+    respx.get("https://files.example/blob").mock(return_value=httpx.Response(200, content=b"d" * 101))
+    route = respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json=ok_payload()))
+
+    res = await stamp_data_complete(StampDataRequest(file_url="https://files.example/blob", api_key="k"), "rid")
+
+    assert res.structuredContent.status == "failed"
+    assert "maximum size" in res.summary
+    assert not route.called
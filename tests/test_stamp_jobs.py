@@ -0,0 +1,212 @@
+# tests/test_stamp_jobs.py
+import asyncio
+import pytest
+import respx
+import httpx
+
+from integritas_mcp_server import secrets
+from integritas_mcp_server.config import get_settings
+from integritas_mcp_server.models import StampDataRequest, StampJobStatusRequest
+from integritas_mcp_server.services import stamp_jobs
+from integritas_mcp_server.services.stamp_data import stamp_data_complete
+from integritas_mcp_server.state import close_stores
+
+ONE_SHOT = "https://upstream.example/v1/timestamp/one-shot"
+
+
+def ok_payload():
+    return {"requestId": "up-1", "status": "success", "data": {"uid": "0xUID"}}
+
+
+@pytest.fixture(autouse=True)
+def job_keyring(monkeypatch):
+    store = {}
+    monkeypatch.setattr(secrets, "save_job_key", lambda job_id, k: store.__setitem__(job_id, k))
+    monkeypatch.setattr(secrets, "load_job_key", lambda job_id: store.get(job_id))
+    monkeypatch.setattr(secrets, "clear_job_key", lambda job_id: store.pop(job_id, None))
+    monkeypatch.setattr(secrets, "load_api_key_keyring", lambda: None)
+    return store
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_stamp_returns_job_then_worker_completes_it():
+    route = respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json=ok_payload()))
+
+    queued = await stamp_data_complete(StampDataRequest(file_hash="aa", async_job=True, api_key="k"), "rid")
+    job_id = queued.structuredContent.ids["job_id"]
+    assert queued.structuredContent.kind == "integritas/stamp_job@v1"
+    assert queued.structuredContent.status == "pending"
+    assert route.call_count == 0
+
+    close_stores()  # the queue is on disk: a restarted process still sees the job
+    job = stamp_jobs.claim()
+    assert job["id"] == job_id
+    assert await stamp_jobs.run_job(job) == "done"
+
+    status = stamp_jobs.stamp_job_status(StampJobStatusRequest(job_id=job_id))
+    env = status.structuredContent
+    assert env.status == "finalized"
+    assert env.ids == {"job_id": job_id, "uid": "0xUID"}
+    assert route.calls.last.request.headers["x-api-key"] == "k"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_failed_jobs_retry_with_backoff_then_fail(monkeypatch):
+    monkeypatch.setenv("STAMP_JOB_MAX_ATTEMPTS", "2")
+    respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json={"status": "failed"}))
+    job_id = stamp_jobs.enqueue(StampDataRequest(file_hash="bb", api_key="k"))
+
+    assert await stamp_jobs.run_job(stamp_jobs.claim()) == "queued"
+    assert stamp_jobs.claim() is None  # backing off
+    monkeypatch.setattr(stamp_jobs, "RETRY_BASE_SECONDS", 0.0)
+    stamp_jobs._finish(job_id, "queued", None, None, not_before=0)
+    assert await stamp_jobs.run_job(stamp_jobs.claim()) == "failed"
+
+    env = stamp_jobs.stamp_job_status(StampJobStatusRequest(job_id=job_id)).structuredContent
+    assert env.status == "failed" and env.data["attempts"] == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_worker_pool_drains_a_burst(monkeypatch):
+    monkeypatch.setenv("STAMP_JOB_WORKERS", "3")
+    monkeypatch.setenv("STAMP_JOB_RATE_PER_SECOND", "0")
+    route = respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json=ok_payload()))
+    ids = [stamp_jobs.enqueue(StampDataRequest(file_hash=f"{i:04x}", api_key="k")) for i in range(12)]
+
+    await stamp_jobs.start_workers()
+    try:
+        for _ in range(200):
+            if all(stamp_jobs.get_job(i)["state"] == "done" for i in ids):
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await stamp_jobs.stop_workers()
+
+    assert {stamp_jobs.get_job(i)["state"] for i in ids} == {"done"}
+    assert route.call_count == 12
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_api_key_is_not_written_to_the_queue(job_keyring, monkeypatch):
+    route = respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json=ok_payload()))
+    queued = await stamp_data_complete(
+        StampDataRequest(file_hash="cc", async_job=True, api_key="caller-secret"), "rid"
+    )
+    job_id = queued.structuredContent.ids["job_id"]
+    row = stamp_jobs._store().query_one("SELECT * FROM stamp_jobs WHERE id = ?", (job_id,))
+    assert "caller-secret" not in repr(tuple(row))
+    assert job_keyring == {job_id: "caller-secret"}
+
+    assert await stamp_jobs.run_job(stamp_jobs.claim()) == "done"
+    assert route.calls.last.request.headers["x-api-key"] == "caller-secret"
+    assert job_keyring == {}  # wiped once the job finished
+
+    # the server's own key is resolved when the job runs, not stored at all
+    monkeypatch.setenv("MINIMA_API_KEY", "server-key")
+    get_settings.cache_clear()
+    secrets.reset_api_key_cache()
+    stamp_jobs.enqueue(StampDataRequest(file_hash="dd", api_key="server-key"))
+    assert job_keyring == {} and stamp_jobs.claim()["key_ref"] is None
+
+
+@pytest.mark.asyncio
+async def test_lost_job_key_fails_instead_of_using_server_key(job_keyring, monkeypatch):
+    monkeypatch.setenv("MINIMA_API_KEY", "server-key")
+    get_settings.cache_clear()
+    job_id = stamp_jobs.enqueue(StampDataRequest(file_hash="ee", api_key="caller"))
+    job_keyring.clear()
+    assert await stamp_jobs.run_job(stamp_jobs.claim()) == "failed"
+    assert "no longer available" in stamp_jobs.get_job(job_id)["error"]
+
+
+@pytest.mark.asyncio
+async def test_permanent_errors_fail_without_retries(tmp_path):
+    missing = stamp_jobs.enqueue(StampDataRequest(file_path=str(tmp_path / "gone.bin"), api_key="k"))
+    assert await stamp_jobs.run_job(stamp_jobs.claim()) == "failed"
+    no_key = stamp_jobs.enqueue(StampDataRequest(file_hash="ff"))
+    assert await stamp_jobs.run_job(stamp_jobs.claim()) == "failed"
+
+    assert stamp_jobs.get_job(missing)["attempts"] == 1
+    assert "not found" in stamp_jobs.get_job(missing)["error"]
+    assert "No API key" in stamp_jobs.get_job(no_key)["error"]
+
+
+@pytest.mark.asyncio
+async def test_lease_is_renewed_while_a_job_runs(monkeypatch):
+    from integritas_mcp_server.services import stamp_data
+
+    monkeypatch.setattr(stamp_jobs, "LEASE_SECONDS", 0.1)
+    monkeypatch.setattr(stamp_jobs, "LEASE_RENEW_SECONDS", 0.02)
+    stolen = []
+    real = stamp_data.stamp_data_complete
+
+    async def slow_upload(req, rid, **kw):
+        for _ in range(5):  # well past the original lease
+            await asyncio.sleep(0.05)
+            stolen.append(stamp_jobs.claim())
+        return await real(req, rid, **kw)
+
+    monkeypatch.setattr(stamp_data, "stamp_data_complete", slow_upload)
+    with respx.mock:
+        respx.post(ONE_SHOT).mock(return_value=httpx.Response(200, json=ok_payload()))
+        stamp_jobs.enqueue(StampDataRequest(file_hash="ab", api_key="k"))
+        assert await stamp_jobs.run_job(stamp_jobs.claim()) == "done"
+    assert stolen == [None] * 5
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_a_crashing_job(monkeypatch):
+    monkeypatch.setenv("STAMP_JOB_WORKERS", "1")
+    monkeypatch.setenv("STAMP_JOB_RATE_PER_SECOND", "0")
+    seen = []
+
+    async def run_job(job):
+        seen.append(job["id"])
+        if len(seen) == 1:
+            raise RuntimeError("database is locked")
+        stamp_jobs._finish(job["id"], "done", None, None)
+        return "done"
+
+    monkeypatch.setattr(stamp_jobs, "run_job", run_job)
+    first = stamp_jobs.enqueue(StampDataRequest(file_hash="01", api_key="k"))
+    second = stamp_jobs.enqueue(StampDataRequest(file_hash="02", api_key="k"))
+    await stamp_jobs.start_workers()
+    try:
+        for _ in range(200):
+            if stamp_jobs.get_job(second)["state"] == "done":
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await stamp_jobs.stop_workers()
+
+    assert seen[:2] == [first, second]
+    assert stamp_jobs.get_job(second)["state"] == "done"
+    assert stamp_jobs.get_job(first)["state"] == "running"  # re-claimed after its lease
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_file_job_retries_are_idempotent(monkeypatch, tmp_path):
+    monkeypatch.setattr(stamp_jobs, "RETRY_BASE_SECONDS", 0.0)
+    monkeypatch.setenv("MINIMA_API_KEY", "server-key")  # server-key job: nothing to forget when it ends
+    get_settings.cache_clear()
+    f = tmp_path / "doc.bin"
+    f.write_bytes(b"x" * 64)
+    route = respx.post(ONE_SHOT).mock(
+        side_effect=[httpx.ReadTimeout("lost answer"), httpx.Response(200, json=ok_payload())]
+    )
+    job_id = stamp_jobs.enqueue(StampDataRequest(file_path=str(f), hash_locally=False))
+
+    assert await stamp_jobs.run_job(stamp_jobs.claim()) == "queued"  # the upload may have landed
+    assert await stamp_jobs.run_job(stamp_jobs.claim()) == "done"
+    keys = [c.request.headers.get("idempotency-key") for c in route.calls]
+    assert keys == [f"job:{job_id}"] * 2
+
+    # run again after success (e.g. the lease expired before it was recorded): replayed, not re-uploaded
+    stamp_jobs._finish(job_id, "queued", None, None, not_before=0)
+    assert await stamp_jobs.run_job(stamp_jobs.claim()) == "done"
+    assert route.call_count == 2
@@ -0,0 +1,71 @@
+# tests/test_startup.py
+import json
+import os
+import subprocess
+import sys
+from typing import Optional
+
+# Cold start of the stdio server (see scripts/bench_startup.py). The MCP SDK
+# and structlog are imported first, so the -X importtime budget below only
+# covers what this package adds on top of them.
+
+IMPORT_BUDGET_US = 400_000
+
+# Loaded on the first tool call that needs them, never at startup (import or
+# the FastMCP lifespan, which runs before `initialize` is answered).
+LAZY = [
+    "keyring",
+    "tenacity",
+    "integritas_mcp_server.http_client",
+    "integritas_mcp_server.services.stamp_data",
+    "integritas_mcp_server.services.verify_data",
+    "integritas_mcp_server.services.root_cache",
+    "integritas_mcp_server.services.stamp_jobs",
+]
+
+PROBE = "import mcp.server.fastmcp, structlog; import integritas_mcp_server.stdio_app"
+
+LIFESPAN = """
+import asyncio, json, sys
+from integritas_mcp_server.stdio_app import mcp
+
+async def main():
+    async with mcp.settings.lifespan(mcp):
+        print(json.dumps(sorted(sys.modules)))
+        await mcp.call_tool("health", {})
+        from integritas_mcp_server.services import stamp_jobs
+        print(json.dumps(len(stamp_jobs._tasks)))
+    print(json.dumps(len(stamp_jobs._tasks)))
+
+asyncio.run(main())
+"""
+
+
+def _run(*args: str, env: Optional[dict] = None) -> subprocess.CompletedProcess:
+    env = {**os.environ, "MCP_ACCESS_TOKEN": "x", "MINIMA_API_BASE": "https://upstream.example", **(env or {})}
+    return subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, check=True)
+
+
+def test_stdio_startup_defers_services_and_http_stack():
+    out = _run("-c", PROBE + "; import sys, json; print(json.dumps(sorted(sys.modules)))")
+    loaded = set(json.loads(out.stdout.splitlines()[-1]))
+    assert "integritas_mcp_server.tools" in loaded
+    assert [m for m in LAZY if m in loaded] == []
+
+
+def test_lifespan_defers_client_keyring_and_workers_to_first_tool_call(tmp_path):
+    out = _run("-c", LIFESPAN, env={"STATE_DIR": str(tmp_path), "STAMP_JOB_WORKERS": "2"})
+    before, workers, after = (json.loads(line) for line in out.stdout.splitlines()[-3:])
+    assert [m for m in LAZY if m in before] == []
+    assert workers == 2 and after == 0  # started by the first call, stopped on exit
+
+
+def test_stdio_import_time_budget():
+    err = _run("-X", "importtime", "-c", PROBE).stderr
+    cumulative = {
+        parts[2].strip(): int(parts[1])
+        for parts in (line.split("|") for line in err.splitlines() if line.startswith("import time:"))
+        if len(parts) == 3 and parts[1].strip().isdigit()
+    }
+    spent = cumulative["integritas_mcp_server.stdio_app"]
+    assert spent < IMPORT_BUDGET_US, f"stdio_app import took {spent / 1000:.0f} ms"
@@ -0,0 +1,109 @@
+# tests/test_status_poller.py
+import asyncio
+import json
+import pytest
+import respx
+import httpx
+
+from integritas_mcp_server.models import StampStatusRequest, StampStatusResultPending, StampStatusResultSuccess
+from integritas_mcp_server.services import stamp_status
+from integritas_mcp_server.services.status_poller import StatusPoller, _Watch, _parse_ts
+
+STATUS = "https://upstream.example/v1/timestamp/status/"
+
+
+def _item(uid, onchain):
+    item = {"status": True, "uid": uid, "data": "0xAA", "number": 1, "datecreated": "2025-09-02 07:37:15", "onchain": onchain}
+    if onchain:
+        item.update(datestamped="2025-09-02 07:38:03", root="0xR", proof="0x00", address="0xFFEEDD")
+    return item
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_concurrent_callers_share_rounds_and_only_unresolved_uids_are_sent(monkeypatch):
+    monkeypatch.setattr(stamp_status, "POLLING_INTERVAL_SECONDS", 0.01)
+    sent = []
+    landed = {"A": 1, "B": 2, "C": 3}  # round in which each uid lands on chain
+
+    def respond(request):
+        uids = json.loads(request.content)["uids"]
+        sent.append(sorted(uids))
+        return httpx.Response(200, json={"data": [_item(u, landed[u] <= len(sent)) for u in uids]})
+
+    respx.post(STATUS).mock(side_effect=respond)
+    r1, r2 = await asyncio.gather(
+        stamp_status.get_definitive_stamp_status(StampStatusRequest(uids=["A", "B"])),
+        stamp_status.get_definitive_stamp_status(StampStatusRequest(uids=["B", "C"])),
+    )
+
+    assert sent == [["A", "B", "C"], ["B", "C"], ["C"]]
+    assert all(isinstance(r, StampStatusResultSuccess) for r in r1 + r2)
+    assert [r.uid for r in r2] == ["B", "C"]
+
+
+@pytest.mark.asyncio
+async def test_delay_follows_observed_confirmation_time(monkeypatch):
+    poller = StatusPoller(fetch=None)  # type: ignore[arg-type]
+    poller._observe(_item("A", True))  # 48s from creation to stamp
+    assert poller.confirm_seconds == 48
+
+    fut = asyncio.get_running_loop().create_future()
+    w = _Watch("B", None, 6, 1.0, fut, last=_item("B", False))
+    poller._watches.append(w)
+    created = _parse_ts(w.last["datecreated"])
+
+    monkeypatch.setattr("integritas_mcp_server.services.status_poller.time.time", lambda: created + 8)
+    assert poller._next_delay() == pytest.approx(40)  # fresh: wait for expected confirmation
+    monkeypatch.setattr("integritas_mcp_server.services.status_poller.time.time", lambda: created + 600)
+    assert poller._next_delay() == 1.0  # overdue: base interval
+
+
+@pytest.mark.asyncio
+async def test_staggered_callers_join_scheduled_rounds():
+    calls = []
+
+    async def fetch(uids, api_key):
+        calls.append(list(uids))
+        return [_item(u, False) for u in uids]
+
+    poller = StatusPoller(fetch=fetch)
+    futures = []
+    for i in range(10):  # a new caller every 20ms, polling interval 200ms
+        futures.append(poller.watch(f"U{i}", None, max_attempts=3, interval=0.2))
+        await asyncio.sleep(0.02)
+    outcomes = await asyncio.gather(*futures)
+    await poller.stop()
+
+    assert all(o.state == "pending" for o in outcomes)
+    polled = [u for c in calls for u in c]
+    assert {polled.count(f"U{i}") for i in range(10)} == {3}  # each watch charged its own rounds only
+    assert len(calls) == 4  # rounds at ~0, 0.2, 0.4, 0.6s; arrivals add none
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_no_wait_answers_at_once_and_rounds_get_their_own_request_id(monkeypatch):
+    monkeypatch.setattr(stamp_status, "POLLING_INTERVAL_SECONDS", 30)
+    sent = []
+
+    def respond(request):
+        uids = json.loads(request.content)["uids"]
+        sent.append((uids, request.headers["x-request-id"]))
+        return httpx.Response(200, json={"data": [_item(u, u == "B") for u in uids]})
+
+    respx.post(STATUS).mock(side_effect=respond)
+    waiting = asyncio.ensure_future(stamp_status.get_definitive_stamp_status(StampStatusRequest(uids=["A"])))
+    await asyncio.sleep(0.05)  # first round done; the next is 30s away
+    assert len(sent) == 1
+
+    # a watched uid comes from the last poll; an unwatched one is looked up now
+    [a, b] = await asyncio.wait_for(
+        stamp_status.get_definitive_stamp_status(StampStatusRequest(uids=["A", "B"], wait=False), "call-1"), 1
+    )
+    assert isinstance(a, StampStatusResultPending) and isinstance(b, StampStatusResultSuccess)
+    assert sent[1] == (["B"], "call-1")
+
+    waiting.cancel()
+    await stamp_status.stop_poller()
+    assert sent[0][1].startswith("integritas-poll-")
@@ -0,0 +1,140 @@
+# tests/test_subscriptions.py
+import asyncio
+import json
+import pytest
+import respx
+import httpx
+from mcp import types
+from mcp.shared.memory import create_connected_server_and_client_session
+from pydantic import AnyUrl
+
+from integritas_mcp_server.stdio_app import mcp
+from integritas_mcp_server.config import get_settings
+from integritas_mcp_server import subscriptions
+from integritas_mcp_server.services import stamp_status
+
+STATUS = "https://upstream.example/v1/timestamp/status/"
+URI = AnyUrl("integritas://stamp/0xU1")
+
+
+def _item(onchain):
+    item = {"status": True, "uid": "0xU1", "data": "0xAA", "number": 1, "datecreated": "2025-09-02 07:37:15", "onchain": onchain}
+    if onchain:
+        item.update(datestamped="2025-09-02 07:38:03", root="0xR", proof="0x00", address="0xFFEEDD")
+    return item
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_subscribe_pushes_update_when_uid_lands_on_chain(monkeypatch):
+    monkeypatch.setattr(stamp_status, "POLLING_INTERVAL_SECONDS", 0.01)
+    async def resolve():
+        return "k"
+
+    monkeypatch.setattr(subscriptions, "resolve_api_key_async", resolve)
+    route = respx.post(STATUS).mock(side_effect=[
+        httpx.Response(200, json={"data": [_item(False)]}),
+        httpx.Response(200, json={"data": [_item(True)]}),
+    ])
+    updated = asyncio.Event()
+
+    async def on_message(msg):
+        if isinstance(msg, types.ServerNotification) and isinstance(msg.root, types.ResourceUpdatedNotification):
+            assert str(msg.root.params.uri) == str(URI)
+            updated.set()
+
+    async with create_connected_server_and_client_session(mcp._mcp_server, message_handler=on_message) as client:
+        await client.subscribe_resource(URI)
+        await asyncio.wait_for(updated.wait(), timeout=2)
+        body = json.loads((await client.read_resource(URI)).contents[0].text)
+
+    assert body["state"] == "onchain" and body["item"]["root"] == "0xR"
+    assert route.call_count == 2
+    assert route.calls.last.request.headers["x-api-key"] == "k"
+
+
+class FakeSession:
+    def __init__(self):
+        self.updates = []
+
+    async def send_resource_updated(self, uri):
+        self.updates.append(str(uri))
+
+
+class FakePoller:
+    def __init__(self):
+        self.futures = []
+
+    def watch(self, uid, api_key, **kw):
+        fut = asyncio.get_running_loop().create_future()
+        self.futures.append((uid, api_key, fut))
+        return fut
+
+
+@pytest.fixture
+def poller(monkeypatch):
+    fake = FakePoller()
+    monkeypatch.setattr(stamp_status, "get_poller", lambda: fake)
+    monkeypatch.setattr(subscriptions, "_subscribers", {})
+    monkeypatch.setattr(subscriptions, "_watches", {})
+    monkeypatch.setattr(subscriptions, "_last", {})
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_watches_are_per_api_key(poller):
+    a, b = FakeSession(), FakeSession()
+    await subscriptions.watch_uid("0xU1", a, api_key="key-a")
+    await subscriptions.watch_uid("0xU1", b, api_key="key-b")
+    assert [(u, k) for u, k, _ in poller.futures] == [("0xU1", "key-a"), ("0xU1", "key-b")]
+
+    poller.futures[0][2].set_result(subscriptions.PollOutcome("done", _item(True)))
+    await asyncio.sleep(0.01)
+    assert a.updates == [str(URI)] and b.updates == []
+    assert subscriptions._state("0xU1", "key-a")["state"] == "onchain"
+    assert subscriptions._state("0xU1", "key-b") == {"uid": "0xU1", "state": "watching", "subscribed": True, "item": None}
+
+
+@pytest.mark.asyncio
+async def test_stale_watch_outcome_keeps_a_newer_subscription(poller):
+    first, second = FakeSession(), FakeSession()
+    await subscriptions.watch_uid("0xU1", first, api_key="k")
+    subscriptions.unwatch_uid("0xU1", first)  # cancels; its callback runs later
+    await subscriptions.watch_uid("0xU1", second, api_key="k")
+    await asyncio.sleep(0)
+
+    [k] = subscriptions._watches
+    assert subscriptions._watches[k] is poller.futures[1][2]
+    assert subscriptions._subscribers[k] == {second}
+
+
+@pytest.mark.asyncio
+async def test_results_expire(poller, monkeypatch):
+    monkeypatch.setattr(subscriptions, "RESULT_TTL_SECONDS", 0.0)
+    for uid in ("0xU1", "0xU2"):
+        await subscriptions.watch_uid(uid, FakeSession(), api_key="k")
+    for _, _, fut in poller.futures:
+        fut.set_result(subscriptions.PollOutcome("done", _item(True)))
+    await asyncio.sleep(0.01)
+    assert len(subscriptions._last) == 1  # the earlier result was swept
+    assert subscriptions._state("0xU2", "k")["state"] == "unknown"
+
+
+@pytest.mark.asyncio
+async def test_subscribe_capability_is_advertised():
+    async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+        caps = client.get_server_capabilities()
+    assert caps.resources.subscribe is True
+    assert caps.experimental["integritas/resourceSubscriptions"] == {"uriTemplates": [subscriptions.STAMP_URI]}
+    # the SDK's own capability builder is left alone
+    assert subscriptions._server.get_capabilities.__func__ is type(subscriptions._server).get_capabilities
+
+
+@pytest.mark.asyncio
+async def test_stateless_http_does_not_advertise_subscriptions(monkeypatch):
+    monkeypatch.setenv("STATELESS_HTTP", "true")
+    get_settings.cache_clear()
+    async with create_connected_server_and_client_session(mcp._mcp_server) as client:
+        caps = client.get_server_capabilities()
+    assert not caps.resources.subscribe
+    assert "integritas/resourceSubscriptions" not in (caps.experimental or {})
@@ -0,0 +1,154 @@
+# tests/test_tracing.py
+import asyncio
+import json
+
+import httpx
+import pytest
+import respx
+
+from integritas_mcp_server import http_client, tracing
+from integritas_mcp_server.config import get_settings
+
+STATUS = "https://upstream.example/v1/timestamp/status/"
+
+
+@pytest.fixture
+def traced(monkeypatch, tmp_path):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setenv("TRACE_SAMPLE_RATE", "1")
+    monkeypatch.setenv("TRACE_FILE", str(path))
+    get_settings.cache_clear()
+    return path
+
+
+def _spans(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_off_by_default_records_nothing(tmp_path):
+    with tracing.span("root") as sp:
+        assert sp.sampled is False
+        assert tracing.current_span() is None
+        assert tracing.traceparent() is None
+
+
+def test_nested_spans_export_one_trace(traced):
+    with tracing.span("root", tool="t"):
+        with tracing.span("child") as child:
+            child.set(n=1)
+            assert tracing.traceparent() == f"00-{child.trace_id}-{child.span_id}-01"
+    spans = {s["name"]: s for s in _spans(traced)}
+    assert set(spans) == {"root", "child"}
+    assert spans["child"]["trace_id"] == spans["root"]["trace_id"]
+    assert spans["child"]["parent_id"] == spans["root"]["span_id"]
+    assert spans["root"]["parent_id"] is None
+    assert spans["child"]["attributes"] == {"n": 1}
+    assert spans["root"]["end_ns"] >= spans["child"]["end_ns"]
+
+
+def test_error_marks_span(traced):
+    with pytest.raises(ValueError):
+        with tracing.span("root"):
+            raise ValueError("boom")
+    (root,) = _spans(traced)
+    assert root["status"] == "error"
+    assert root["attributes"]["error"] == "ValueError: boom"
+
+
+def test_unsampled_trace_is_not_exported(traced, monkeypatch):
+    monkeypatch.setenv("TRACE_SAMPLE_RATE", "0.000001")
+    get_settings.cache_clear()
+    monkeypatch.setattr(tracing.random, "random", lambda: 0.5)
+    with tracing.span("root") as sp:
+        with tracing.span("child") as child:
+            assert not sp.sampled and not child.sampled
+    assert not traced.exists()
+
+
+def test_otlp_payload_shape(traced):
+    sp = tracing.Span("s", "a" * 32, "b" * 16, "c" * 16, True, 1, 2, {"ok": True, "n": 3})
+    (out,) = tracing.otlp_payload([sp])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert out["traceId"] == "a" * 32 and out["parentSpanId"] == "c" * 16
+    assert out["startTimeUnixNano"] == "1"
+    assert {"key": "n", "value": {"intValue": "3"}} in out["attributes"]
+    assert {"key": "ok", "value": {"boolValue": True}} in out["attributes"]
+
+
+@pytest.mark.asyncio
+async def test_request_id_and_traceparent_go_upstream(traced):
+    token = tracing.request_id_var.set("42")
+    try:
+        with respx.mock:
+            route = respx.get(STATUS).mock(return_value=httpx.Response(200, json={}))
+            with tracing.span("tool t"):
+                await http_client.request("GET", "/v1/timestamp/status/")
+    finally:
+        tracing.request_id_var.reset(token)
+    sent = route.calls.last.request.headers
+    assert sent["x-request-id"] == "42"
+    spans = {s["name"]: s for s in _spans(traced)}
+    upstream = spans["upstream GET /v1/timestamp/status/"]
+    assert upstream["attributes"]["status"] == 200
+    assert upstream["attributes"]["request_id"] == "42"
+    assert sent["traceparent"] == f"00-{upstream['trace_id']}-{upstream['span_id']}-01"
+
+
+@pytest.mark.asyncio
+async def test_explicit_request_id_header_wins():
+    token = tracing.request_id_var.set("42")
+    try:
+        with respx.mock:
+            route = respx.get(STATUS).mock(return_value=httpx.Response(200, json={}))
+            await http_client.request("GET", "/v1/timestamp/status/", headers={"X-Request-ID": "mine"})
+    finally:
+        tracing.request_id_var.reset(token)
+    assert route.calls.last.request.headers["x-request-id"] == "mine"
+    assert "traceparent" not in route.calls.last.request.headers
+
+
+@pytest.mark.asyncio
+async def test_otlp_export_reuses_one_client(traced, monkeypatch):
+    monkeypatch.setenv("TRACE_EXPORTER", "otlp")
+    monkeypatch.setenv("TRACE_OTLP_ENDPOINT", "http://collector.example/v1/traces")
+    get_settings.cache_clear()
+    with respx.mock:
+        route = respx.post("http://collector.example/v1/traces").mock(return_value=httpx.Response(200))
+        with tracing.span("first"):
+            pass
+        await asyncio.gather(*tracing._pending)
+        client = tracing._otlp_client
+        with tracing.span("second"):
+            pass
+        await asyncio.gather(*tracing._pending)
+        assert tracing._otlp_client is client is not None
+        await tracing.close_exporter()
+    assert route.call_count == 2
+    assert tracing._otlp_client is None
+
+
+@pytest.mark.asyncio
+async def test_poller_rounds_are_their_own_traces(traced):
+    from integritas_mcp_server.services.status_poller import StatusPoller
+
+    seen = []
+
+    async def fetch(uids, api_key):
+        seen.append((tracing.request_id_var.get(), tracing.current_span()))
+        return [{"uid": u, "status": True, "onchain": len(seen) > 1} for u in uids]
+
+    poller = StatusPoller(fetch=fetch)
+    token = tracing.request_id_var.set("first-caller")
+    try:
+        with tracing.span("tool first") as caller:
+            fut = poller.watch("A", None, max_attempts=5, interval=0.01)
+    finally:
+        tracing.request_id_var.reset(token)
+    await fut
+    await poller.stop()
+
+    rids = [rid for rid, _ in seen]
+    assert all(rid.startswith("integritas-poll-") for rid in rids) and len(set(rids)) == 2
+    rounds = [s for s in _spans(traced) if s["name"] == "stamp.status_poll"]
+    assert len(rounds) == 2
+    assert all(r["parent_id"] is None and r["trace_id"] != caller.trace_id for r in rounds)
+    assert rounds[0]["trace_id"] != rounds[1]["trace_id"]
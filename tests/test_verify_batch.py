@@ -0,0 +1,104 @@
+# tests/test_verify_batch.py
+import asyncio
+import itertools
+import json
+import pytest
+
+from integritas_mcp_server.models import VerifyDataBatchRequest
+from integritas_mcp_server.services import verify_batch
+from integritas_mcp_server.services.verify_data import _ok_response, _fail_response
+
+
+def _write(path, proof):
+    path.write_text(json.dumps(proof))
+    return str(path)
+
+
+@pytest.mark.asyncio
+async def test_batch_dedupes_identical_proofs_and_counts_per_file(tmp_path, monkeypatch):
+    sent = []
+
+    async def fake_verify(data, rid, api_key=None, filename="proof.json"):
+        sent.append(data)
+        if b"bad" in data:
+            return _fail_response(request_id=rid, human="Verification failed.")
+        return _ok_response(request_id=rid, fields={"result": "full match", "summary": "ok"})
+
+    monkeypatch.setattr(verify_batch, "verify_proof_bytes", fake_verify)
+    (tmp_path / "sub").mkdir()
+    _write(tmp_path / "a.json", {"proof": "same"})
+    _write(tmp_path / "b.json", {"proof": "same"})
+    _write(tmp_path / "c.json", {"proof": "bad"})
+    _write(tmp_path / "sub" / "d.json", {"proof": "same"})
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    progress = []
+
+    async def on_progress(done, total):
+        progress.append((done, total))
+
+    req = VerifyDataBatchRequest(
+        directory=str(tmp_path),
+        glob=str(tmp_path / "**" / "*.json"),
+        files=[str(tmp_path / "missing.json")],
+    )
+    res = await verify_batch.verify_data_batch_complete(req, "rid", progress=on_progress)
+
+    env = res.structuredContent
+    assert len(sent) == 2  # one upload per distinct content
+    assert progress[-1] == (5, 5)  # per file, loading included
+    assert env.kind == "integritas/verify_batch_result@v1"
+    assert env.status == "failed"
+    assert env.data["total"] == 5  # a, b, c, d, missing (overlapping sources counted once)
+    assert env.data["unique"] == 2
+    assert env.data["counts"] == {"finalized": 3, "failed": 2}
+    same = env.data["items"][0]
+    assert [p.rsplit("/", 1)[-1] for p in same["files"]] == ["a.json", "b.json", "d.json"]
+    assert same["result"]["status"] == "finalized"
+    assert env.data["items"][-1]["files"] == [str(tmp_path / "missing.json")]
+    assert res.summary == "Verified 3/5 · 2 failed · 2 unique"
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_more_than_max_files(tmp_path, monkeypatch):
+    monkeypatch.setenv("VERIFY_BATCH_MAX_FILES", "1")
+    files = [_write(tmp_path / f"{i}.json", {"i": i}) for i in range(2)]
+    res = await verify_batch.verify_data_batch_complete(VerifyDataBatchRequest(files=files), "rid")
+    assert res.structuredContent.status == "failed"
+    assert "too large" in res.summary
+
+
+def test_expansion_stops_past_the_file_limit(monkeypatch):
+    endless = (f"/nowhere/{i}.json" for i in itertools.count())
+    monkeypatch.setattr(verify_batch._glob, "iglob", lambda *a, **k: endless)
+    refs = verify_batch.expand_sources(VerifyDataBatchRequest(glob="/nowhere/**/*.json"), limit=3)
+    assert len(refs) == 4
+
+
+@pytest.mark.asyncio
+async def test_proofs_are_capped_and_loaded_inside_the_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(verify_batch, "MAX_PROOF_FILE_BYTES", 64)
+    in_flight, peak = 0, 0
+
+    async def fake_verify(data, rid, api_key=None, filename="proof.json"):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _ok_response(request_id=rid, fields={"result": "full match", "summary": "ok"})
+
+    monkeypatch.setattr(verify_batch, "verify_proof_bytes", fake_verify)
+    files = [_write(tmp_path / f"{i}.json", {"i": i}) for i in range(6)]
+    files.append(_write(tmp_path / "big.json", {"pad": "x" * 100}))
+    req = VerifyDataBatchRequest(files=files, concurrency=2)
+    res = await verify_batch.verify_data_batch_complete(req, "rid")
+
+    assert peak <= 2
+    assert res.structuredContent.data["counts"] == {"finalized": 6, "failed": 1}
+    assert "maximum size of 64 bytes" in res.structuredContent.data["items"][-1]["result"]["summary"]
+
+
+def test_request_requires_a_source():
+    with pytest.raises(ValueError):
+        VerifyDataBatchRequest()
@@ -0,0 +1,123 @@
+# tests/test_workers.py
+import os
+
+import pytest
+from typer.testing import CliRunner
+
+from integritas_mcp_server import cli as cli_mod
+from integritas_mcp_server import secrets, tools_auth
+from integritas_mcp_server.config import get_settings
+
+
+@pytest.fixture
+def no_keyring(monkeypatch):
+    store = {}
+    monkeypatch.setattr(secrets, "load_api_key_keyring", lambda: store.get("k"))
+    monkeypatch.setattr(secrets, "save_api_key_keyring", lambda k: store.__setitem__("k", k))
+    monkeypatch.setattr(secrets, "clear_api_key_keyring", lambda: store.pop("k", None))
+    monkeypatch.delenv("INTEGRITAS_API_KEY", raising=False)
+    monkeypatch.delenv("MINIMA_API_KEY", raising=False)
+    yield store
+    secrets.clear_api_key_memory()
+
+
+@pytest.fixture(autouse=True)
+def _quiet_cli(monkeypatch):
+    # CliRunner swaps stdout; don't let structlog bind to it
+    monkeypatch.setattr(cli_mod, "setup_logging", lambda *a, **kw: None)
+
+
+def test_memory_key_dropped_after_set_or_clear_elsewhere(no_keyring):
+    secrets.set_api_key_memory("worker-a-key")
+    assert secrets.resolve_api_key() == "worker-a-key"
+
+    # another worker clears the key: the shared generation moves on
+    secrets._bump_key_generation()
+    assert secrets.resolve_api_key() is None
+
+    # another worker sets a new key and persists it to the shared keyring
+    no_keyring["k"] = "worker-b-key"
+    secrets._bump_key_generation()
+    assert secrets.resolve_api_key() == "worker-b-key"
+
+
+def test_http_workers_run_stateless(monkeypatch):
+    calls = []
+    monkeypatch.setattr(cli_mod.uvicorn, "run", lambda target, **kw: calls.append((target, kw)))
+    monkeypatch.delenv("STATELESS_HTTP", raising=False)
+    monkeypatch.setenv("MINIMA_API_KEY", "env-key-123")  # shared by every worker without a keyring
+    get_settings.cache_clear()
+
+    res = CliRunner().invoke(cli_mod.cli, ["http", "--workers", "4", "--port", "9000"])
+    assert res.exit_code == 0, res.output
+    target, kw = calls[0]
+    assert target == "integritas_mcp_server.http_app:app"
+    assert kw["workers"] == 4 and kw["port"] == 9000
+    assert os.environ.pop("STATELESS_HTTP") == "true"
+
+
+def test_http_workers_need_a_shared_key(monkeypatch):
+    monkeypatch.setattr(cli_mod.uvicorn, "run", lambda *a, **kw: pytest.fail("should not start"))
+    monkeypatch.setattr(secrets, "keyring_available", lambda: False)
+    monkeypatch.delenv("MINIMA_API_KEY", raising=False)
+    monkeypatch.delenv("INTEGRITAS_API_KEY", raising=False)
+    monkeypatch.delenv("STATELESS_HTTP", raising=False)
+    res = CliRunner().invoke(cli_mod.cli, ["http", "--workers", "2"])
+    assert res.exit_code != 0
+    assert "keyring" in res.output
+    assert "STATELESS_HTTP" not in os.environ
+
+    # with a keyring backend, workers start (subscriptions off, with a warning)
+    monkeypatch.setattr(secrets, "keyring_available", lambda: True)
+    monkeypatch.setattr(cli_mod.uvicorn, "run", lambda *a, **kw: None)
+    assert CliRunner().invoke(cli_mod.cli, ["http", "--workers", "2"]).exit_code == 0
+    assert os.environ.pop("STATELESS_HTTP") == "true"
+
+
+def test_http_app_built_stateless(monkeypatch):
+    from integritas_mcp_server import http_app
+
+    monkeypatch.setenv("STATELESS_HTTP", "true")
+    get_settings.cache_clear()
+    mcp = http_app.mcp
+    monkeypatch.setattr(mcp.settings, "stateless_http", False)
+    monkeypatch.setattr(mcp, "_session_manager", None)  # built once per FastMCP
+
+    http_app.create_app()
+    assert mcp.settings.stateless_http is True
+    assert mcp.session_manager.stateless is True
+
+
+def test_sse_refuses_shared_port_workers(monkeypatch):
+    monkeypatch.setattr(cli_mod.uvicorn, "run", lambda *a, **kw: pytest.fail("should not start"))
+    res = CliRunner().invoke(cli_mod.cli, ["sse", "--workers", "2"])
+    assert res.exit_code != 0
+    assert "sticky" in res.output
+
+
+@pytest.mark.parametrize("change, expected", [
+    (lambda: tools_auth.auth_clear_api_key({}), None),
+    (lambda: tools_auth.auth_set_api_key({"api_key": "new-key-123"}), "new-key-123"),
+])
+def test_other_worker_never_caches_the_replaced_key(no_keyring, monkeypatch, change, expected):
+    no_keyring["k"] = "old-key-123"
+    other = {}
+
+    def other_worker_resolves():
+        # what a second worker caches if it re-resolves while the keyring is being written
+        saved = (secrets._memory_key, secrets._resolved, secrets._generation)
+        secrets._memory_key, secrets._resolved, secrets._generation = None, None, None
+        secrets.resolve_api_key()
+        other["resolved"] = secrets._resolved
+        secrets._memory_key, secrets._resolved, secrets._generation = saved
+
+    def hooked(fn):
+        return lambda *a: (other_worker_resolves(), fn(*a))[1]
+
+    monkeypatch.setattr(secrets, "save_api_key_keyring", hooked(secrets.save_api_key_keyring))
+    monkeypatch.setattr(secrets, "clear_api_key_keyring", hooked(secrets.clear_api_key_keyring))
+    change()
+
+    # back in the second worker, after its generation TTL has passed
+    secrets._memory_key, secrets._resolved, secrets._generation = None, other["resolved"], None
+    assert secrets.resolve_api_key() == expected